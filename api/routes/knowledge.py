@@ -4,7 +4,7 @@ Knowledge Graph API Route
 from typing import List, Dict, Any
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
-from kg.kg_manager import KnowledgeGraphManager
+from kg import KnowledgeGraphManager, create_graph_store
 
 router = APIRouter()
 
@@ -32,9 +32,23 @@ class KGQueryResponse(BaseModel):
     entities: List[KGEntity]
     relationships: List[KGRelationship]
 
+_kg_store = None
+
+def set_kg_manager(store):
+    """Install the app-wide knowledge graph store."""
+    global _kg_store
+    _kg_store = store
+
 def get_kg_manager():
-    """Dependency to get KnowledgeGraphManager instance."""
-    return KnowledgeGraphManager(use_neo4j=False)
+    """Dependency to get the shared knowledge graph store.
+    
+    Built on first use from OMNIMIND_KG_BACKEND (SQLite by default), so every
+    request sees the same, persisted graph.
+    """
+    global _kg_store
+    if _kg_store is None:
+        _kg_store = create_graph_store()
+    return _kg_store
 
 @router.post("/kg/query", response_model=KGQueryResponse)
 async def kg_query(
@@ -5,19 +5,40 @@ Handles intelligent text chunking for optimal embedding and retrieval.
 """
 
 import re
-from typing import List, Dict, Any
+import hashlib
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple, Iterable, Iterator
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Gear table for the content-defined rolling hash. Seeded so that boundaries
+# are stable across processes and releases; changing it re-chunks everything.
+_GEAR_SEED = 0x4F4D4E49
+_GEAR = [random.Random(_GEAR_SEED + i).getrandbits(64) for i in range(256)]
+_HASH_MASK_64 = (1 << 64) - 1
+
 
 class SmartChunker:
     """Intelligent text chunker that preserves semantic boundaries."""
     
-    def __init__(self, chunk_size: int = 1000, overlap: int = 200, language: str = "en"):
+    STRATEGIES = ("sentence", "content")
+    
+    def __init__(self, chunk_size: int = 1000, overlap: int = 200, language: str = "en",
+                 strategy: str = "sentence", min_chunk_size: int = None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown chunking strategy: {strategy}")
         self.chunk_size = chunk_size
         self.overlap = overlap
         self.language = language
+        self.strategy = strategy
+        self.min_chunk_size = min_chunk_size if min_chunk_size is not None else chunk_size // 4
+        
+        # Content-defined boundaries fire on average every ~chunk_size/2 bytes
+        # past the minimum size, so most chunks end well before the hard cap.
+        boundary_bits = max(1, max(chunk_size // 2 - self.min_chunk_size, 2).bit_length())
+        self._boundary_mask = ((1 << boundary_bits) - 1) << (64 - boundary_bits)
         
         # Language-specific sentence patterns
         self.sentence_patterns = {
@@ -34,12 +55,16 @@ class SmartChunker:
         if not text or len(text.strip()) == 0:
             return []
         
+        if self.strategy == "content":
+            return self._chunk_text_content_defined(text)
+        
         if len(text) <= self.chunk_size:
             return [{
                 "text": text.strip(),
                 "start": 0,
                 "end": len(text),
-                "chunk_id": "chunk_0"
+                "chunk_id": "chunk_0",
+                "content_hash": self._content_hash(text.strip())
             }]
         
         chunks = []
@@ -60,7 +85,8 @@ class SmartChunker:
                         "start": start_pos,
                         "end": start_pos + len(current_chunk),
                         "chunk_id": f"chunk_{chunk_id}",
-                        "size": len(current_chunk.strip())
+                        "size": len(current_chunk.strip()),
+                        "content_hash": self._content_hash(current_chunk.strip())
                     })
                     chunk_id += 1
                 
@@ -75,11 +101,91 @@ class SmartChunker:
                 "start": start_pos,
                 "end": len(text),
                 "chunk_id": f"chunk_{chunk_id}",
-                "size": len(current_chunk.strip())
+                "size": len(current_chunk.strip()),
+                "content_hash": self._content_hash(current_chunk.strip())
             })
         
         return chunks
     
+    def _chunk_text_content_defined(self, text: str) -> List[Dict[str, Any]]:
+        """Chunk text at content-defined boundaries snapped to sentence edges.
+        
+        A gear rolling hash runs over the text; once a chunk has reached
+        ``min_chunk_size``, the first hash hit closes the chunk at the end of
+        the sentence containing it. Because the hash only depends on the last
+        64 bytes, an edit only moves the boundaries near it, and unchanged
+        regions produce identical chunks (and chunk ids) on re-ingestion.
+        Chunks never overlap, since overlap would couple each chunk to its
+        predecessor.
+        """
+        chunks = []
+        current: List[str] = []
+        current_len = 0
+        chunk_start = None
+        chunk_end = 0
+        rolling = 0
+        
+        for sentence, start, end in self._locate_sentences(text):
+            sentence_len = len(sentence) + (1 if current else 0)
+            
+            # Hard cap: never let a chunk grow past chunk_size
+            if current and current_len + sentence_len > self.chunk_size:
+                chunks.append(self._make_content_chunk(current, chunk_start, chunk_end))
+                current, current_len, chunk_start, rolling = [], 0, None, 0
+                sentence_len = len(sentence)
+            
+            if chunk_start is None:
+                chunk_start = start
+            current.append(sentence)
+            current_len += sentence_len
+            chunk_end = end
+            
+            boundary = False
+            for byte in sentence.encode("utf-8"):
+                rolling = ((rolling << 1) + _GEAR[byte]) & _HASH_MASK_64
+                if not boundary and current_len >= self.min_chunk_size and not rolling & self._boundary_mask:
+                    boundary = True
+            
+            if boundary:
+                chunks.append(self._make_content_chunk(current, chunk_start, chunk_end))
+                current, current_len, chunk_start, rolling = [], 0, None, 0
+        
+        if current:
+            chunks.append(self._make_content_chunk(current, chunk_start, chunk_end))
+        
+        return chunks
+    
+    def _make_content_chunk(self, sentences: List[str], start: int, end: int) -> Dict[str, Any]:
+        """Build a content-addressed chunk record."""
+        chunk_text = " ".join(sentences)
+        content_hash = self._content_hash(chunk_text)
+        return {
+            "text": chunk_text,
+            "start": start,
+            "end": end,
+            "chunk_id": f"chunk_{content_hash[:16]}",
+            "size": len(chunk_text),
+            "content_hash": content_hash
+        }
+    
+    def _locate_sentences(self, text: str) -> List[Tuple[str, int, int]]:
+        """Split text into sentences and return them with their offsets."""
+        located = []
+        cursor = 0
+        for sentence in self._split_sentences(text):
+            start = text.find(sentence, cursor)
+            if start < 0:
+                start = cursor
+            end = start + len(sentence)
+            located.append((sentence, start, end))
+            cursor = end
+        return located
+    
+    @staticmethod
+    def _content_hash(text: str) -> str:
+        """Stable hash of chunk text, used as the cache and upsert key."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences while preserving structure."""
         pattern = self.sentence_patterns.get(self.language, self.sentence_patterns["en"])
@@ -96,24 +202,167 @@ class SmartChunker:
         
         return cleaned_sentences
     
-    def chunk_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Chunk a list of documents."""
+    def chunk_documents(self, documents: List[Dict[str, Any]], max_workers: int = 1,
+                        batch_chars: int = None) -> List[Dict[str, Any]]:
+        """Chunk a list of documents.
+        
+        With ``max_workers > 1`` documents are spread across a process pool in
+        batches of roughly ``batch_chars`` characters (default: 200 chunks'
+        worth), so many small documents share a task while large ones get a
+        task each. Batches are collected in submission order, so the output is
+        identical to the serial path.
+        """
+        if max_workers <= 1 or len(documents) <= 1:
+            return self._chunk_document_batch(documents)
+        
+        batches = self._batch_documents(documents, batch_chars or self.chunk_size * 200)
+        if len(batches) <= 1:
+            return self._chunk_document_batch(documents)
+        
+        all_chunks = []
+        try:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+                for batch_chunks in pool.map(_chunk_batch_worker,
+                                             [self._config()] * len(batches), batches):
+                    all_chunks.extend(batch_chunks)
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"Process pool unavailable, chunking serially: {e}")
+            return self._chunk_document_batch(documents)
+        
+        return all_chunks
+    
+    def chunk_stream(self, segments: Iterable[str], window: int = None) -> Iterator[Dict[str, Any]]:
+        """Chunk a stream of text segments, yielding chunks as they complete.
+        
+        Segments are concatenated as given (extractors end each segment with
+        a newline); ``start``/``end`` offsets refer to the concatenated text.
+        About ``window`` characters (default four chunks) are buffered, so
+        memory stays bounded however long the stream is.
+        
+        With the sentence strategy each window is cut at its last sentence
+        boundary. With the content strategy the buffer is cut where a chunk
+        starts: every chunk but the last is emitted and the last one waits
+        for more text, so the output matches ``chunk_text`` over the whole
+        stream and stays stable under edits elsewhere in it.
+        """
+        window = window or self.chunk_size * 4
+        pattern = re.compile(self.sentence_patterns.get(self.language, self.sentence_patterns["en"]))
+        buffer = ""
+        offset = 0
+        index = 0
+        limit = window
+        
+        for segment in segments:
+            if not segment:
+                continue
+            buffer += segment
+            if self.strategy == "content":
+                if len(buffer) < limit:
+                    continue
+                chunks = self.chunk_text(buffer)
+                for chunk in chunks[:-1]:
+                    yield self._place_stream_chunk(chunk, offset, index)
+                    index += 1
+                if len(chunks) > 1:
+                    cut = chunks[-1]["start"]
+                    offset += cut
+                    buffer = buffer[cut:]
+                # A chunk that has not closed yet (e.g. one very long sentence)
+                # is only re-chunked once another window of text has arrived
+                limit = len(buffer) + window if len(buffer) >= window else window
+                continue
+            while len(buffer) >= window:
+                cut = self._stream_cut(buffer, window, pattern)
+                for chunk in self.chunk_text(buffer[:cut]):
+                    yield self._place_stream_chunk(chunk, offset, index)
+                    index += 1
+                offset += cut
+                buffer = buffer[cut:]
+        
+        for chunk in self.chunk_text(buffer):
+            yield self._place_stream_chunk(chunk, offset, index)
+            index += 1
+    
+    def chunk_document_stream(self, document: Dict[str, Any],
+                              segments: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Chunk a document whose text arrives as ``segments`` rather than ``content``."""
+        fields = self._document_fields(document)
+        for chunk in self.chunk_stream(segments):
+            chunk.update(fields)
+            yield chunk
+    
+    @staticmethod
+    def _stream_cut(buffer: str, window: int, pattern) -> int:
+        """Position of the last sentence boundary (else whitespace) in the window."""
+        head = buffer[:window]
+        cut = 0
+        for match in pattern.finditer(head):
+            cut = match.end()
+        if cut <= 0:
+            cut = max(head.rfind(" "), head.rfind("\n")) + 1
+        return cut if cut > 0 else window
+    
+    def _place_stream_chunk(self, chunk: Dict[str, Any], offset: int, index: int) -> Dict[str, Any]:
+        """Shift a window-relative chunk to stream offsets and number it."""
+        chunk["start"] += offset
+        chunk["end"] += offset
+        if self.strategy == "sentence":
+            chunk["chunk_id"] = f"chunk_{index}"
+        return chunk
+    
+    def _chunk_document_batch(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Chunk documents serially in the current process."""
         all_chunks = []
         
         for doc in documents:
             if "content" in doc and doc["content"]:
                 chunks = self.chunk_text(doc["content"])
+                fields = self._document_fields(doc)
                 for chunk in chunks:
-                    chunk.update({
-                        "document_id": doc.get("id", doc.get("source", "unknown")),
-                        "document_title": doc.get("title", ""),
-                        "document_type": doc.get("content_type", "unknown"),
-                        "source": doc.get("source", "")
-                    })
+                    chunk.update(fields)
                 all_chunks.extend(chunks)
         
         return all_chunks
     
+    @staticmethod
+    def _document_fields(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Document fields copied onto each of its chunks."""
+        return {
+            "document_id": doc.get("id", doc.get("source", "unknown")),
+            "document_title": doc.get("title", ""),
+            "document_type": doc.get("content_type", "unknown"),
+            "source": doc.get("source", "")
+        }
+    
+    @staticmethod
+    def _batch_documents(documents: List[Dict[str, Any]], batch_chars: int) -> List[List[Dict[str, Any]]]:
+        """Group consecutive documents into batches of about batch_chars characters."""
+        batches = []
+        current = []
+        current_chars = 0
+        
+        for doc in documents:
+            doc_chars = len(doc.get("content") or "")
+            if current and current_chars + doc_chars > batch_chars:
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(doc)
+            current_chars += doc_chars
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _config(self) -> Dict[str, Any]:
+        """Constructor arguments needed to rebuild this chunker in a worker."""
+        return {
+            "chunk_size": self.chunk_size,
+            "overlap": self.overlap,
+            "language": self.language,
+            "strategy": self.strategy,
+            "min_chunk_size": self.min_chunk_size
+        }
+    
     def get_chunk_stats(self, chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Get statistics about chunks."""
         if not chunks:
@@ -129,4 +378,9 @@ class SmartChunker:
             "total_text": total_text,
             "min_size": min(len(chunk.get("text", "")) for chunk in chunks),
             "max_size": max(len(chunk.get("text", "")) for chunk in chunks)
-        } 
\ No newline at end of file
+        } 
+
+
+def _chunk_batch_worker(config: Dict[str, Any], documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Process-pool entry point: chunk one batch of documents."""
+    return SmartChunker(**config)._chunk_document_batch(documents)
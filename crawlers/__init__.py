@@ -10,5 +10,14 @@ This module handles data ingestion from various sources:
 from .web_crawler import WebCrawler
 from .file_ingestor import FileIngestor
 from .basic_loader import BasicLoader
+from .async_fetcher import AsyncFetcher
+from .crawl_cache import CrawlCache
+from .extractors import Extractor, get_extractor, register_extractor
+from .directory_scanner import DirectoryScanner
+from .frontier import CrawlFrontier, FrontierCrawler, BloomFilter, normalize_url
+from .html_extractor import HTMLTextExtractor, extract_text
 
-__all__ = ["WebCrawler", "FileIngestor", "BasicLoader"] 
\ No newline at end of file
+__all__ = ["WebCrawler", "FileIngestor", "BasicLoader", "AsyncFetcher", "CrawlCache",
+           "Extractor", "get_extractor", "register_extractor", "DirectoryScanner",
+           "CrawlFrontier", "FrontierCrawler", "BloomFilter", "normalize_url",
+           "HTMLTextExtractor", "extract_text"] 
\ No newline at end of file
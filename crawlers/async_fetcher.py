@@ -0,0 +1,131 @@
+"""
+Async Fetcher for OMNIMIND
+
+Fetches many URLs concurrently over a pooled keep-alive HTTP client, with
+global and per-host concurrency limits and non-blocking retry backoff.
+"""
+
+import asyncio
+import concurrent.futures
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
+import logging
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying; other 4xx replies are final
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class AsyncFetcher:
+    """Concurrent HTTP fetcher built on httpx.AsyncClient.
+
+    At most ``max_connections`` requests are in flight overall and at most
+    ``max_per_host`` against any one host. Bodies are streamed, and reading
+    stops once a body exceeds ``max_bytes``. Failed attempts back off with
+    ``asyncio.sleep`` so a slow host never stalls other fetches.
+    """
+
+    def __init__(self, max_connections: int = 100, max_per_host: int = 8,
+                 timeout: float = 30, max_retries: int = 3, backoff_base: float = 1.0,
+                 max_bytes: int = None, headers: Dict[str, str] = None):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for AsyncFetcher")
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_bytes = max_bytes
+        self.headers = headers or {}
+
+    def fetch_many(self, urls: List[str],
+                   headers: Dict[str, Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Fetch URLs concurrently from synchronous code.
+
+        Returns one result per URL, in input order, each holding ``url``,
+        ``response`` (an httpx.Response with the full body, or None) and
+        ``error``.
+        """
+        coroutine = self.fetch_all(urls, headers=headers)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+
+        # Already inside an event loop: run ours on a separate thread
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coroutine).result()
+
+    async def fetch_all(self, urls: List[str],
+                        headers: Dict[str, Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Fetch URLs concurrently; results keep the input order."""
+        if not urls:
+            return []
+        headers = headers or {}
+        global_limit = asyncio.Semaphore(self.max_connections)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        limits = httpx.Limits(max_connections=self.max_connections,
+                              max_keepalive_connections=self.max_connections)
+        async with httpx.AsyncClient(limits=limits, timeout=self.timeout,
+                                     headers=self.headers, follow_redirects=True) as client:
+            async def bounded_fetch(url: str) -> Dict[str, Any]:
+                host = urlparse(url).netloc
+                host_limit = host_limits.setdefault(host, asyncio.Semaphore(self.max_per_host))
+                # Wait for the host first: holding a global slot while queued on a
+                # busy host would starve URLs for every other host
+                async with host_limit, global_limit:
+                    return await self.fetch(client, url, headers=headers.get(url))
+
+            return await asyncio.gather(*(bounded_fetch(url) for url in urls))
+
+    async def fetch(self, client: "httpx.AsyncClient", url: str,
+                    headers: Dict[str, str] = None) -> Dict[str, Any]:
+        """Fetch one URL with retries, streaming its body."""
+        error = None
+        for attempt in range(self.max_retries):
+            try:
+                response = await self._stream(client, url, headers)
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code >= 400:
+                        return {"url": url, "response": None, "error": f"HTTP {response.status_code}"}
+                    return {"url": url, "response": response, "error": None}
+                error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                error = str(e) or type(e).__name__
+
+            if attempt < self.max_retries - 1:
+                logger.warning(f"Attempt {attempt + 1} failed for {url}: {error}")
+                await asyncio.sleep(self.backoff_base * (2 ** attempt))
+
+        logger.error(f"Failed to fetch {url}: {error}")
+        return {"url": url, "response": None, "error": error}
+
+    async def _stream(self, client: "httpx.AsyncClient", url: str,
+                      headers: Optional[Dict[str, str]]) -> "httpx.Response":
+        """Read a response body incrementally, honouring max_bytes."""
+        async with client.stream("GET", url, headers=headers) as response:
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if self.max_bytes is not None and len(body) > self.max_bytes:
+                    logger.warning(f"Truncating {url} at {self.max_bytes} bytes")
+                    del body[self.max_bytes:]
+                    break
+            # The body is already decoded, so drop the transfer headers that
+            # would make httpx decode it again
+            headers = [(k, v) for k, v in response.headers.items()
+                       if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")]
+            return httpx.Response(
+                status_code=response.status_code,
+                headers=headers,
+                content=bytes(body),
+                request=response.request
+            )
@@ -5,46 +5,58 @@ Handles loading data from URLs and local files, outputting raw text.
 """
 
 import os
+import hashlib
 import requests
 from pathlib import Path
 from typing import List, Dict, Any, Union
 import logging
 from urllib.parse import urlparse
 import time
+from .async_fetcher import AsyncFetcher, HTTPX_AVAILABLE
+from .crawl_cache import CrawlCache
+from .extractors import get_extractor, TextExtractor
+from .html_extractor import extract_text
 
 logger = logging.getLogger(__name__)
 
 
 class BasicLoader:
-    """Basic data loader for URLs and local files."""
+    """Basic data loader for URLs and local files.
     
-    def __init__(self, timeout: int = 30, max_retries: int = 3):
+    With a ``crawl_cache`` every URL fetch is conditional on the cached
+    validators, and a 304 reply returns the cached text without extracting
+    anything. Files larger than ``max_file_size`` are not read into memory;
+    they come back with ``streamed`` set for the chunk step to extract.
+    """
+    
+    def __init__(self, timeout: int = 30, max_retries: int = 3,
+                 max_connections: int = 100, max_per_host: int = 8,
+                 crawl_cache: CrawlCache = None, max_file_size: int = 10 * 1024 * 1024):
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.crawl_cache = crawl_cache
+        self.max_file_size = max_file_size
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'OMNIMIND/1.0 (https://github.com/priyanshumishra610/omnimind)'
         })
     
-    def load_url(self, url: str) -> Dict[str, Any]:
-        """Load content from a URL."""
+    def load_url(self, url: str, headers: Dict[str, str] = None) -> Dict[str, Any]:
+        """Load content from a URL.
+        
+        ``headers`` may carry conditional validators (If-None-Match,
+        If-Modified-Since); a 304 reply is returned with ``not_modified`` set
+        and no content.
+        """
         try:
             for attempt in range(self.max_retries):
                 try:
-                    response = self.session.get(url, timeout=self.timeout)
+                    response = self.session.get(url, timeout=self.timeout,
+                                                headers=self._request_headers(url, headers))
                     response.raise_for_status()
-                    
-                    # Extract text content
-                    content = self._extract_text_from_response(response)
-                    
-                    return {
-                        "source": url,
-                        "content": content,
-                        "content_type": response.headers.get('content-type', ''),
-                        "status_code": response.status_code,
-                        "size_bytes": len(response.content),
-                        "success": True
-                    }
+                    return self._url_result(url, response)
                     
                 except requests.RequestException as e:
                     if attempt == self.max_retries - 1:
@@ -62,27 +74,45 @@ class BasicLoader:
             }
     
     def load_file(self, file_path: str) -> Dict[str, Any]:
-        """Load content from a local file."""
+        """Load content from a local file.
+        
+        Text comes from the streaming extractor for the file's format;
+        unknown extensions are read as text with encoding detection. Files
+        over ``max_file_size`` get no ``content``: ``streamed`` is set and
+        ``content_hash`` is taken over the raw bytes instead.
+        """
         try:
             file_path = Path(file_path)
             
             if not file_path.exists():
                 raise FileNotFoundError(f"File not found: {file_path}")
             
-            # Check file size (limit to 10MB)
-            file_size = file_path.stat().st_size
-            if file_size > 10 * 1024 * 1024:  # 10MB
-                raise ValueError(f"File too large: {file_size} bytes")
+            file_stat = file_path.stat()
+            file_size = file_stat.st_size
+            
+            extractor = get_extractor(str(file_path)) or TextExtractor()
+            if file_size > self.max_file_size:
+                # Too large to hold as one string; chunked straight from the extractor
+                return {
+                    "source": str(file_path),
+                    "content": "",
+                    "content_type": extractor.content_type,
+                    "size_bytes": file_size,
+                    "mtime": file_stat.st_mtime,
+                    "content_hash": self._file_hash(file_path),
+                    "streamed": True,
+                    "success": True
+                }
             
             # Read file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = "".join(extractor.extract(str(file_path)))
             
             return {
                 "source": str(file_path),
                 "content": content,
-                "content_type": "text/plain",
+                "content_type": extractor.content_type,
                 "size_bytes": file_size,
+                "mtime": file_stat.st_mtime,
                 "success": True
             }
             
@@ -95,19 +125,61 @@ class BasicLoader:
                 "success": False
             }
     
-    def load_multiple(self, sources: List[str]) -> List[Dict[str, Any]]:
-        """Load content from multiple sources (URLs or files)."""
-        results = []
+    def load_multiple(self, sources: List[str],
+                      headers: Dict[str, Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Load content from multiple sources (URLs or files).
+        
+        URLs are fetched concurrently through AsyncFetcher; results keep the
+        order of ``sources``. ``headers`` optionally maps a URL to extra
+        request headers.
+        """
+        results: List[Dict[str, Any]] = [None] * len(sources)
+        headers = headers or {}
+        
+        url_indices = [i for i, source in enumerate(sources) if self._is_url(source)]
+        if url_indices and HTTPX_AVAILABLE:
+            fetcher = AsyncFetcher(
+                max_connections=self.max_connections,
+                max_per_host=self.max_per_host,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                headers=dict(self.session.headers)
+            )
+            urls = [sources[i] for i in url_indices]
+            fetched = fetcher.fetch_many(
+                urls, headers={url: self._request_headers(url, headers.get(url)) for url in urls}
+            )
+            for i, item in zip(url_indices, fetched):
+                if item["response"] is None:
+                    logger.error(f"Failed to load URL {item['url']}: {item['error']}")
+                    results[i] = {
+                        "source": item["url"],
+                        "content": "",
+                        "error": item["error"],
+                        "success": False
+                    }
+                else:
+                    results[i] = self._url_result(item["url"], item["response"])
         
-        for source in sources:
+        for i, source in enumerate(sources):
+            if results[i] is not None:
+                continue
             if self._is_url(source):
-                result = self.load_url(source)
+                results[i] = self.load_url(source, headers=headers.get(source))
             else:
-                result = self.load_file(source)
-            results.append(result)
+                results[i] = self.load_file(source)
         
         return results
     
+    @staticmethod
+    def _file_hash(file_path: Path, block_size: int = 1024 * 1024) -> str:
+        """SHA-256 of a file's bytes, read block by block."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
     def _is_url(self, source: str) -> bool:
         """Check if source is a URL."""
         try:
@@ -116,22 +188,71 @@ class BasicLoader:
         except:
             return False
     
+    def _request_headers(self, url: str, headers: Dict[str, str] = None) -> Dict[str, str]:
+        """Merge crawl-cache validators with caller headers (caller wins)."""
+        if self.crawl_cache is None:
+            return headers
+        return {**self.crawl_cache.conditional_headers(url), **(headers or {})} or None
+    
+    def _url_result(self, url: str, response) -> Dict[str, Any]:
+        """Build a load result from a successful HTTP response.
+        
+        Accepts a requests or httpx response.
+        """
+        if response.status_code == 304:
+            cached = self.crawl_cache.get(url) if self.crawl_cache is not None else None
+            if cached is not None:
+                self.crawl_cache.mark_validated(url)
+                return {
+                    "source": url,
+                    "content": cached["text"],
+                    "content_type": cached["content_type"] or "",
+                    "status_code": 304,
+                    "content_hash": cached["content_hash"],
+                    "etag": cached["etag"],
+                    "last_modified": cached["last_modified"],
+                    "not_modified": True,
+                    "from_cache": True,
+                    "success": True
+                }
+            return {
+                "source": url,
+                "content": "",
+                "status_code": 304,
+                "not_modified": True,
+                "success": True
+            }
+        
+        # Extract text content
+        content = self._extract_text_from_response(response)
+        
+        result = {
+            "source": url,
+            "content": content,
+            "content_type": response.headers.get('content-type', ''),
+            "status_code": response.status_code,
+            "size_bytes": len(response.content),
+            "etag": response.headers.get('etag'),
+            "last_modified": response.headers.get('last-modified'),
+            "success": True
+        }
+        if self.crawl_cache is not None:
+            result["content_hash"] = self.crawl_cache.put(
+                url, content, etag=result["etag"], last_modified=result["last_modified"],
+                content_type=result["content_type"]
+            )
+        return result
+    
     def _extract_text_from_response(self, response: requests.Response) -> str:
         """Extract text content from HTTP response."""
         content_type = response.headers.get('content-type', '').lower()
         
         if 'text/html' in content_type:
-            # Basic HTML text extraction
-            from bs4 import BeautifulSoup
-            try:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                return soup.get_text(separator=' ', strip=True)
-            except ImportError:
-                logger.warning("BeautifulSoup not available, returning raw HTML")
-                return response.text
+            # Event-based extraction: no document tree, boilerplate dropped while parsing
+            charset = None
+            if 'charset=' in content_type:
+                charset = content_type.split('charset=', 1)[1].split(';')[0].strip(' "\'') or None
+            return extract_text(response.content, encoding=charset)
         elif 'text/plain' in content_type or 'application/json' in content_type:
             return response.text
         else:
@@ -0,0 +1,114 @@
+"""
+Crawl Cache for OMNIMIND
+
+Persistent per-URL cache of HTTP validators and extracted text, so
+re-crawls can send conditional requests and skip unchanged pages.
+"""
+
+import os
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlCache:
+    """SQLite-backed crawl cache keyed by URL.
+
+    Each entry holds the page's ETag, Last-Modified, content type, the hash
+    of its extracted text and the text itself. A 304 reply to the
+    conditional headers from ``conditional_headers`` means the cached text
+    is still current.
+    """
+
+    def __init__(self, path: str = "data/crawl_cache.db"):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS crawl_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                content_hash TEXT,
+                text TEXT,
+                fetched_at TEXT,
+                validated_at TEXT
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get the cache entry for a URL."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT url, etag, last_modified, content_type, content_hash, text, "
+                "fetched_at, validated_at FROM crawl_cache WHERE url = ?", (url,)
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        keys = ("url", "etag", "last_modified", "content_type", "content_hash",
+                "text", "fetched_at", "validated_at")
+        return dict(zip(keys, row))
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for re-fetching a URL."""
+        entry = self.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, text: str, etag: str = None, last_modified: str = None,
+            content_type: str = None) -> str:
+        """Store a freshly fetched page and return its content hash."""
+        content_hash = self.content_hash(text)
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, content_type, content_hash, text, now, now)
+            )
+            self._conn.commit()
+        return content_hash
+
+    def mark_validated(self, url: str):
+        """Record that the server confirmed the cached entry (304)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawl_cache SET validated_at = ? WHERE url = ?",
+                (datetime.utcnow().isoformat(), url)
+            )
+            self._conn.commit()
+
+    def delete(self, url: str):
+        """Drop the cache entry for a URL."""
+        with self._lock:
+            self._conn.execute("DELETE FROM crawl_cache WHERE url = ?", (url,))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM crawl_cache").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash of a page's extracted text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
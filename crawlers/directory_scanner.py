@@ -0,0 +1,184 @@
+"""
+Directory Scanner for OMNIMIND
+
+Walks directory trees in parallel with ``os.scandir`` and compares every
+file against a persisted (path, size, mtime, hash) manifest, yielding only
+new or changed files.
+"""
+
+import os
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Iterator, Iterable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DirectoryScanner:
+    """Incremental, parallel directory scanner.
+
+    Unchanged files cost one ``stat`` each: a file is only hashed when its
+    size or mtime differs from the manifest, and files whose hash still
+    matches (touched but identical) are not emitted. Changed files are
+    recorded in the manifest only when the caller ``commit``s them, so a
+    crash mid-ingestion re-emits them on the next scan.
+    """
+
+    def __init__(self, manifest_path: str = "data/scan_manifest.db", max_workers: int = 8,
+                 extensions: Iterable[str] = None, hash_batch_size: int = 64):
+        self.manifest_path = manifest_path
+        self.max_workers = max_workers
+        self.extensions = {ext.lower() for ext in extensions} if extensions else None
+        self.hash_batch_size = hash_batch_size
+        self.deleted: List[str] = []
+
+        if manifest_path != ":memory:":
+            directory = os.path.dirname(manifest_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(manifest_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime REAL,
+                hash TEXT,
+                scanned_at TEXT
+            )"""
+        )
+        self._conn.commit()
+
+    def scan(self, root: str) -> Iterator[Dict[str, Any]]:
+        """Lazily yield new and modified files under ``root``.
+
+        Each entry holds ``path``, ``size``, ``mtime``, ``hash`` and
+        ``status`` ("new" or "modified"). Once the generator is exhausted,
+        ``self.deleted`` lists manifest paths under root that no longer exist.
+        """
+        root = os.path.abspath(root)
+        known = self._known_files(root)
+        seen = set()
+        pending: List[Tuple[str, int, float]] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as hash_pool:
+            for path, size, mtime in self._walk(root):
+                seen.add(path)
+                record = known.get(path)
+                if record is not None and record[0] == size and record[1] == mtime:
+                    continue
+                pending.append((path, size, mtime))
+                if len(pending) >= self.hash_batch_size:
+                    yield from self._emit_changed(pending, known, hash_pool)
+                    pending = []
+            if pending:
+                yield from self._emit_changed(pending, known, hash_pool)
+
+        self.deleted = sorted(set(known) - seen)
+
+    def commit(self, entries: Iterable[Dict[str, Any]]):
+        """Record scanned entries as ingested."""
+        now = datetime.utcnow().isoformat()
+        rows = [(e["path"], e["size"], e["mtime"], e["hash"], now) for e in entries]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def remove(self, paths: Iterable[str]):
+        """Forget deleted files."""
+        with self._lock:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in paths])
+            self._conn.commit()
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Manifest record for a file."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, size, mtime, hash FROM files WHERE path = ?", (os.path.abspath(path),)
+            ).fetchone()
+        return dict(zip(("path", "size", "mtime", "hash"), row)) if row else None
+
+    def close(self):
+        """Close the manifest database."""
+        with self._lock:
+            self._conn.close()
+
+    def _known_files(self, root: str) -> Dict[str, Tuple[int, float, str]]:
+        """Manifest records under root, keyed by path."""
+        prefix = root.rstrip(os.sep) + os.sep
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime, hash FROM files WHERE path >= ? AND path < ?",
+                (prefix, upper)
+            ).fetchall()
+        return {path: (size, mtime, digest) for path, size, mtime, digest in rows}
+
+    def _emit_changed(self, candidates: List[Tuple[str, int, float]],
+                      known: Dict[str, Tuple[int, float, str]],
+                      pool: ThreadPoolExecutor) -> Iterator[Dict[str, Any]]:
+        """Hash candidates in parallel and yield the ones whose content changed."""
+        touched = []
+        for (path, size, mtime), digest in zip(candidates, pool.map(self._hash_file, [c[0] for c in candidates])):
+            if digest is None:
+                continue
+            record = known.get(path)
+            entry = {"path": path, "size": size, "mtime": mtime, "hash": digest}
+            if record is not None and record[2] == digest:
+                touched.append(entry)
+                continue
+            entry["status"] = "modified" if record is not None else "new"
+            yield entry
+        if touched:
+            # Same content under a new mtime: refresh the stat, emit nothing
+            self.commit(touched)
+
+    def _walk(self, root: str) -> Iterator[Tuple[str, int, float]]:
+        """Yield (path, size, mtime) for files under root, scanning directories concurrently."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {pool.submit(self._scan_directory, root)}
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirectories = future.result()
+                    for subdirectory in subdirectories:
+                        running.add(pool.submit(self._scan_directory, subdirectory))
+                    yield from files
+
+    def _scan_directory(self, path: str) -> Tuple[List[Tuple[str, int, float]], List[str]]:
+        """List one directory's matching files and its subdirectories."""
+        files, subdirectories = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            if self.extensions is not None and os.path.splitext(entry.name)[1].lower() not in self.extensions:
+                                continue
+                            stat = entry.stat(follow_symlinks=False)
+                            files.append((entry.path, stat.st_size, stat.st_mtime))
+                    except OSError as e:
+                        logger.warning(f"Skipping {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"Cannot scan directory {path}: {e}")
+        return files, subdirectories
+
+    @staticmethod
+    def _hash_file(path: str, block_size: int = 1024 * 1024) -> Optional[str]:
+        """SHA-256 of a file's bytes, or None if it vanished or is unreadable."""
+        digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(block_size), b""):
+                    digest.update(block)
+        except OSError as e:
+            logger.warning(f"Cannot hash {path}: {e}")
+            return None
+        return digest.hexdigest()
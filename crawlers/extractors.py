@@ -0,0 +1,311 @@
+"""
+File Extractors for OMNIMIND
+
+Streaming, format-aware text extraction. Each extractor yields text
+segments (a block of lines, a PDF page, a batch of CSV rows or JSON
+records) so files of any size can be fed to the chunker without being
+read into memory whole.
+"""
+
+import csv
+import json
+import codecs
+import zipfile
+from pathlib import Path
+from typing import Iterator, Dict, Any, Optional, List
+from xml.etree import ElementTree
+import logging
+
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+try:
+    from charset_normalizer import from_bytes as _detect_charset
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def detect_encoding(path: str, sample_size: int = 64 * 1024) -> str:
+    """Guess a text file's encoding from its first ``sample_size`` bytes.
+
+    Checks for a BOM, then strict UTF-8, then charset_normalizer when
+    installed (preferring cp1252 among equally scored candidates), and falls
+    back to latin-1, which decodes any byte sequence.
+    """
+    with open(path, "rb") as f:
+        sample = f.read(sample_size)
+
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    try:
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the sample boundary is fine
+        if e.start >= len(sample) - 3 and e.reason == "unexpected end of data":
+            return "utf-8"
+
+    if CHARSET_NORMALIZER_AVAILABLE:
+        matches = _detect_charset(sample)
+        best = matches.best()
+        if best is not None:
+            # Single-byte code pages often tie; prefer the common Western one
+            tied = {m.encoding for m in matches
+                    if (m.percent_chaos, m.percent_coherence) == (best.percent_chaos, best.percent_coherence)}
+            return "cp1252" if "cp1252" in tied else best.encoding
+    return "latin-1"
+
+
+class Extractor:
+    """Base class for streaming extractors.
+
+    Subclasses implement ``extract(path)`` as a generator of text segments.
+    Segments end with a newline so callers can simply concatenate them.
+    """
+
+    extensions: tuple = ()
+    content_type: str = "text/plain"
+
+    def extract(self, path: str) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class TextExtractor(Extractor):
+    """Plain text in blocks of about ``block_size`` characters, cut at line ends."""
+
+    extensions = (".txt", ".md")
+
+    def __init__(self, block_size: int = 64 * 1024):
+        self.block_size = block_size
+
+    def extract(self, path: str) -> Iterator[str]:
+        encoding = detect_encoding(path)
+        carry = ""
+        with open(path, "r", encoding=encoding, errors="replace") as f:
+            while True:
+                block = f.read(self.block_size)
+                if not block:
+                    break
+                block = carry + block
+                cut = block.rfind("\n")
+                if cut < 0:
+                    carry = block
+                    if len(carry) < self.block_size:
+                        continue
+                    cut = len(block) - 1
+                carry = block[cut + 1:]
+                yield block[:cut + 1]
+        if carry:
+            yield carry
+
+
+class CsvExtractor(Extractor):
+    """CSV rows as ``column: value`` lines, ``rows_per_segment`` rows at a time."""
+
+    extensions = (".csv", ".tsv")
+    content_type = "text/csv"
+
+    def __init__(self, rows_per_segment: int = 200):
+        self.rows_per_segment = rows_per_segment
+
+    def extract(self, path: str) -> Iterator[str]:
+        encoding = detect_encoding(path)
+        delimiter = "\t" if Path(path).suffix.lower() == ".tsv" else ","
+        with open(path, "r", encoding=encoding, errors="replace", newline="") as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                return
+            rows: List[str] = []
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                rows.append("; ".join(
+                    f"{name}: {value}" for name, value in zip(header, row) if value.strip()
+                ))
+                if len(rows) >= self.rows_per_segment:
+                    yield "\n".join(rows) + "\n"
+                    rows = []
+            if rows:
+                yield "\n".join(rows) + "\n"
+
+
+class JsonExtractor(Extractor):
+    """JSON records flattened to ``path: value`` lines, decoded incrementally.
+
+    A top-level array is decoded one element at a time with
+    ``JSONDecoder.raw_decode`` over a sliding buffer, and ``.jsonl`` files
+    line by line. Any other top-level value is decoded whole.
+    """
+
+    extensions = (".json", ".jsonl", ".ndjson")
+    content_type = "application/json"
+
+    def __init__(self, records_per_segment: int = 100, read_size: int = 64 * 1024):
+        self.records_per_segment = records_per_segment
+        self.read_size = read_size
+
+    def extract(self, path: str) -> Iterator[str]:
+        encoding = detect_encoding(path)
+        if Path(path).suffix.lower() in (".jsonl", ".ndjson"):
+            records = self._iter_lines(path, encoding)
+        else:
+            records = self._iter_array(path, encoding)
+
+        lines: List[str] = []
+        count = 0
+        for record in records:
+            lines.extend(_flatten_json(record))
+            count += 1
+            if count >= self.records_per_segment:
+                yield "\n".join(lines) + "\n"
+                lines, count = [], 0
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _iter_lines(path: str, encoding: str) -> Iterator[Any]:
+        with open(path, "r", encoding=encoding, errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def _iter_array(self, path: str, encoding: str) -> Iterator[Any]:
+        decoder = json.JSONDecoder()
+        with open(path, "r", encoding=encoding, errors="replace") as f:
+            buffer = f.read(self.read_size).lstrip()
+            if not buffer:
+                return
+            if not buffer.startswith("["):
+                # Not an array: there is no record boundary to stream on
+                yield json.loads(buffer + f.read())
+                return
+
+            buffer = buffer[1:]
+            eof = False
+            while True:
+                buffer = buffer.lstrip().lstrip(",").lstrip()
+                if buffer.startswith("]"):
+                    return
+                # Keep at least one read of lookahead so a record (or a
+                # number) is never decoded from a truncated buffer
+                if not eof and len(buffer) < self.read_size:
+                    more = f.read(self.read_size)
+                    eof = not more
+                    buffer += more
+                    continue
+                if not buffer:
+                    return
+                try:
+                    record, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    more = f.read(self.read_size)
+                    eof = not more
+                    buffer += more
+                    continue
+                if end == len(buffer) and not eof:
+                    more = f.read(self.read_size)
+                    eof = not more
+                    buffer += more
+                    continue
+                yield record
+                buffer = buffer[end:]
+
+
+class DocxExtractor(Extractor):
+    """Word documents, streamed paragraph by paragraph from the document XML."""
+
+    extensions = (".docx",)
+    content_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+    _NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+    def __init__(self, paragraphs_per_segment: int = 50):
+        self.paragraphs_per_segment = paragraphs_per_segment
+
+    def extract(self, path: str) -> Iterator[str]:
+        paragraphs: List[str] = []
+        with zipfile.ZipFile(path) as archive:
+            with archive.open("word/document.xml") as document:
+                for _, element in ElementTree.iterparse(document, events=("end",)):
+                    if element.tag != f"{self._NAMESPACE}p":
+                        continue
+                    text = "".join(node.text or "" for node in element.iter(f"{self._NAMESPACE}t"))
+                    element.clear()
+                    if text.strip():
+                        paragraphs.append(text)
+                    if len(paragraphs) >= self.paragraphs_per_segment:
+                        yield "\n".join(paragraphs) + "\n"
+                        paragraphs = []
+        if paragraphs:
+            yield "\n".join(paragraphs) + "\n"
+
+
+class PdfExtractor(Extractor):
+    """PDF text one page at a time (requires pypdf)."""
+
+    extensions = (".pdf",)
+    content_type = "application/pdf"
+
+    def extract(self, path: str) -> Iterator[str]:
+        if not PYPDF_AVAILABLE:
+            raise ImportError("pypdf is required to extract PDF files")
+        reader = PdfReader(path)
+        for page in reader.pages:
+            text = page.extract_text() or ""
+            if text.strip():
+                yield text + "\n"
+
+
+EXTRACTORS: Dict[str, Extractor] = {}
+
+
+def register_extractor(extractor: Extractor, extensions: tuple = None):
+    """Register an extractor for its file extensions (or the given ones)."""
+    for extension in extensions or extractor.extensions:
+        EXTRACTORS[extension.lower()] = extractor
+
+
+def get_extractor(path: str) -> Optional[Extractor]:
+    """The extractor registered for a file's extension, if any."""
+    return EXTRACTORS.get(Path(path).suffix.lower())
+
+
+for _extractor in (TextExtractor(), CsvExtractor(), JsonExtractor(), DocxExtractor(), PdfExtractor()):
+    register_extractor(_extractor)
+
+
+def _flatten_json(value: Any, prefix: str = "") -> List[str]:
+    """Render a JSON value as ``dotted.path: value`` lines."""
+    if isinstance(value, dict):
+        lines = []
+        for key, item in value.items():
+            lines.extend(_flatten_json(item, f"{prefix}.{key}" if prefix else str(key)))
+        return lines
+    if isinstance(value, list):
+        lines = []
+        for i, item in enumerate(value):
+            lines.extend(_flatten_json(item, f"{prefix}[{i}]"))
+        return lines
+    if value is None:
+        return []
+    return [f"{prefix}: {value}" if prefix else str(value)]
@@ -7,33 +7,50 @@ Handles ingestion of files from local and remote sources.
 import os
 import requests
 from pathlib import Path
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Iterator
 import logging
+from .extractors import get_extractor
+from .directory_scanner import DirectoryScanner
 
 logger = logging.getLogger(__name__)
 
 
 class FileIngestor:
-    """File ingestor for processing various file formats."""
+    """File ingestor for processing various file formats.
     
-    SUPPORTED_FORMATS = ['.txt', '.md', '.pdf', '.docx', '.csv', '.json']
+    Text is pulled through the streaming extractor registered for each
+    file's extension (see crawlers.extractors), so binary formats are
+    decoded properly and ``chunk_file`` never holds a whole file in memory.
+    """
+    
+    SUPPORTED_FORMATS = ['.txt', '.md', '.pdf', '.docx', '.csv', '.tsv', '.json', '.jsonl', '.ndjson']
     
     def __init__(self, base_path: str = "./data"):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
     
+    def stream_file(self, file_path: str) -> Iterator[str]:
+        """Yield a local file's text segment by segment.
+        
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If no extractor handles the file's format
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        extractor = get_extractor(str(file_path))
+        if file_path.suffix.lower() not in self.SUPPORTED_FORMATS or extractor is None:
+            raise ValueError(f"Unsupported file format: {file_path.suffix}")
+        
+        return extractor.extract(str(file_path))
+    
     def ingest_local_file(self, file_path: str) -> Dict[str, Any]:
         """Ingest a local file and return its content."""
         try:
             file_path = Path(file_path)
-            if not file_path.exists():
-                raise FileNotFoundError(f"File not found: {file_path}")
-            
-            if file_path.suffix not in self.SUPPORTED_FORMATS:
-                raise ValueError(f"Unsupported file format: {file_path.suffix}")
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = "".join(self.stream_file(str(file_path)))
             
             return {
                 "file_path": str(file_path),
@@ -46,10 +63,28 @@ class FileIngestor:
             logger.error(f"Error ingesting file {file_path}: {e}")
             return {"file_path": str(file_path), "error": str(e)}
     
+    def chunk_file(self, file_path: str, chunker) -> Iterator[Dict[str, Any]]:
+        """Stream a local file straight into a SmartChunker.
+        
+        Yields chunks tagged with the file's document fields as they are
+        produced; memory use is bounded by the chunker's window, not the
+        file size.
+        """
+        file_path = Path(file_path)
+        extractor = get_extractor(str(file_path))
+        for chunk in chunker.chunk_stream(self.stream_file(str(file_path))):
+            chunk.update({
+                "document_id": str(file_path),
+                "document_title": file_path.name,
+                "document_type": extractor.content_type,
+                "source": str(file_path)
+            })
+            yield chunk
+    
     def ingest_remote_file(self, url: str, filename: str = None) -> Dict[str, Any]:
         """Download and ingest a remote file."""
         try:
-            response = requests.get(url, timeout=30)
+            response = requests.get(url, timeout=30, stream=True)
             response.raise_for_status()
             
             if filename is None:
@@ -58,25 +93,53 @@ class FileIngestor:
             file_path = self.base_path / filename
             
             with open(file_path, 'wb') as f:
-                f.write(response.content)
+                for block in response.iter_content(chunk_size=64 * 1024):
+                    f.write(block)
             
             return self.ingest_local_file(str(file_path))
         except Exception as e:
             logger.error(f"Error ingesting remote file {url}: {e}")
             return {"url": url, "error": str(e)}
     
-    def ingest_directory(self, directory_path: str) -> List[Dict[str, Any]]:
-        """Ingest all supported files from a directory."""
-        results = []
-        directory = Path(directory_path)
+    def iter_directory(self, directory_path: str,
+                       scanner: DirectoryScanner = None) -> Iterator[Dict[str, Any]]:
+        """Lazily ingest new and changed supported files under a directory.
         
-        if not directory.exists():
+        With a ``scanner`` only files that changed since they were last
+        ingested are read, and each file is committed to the scanner's
+        manifest once ingested. Without one, every supported file is read.
+        """
+        if not Path(directory_path).exists():
             logger.error(f"Directory not found: {directory_path}")
-            return results
+            return
+        
+        owns_scanner = scanner is None
+        if owns_scanner:
+            scanner = DirectoryScanner(manifest_path=":memory:", extensions=self.SUPPORTED_FORMATS)
+        try:
+            for entry in scanner.scan(directory_path):
+                if Path(entry["path"]).suffix.lower() not in self.SUPPORTED_FORMATS:
+                    continue
+                result = self.ingest_local_file(entry["path"])
+                result["scan_status"] = entry["status"]
+                if "error" not in result:
+                    scanner.commit([entry])
+                yield result
+        finally:
+            if owns_scanner:
+                scanner.close()
+    
+    def ingest_directory(self, directory_path: str, manifest_path: str = None) -> List[Dict[str, Any]]:
+        """Ingest all supported files from a directory.
         
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and file_path.suffix in self.SUPPORTED_FORMATS:
-                result = self.ingest_local_file(str(file_path))
-                results.append(result)
+        With ``manifest_path`` files unchanged since the previous call are
+        skipped (see DirectoryScanner).
+        """
+        if manifest_path is None:
+            return list(self.iter_directory(directory_path))
         
-        return results 
\ No newline at end of file
+        scanner = DirectoryScanner(manifest_path=manifest_path, extensions=self.SUPPORTED_FORMATS)
+        try:
+            return list(self.iter_directory(directory_path, scanner=scanner))
+        finally:
+            scanner.close()
@@ -0,0 +1,196 @@
+"""
+HTML Text Extractor for OMNIMIND
+
+Event-based HTML-to-text extraction. Instead of building a document tree
+and deleting nodes from it, the extractor listens to parser events (stdlib
+``html.parser``, or lxml's feed parser when installed), skips everything
+inside non-content and boilerplate tags, and emits text as soon as each
+text node is complete.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List, Iterable, Iterator, Optional, Union
+import logging
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Tags whose content is never page text
+NON_CONTENT_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "math",
+    "iframe", "object", "canvas", "select"
+})
+
+# Page chrome repeated across a site
+BOILERPLATE_TAGS = frozenset({"nav", "footer", "aside"})
+
+DEFAULT_DROP_TAGS = NON_CONTENT_TAGS | BOILERPLATE_TAGS
+
+# Closing these resets skipping, so an unclosed boilerplate tag cannot hide the rest of the page
+_RESET_TAGS = frozenset({"body", "html"})
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+
+class _TextCollector:
+    """Turns start/end/data events into stripped text pieces.
+
+    Text is buffered until the next tag boundary so a text node split
+    across fed chunks is emitted whole, matching BeautifulSoup's
+    ``get_text(" ", strip=True)`` granularity.
+    """
+
+    def __init__(self, drop_tags: frozenset):
+        self.drop_tags = drop_tags
+        self.skip_depth = 0
+        self.buffer: List[str] = []
+        self.pieces: List[str] = []
+
+    def start(self, tag: str):
+        self.flush()
+        if tag in self.drop_tags:
+            self.skip_depth += 1
+
+    def end(self, tag: str):
+        self.flush()
+        if tag in self.drop_tags and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag in _RESET_TAGS:
+            self.skip_depth = 0
+
+    def data(self, text: str):
+        if not self.skip_depth:
+            self.buffer.append(text)
+
+    def flush(self):
+        if self.buffer:
+            text = "".join(self.buffer).strip()
+            self.buffer = []
+            if text:
+                self.pieces.append(text)
+
+    def take(self) -> List[str]:
+        pieces, self.pieces = self.pieces, []
+        return pieces
+
+
+class _StdlibParser(HTMLParser):
+    """``html.parser`` backend."""
+
+    def __init__(self, collector: _TextCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def handle_comment(self, data):
+        self.collector.flush()
+
+
+class _LxmlTarget:
+    """lxml parser-target backend."""
+
+    def __init__(self, collector: _TextCollector):
+        self.collector = collector
+
+    def start(self, tag, attrib):
+        self.collector.start(tag)
+
+    def end(self, tag):
+        self.collector.end(tag)
+
+    def data(self, data):
+        self.collector.data(data)
+
+    def comment(self, text):
+        self.collector.flush()
+
+    def close(self):
+        return None
+
+
+class HTMLTextExtractor:
+    """Incremental HTML-to-text extractor.
+
+    ``feed`` accepts markup in chunks of any size and returns the text
+    pieces completed so far; ``close`` returns the rest. ``backend`` is
+    "lxml", "stdlib" or "auto" (lxml when installed).
+    """
+
+    def __init__(self, drop_tags: Iterable[str] = None, backend: str = "auto"):
+        if backend == "auto":
+            backend = "lxml" if LXML_AVAILABLE else "stdlib"
+        if backend == "lxml" and not LXML_AVAILABLE:
+            raise ImportError("lxml is required for the lxml backend")
+        if backend not in ("lxml", "stdlib"):
+            raise ValueError(f"Unknown HTML parser backend: {backend}")
+
+        self.backend = backend
+        self.drop_tags = frozenset(t.lower() for t in drop_tags) if drop_tags is not None else DEFAULT_DROP_TAGS
+        self._collector = _TextCollector(self.drop_tags)
+        if backend == "lxml":
+            self._parser = etree.HTMLParser(target=_LxmlTarget(self._collector), recover=True)
+        else:
+            self._parser = _StdlibParser(self._collector)
+        self._fed = False
+
+    def feed(self, data: str) -> List[str]:
+        """Parse a chunk of markup; returns newly completed text pieces."""
+        if data:
+            self._fed = True
+            self._parser.feed(data)
+        return self._collector.take()
+
+    def close(self) -> List[str]:
+        """Finish parsing; returns the remaining text pieces."""
+        # lxml refuses to close a parser that was never fed
+        if self._fed or self.backend == "stdlib":
+            self._parser.close()
+        self._collector.flush()
+        return self._collector.take()
+
+    def iter_text(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Stream text pieces from an iterable of markup chunks."""
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+
+def decode_html(data: bytes, encoding: str = None) -> str:
+    """Decode HTML bytes using the given charset, a ``<meta charset>``
+    declaration, UTF-8, or cp1252, in that order."""
+    candidates = [encoding] if encoding else []
+    match = _META_CHARSET.search(data[:4096])
+    if match:
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+    for candidate in candidates:
+        try:
+            return data.decode(candidate)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+
+def extract_text(html: Union[str, bytes], encoding: Optional[str] = None,
+                 drop_tags: Iterable[str] = None, backend: str = "auto") -> str:
+    """Visible text of an HTML document, pieces joined by single spaces."""
+    if isinstance(html, bytes):
+        html = decode_html(html, encoding)
+    extractor = HTMLTextExtractor(drop_tags=drop_tags, backend=backend)
+    return " ".join(extractor.iter_text([html]))
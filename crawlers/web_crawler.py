@@ -6,18 +6,32 @@ Handles web scraping and data extraction from various sources.
 
 import scrapy
 from newspaper import Article
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable
 import logging
+from .frontier import CrawlFrontier, FrontierCrawler, extract_links
 
 logger = logging.getLogger(__name__)
 
 
 class WebCrawler:
-    """Web crawler for extracting content from web pages."""
+    """Web crawler for extracting content from web pages.
     
-    def __init__(self, allowed_domains: List[str] = None):
+    ``crawl`` follows links breadth-first through a CrawlFrontier, limited to
+    ``allowed_domains`` and ``max_depth`` and polite to each host;
+    ``crawl_urls`` fetches a fixed list concurrently.
+    """
+    
+    def __init__(self, allowed_domains: List[str] = None, max_depth: int = 1,
+                 max_workers: int = 8, politeness_delay: float = 1.0,
+                 fetch_page: Callable[[str], Dict[str, Any]] = None):
         self.allowed_domains = allowed_domains or []
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.politeness_delay = politeness_delay
+        self.fetch_page = fetch_page or self.crawl_url
         self.extracted_data = []
+        self.last_metrics: Dict[str, Any] = {}
     
     def crawl_url(self, url: str) -> Dict[str, Any]:
         """Extract content from a single URL."""
@@ -25,6 +39,7 @@ class WebCrawler:
             article = Article(url)
             article.download()
             article.parse()
+            links = extract_links(article.html, url)
             article.nlp()
             
             return {
@@ -34,18 +49,36 @@ class WebCrawler:
                 "summary": article.summary,
                 "keywords": article.keywords,
                 "publish_date": article.publish_date,
-                "authors": article.authors
+                "authors": article.authors,
+                "links": links
             }
         except Exception as e:
             logger.error(f"Error crawling {url}: {e}")
             return {"url": url, "error": str(e)}
     
     def crawl_urls(self, urls: List[str]) -> List[Dict[str, Any]]:
-        """Crawl multiple URLs and return extracted data."""
-        results = []
-        for url in urls:
-            result = self.crawl_url(url)
-            results.append(result)
+        """Crawl multiple URLs concurrently and return extracted data in order."""
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as pool:
+            return list(pool.map(self.fetch_page, urls))
+    
+    def crawl(self, seeds: List[str], max_depth: int = None, max_pages: int = None) -> List[Dict[str, Any]]:
+        """Crawl outward from seed URLs, following links within scope.
+        
+        Returns one result per fetched page (with its ``depth``); frontier
+        throughput and queue-depth metrics are kept in ``last_metrics``.
+        """
+        frontier = CrawlFrontier(
+            allowed_domains=self.allowed_domains,
+            max_depth=self.max_depth if max_depth is None else max_depth,
+            politeness_delay=self.politeness_delay
+        )
+        engine = FrontierCrawler(self.fetch_page, frontier, max_workers=self.max_workers,
+                                 max_pages=max_pages)
+        results = engine.run(seeds)
+        self.last_metrics = frontier.metrics()
+        self.extracted_data.extend(r for r in results if "error" not in r)
         return results
 
 
@@ -54,15 +87,24 @@ class OMNIMINDSpider(scrapy.Spider):
     
     name = "omnimind_spider"
     
-    def __init__(self, start_urls=None, *args, **kwargs):
+    def __init__(self, start_urls=None, allowed_domains=None, max_depth=1, *args, **kwargs):
         super(OMNIMINDSpider, self).__init__(*args, **kwargs)
         self.start_urls = start_urls or []
+        if allowed_domains:
+            self.allowed_domains = allowed_domains
+        self.max_depth = int(max_depth)
     
     def parse(self, response):
-        """Parse the response and extract content."""
+        """Parse the response, extract content and follow links within depth."""
+        links = response.css("a::attr(href)").getall()
         yield {
             "url": response.url,
             "title": response.css("title::text").get(),
             "content": response.css("body::text").get(),
-            "links": response.css("a::attr(href)").getall()
-        } 
\ No newline at end of file
+            "links": links
+        }
+        
+        # Scrapy's offsite and dupe filters handle scope and revisits
+        if response.meta.get("depth", 0) < self.max_depth:
+            for href in links:
+                yield response.follow(href, callback=self.parse) 
\ No newline at end of file
@@ -4,6 +4,41 @@ OMNIMIND Knowledge Graph Module
 This module handles knowledge graph operations and entity relationships.
 """
 
+import os
+
 from .kg_manager import KnowledgeGraphManager
+from .sqlite_store import SQLiteGraphStore
+from .compact_graph import CompactGraph
+from .neo4j_store import Neo4jGraphStore, NEO4J_AVAILABLE
+from .centrality import CentralityIndex, pagerank, degree_centrality
+
+GRAPH_BACKENDS = ("memory", "compact", "sqlite", "neo4j")
+
+
+def create_graph_store(backend: str = None, **kwargs):
+    """Build a knowledge graph store.
+
+    ``backend`` is "memory", "compact" (interned ids and CSR adjacency for
+    very large graphs), "sqlite" or "neo4j"; it defaults to the
+    OMNIMIND_KG_BACKEND environment variable, then "sqlite". Keyword
+    arguments go to the store (``db_path`` for SQLite; ``uri``, ``user``,
+    ``password`` and ``database`` for Neo4j).
+    """
+    backend = backend or os.getenv("OMNIMIND_KG_BACKEND", "sqlite")
+    if backend == "memory":
+        return KnowledgeGraphManager(use_neo4j=False)
+    if backend == "compact":
+        return CompactGraph()
+    if backend == "sqlite":
+        kwargs.setdefault("db_path", os.getenv("OMNIMIND_KG_PATH", "data/kg.db"))
+        return SQLiteGraphStore(**kwargs)
+    if backend == "neo4j":
+        kwargs.setdefault("uri", os.getenv("NEO4J_URI", "bolt://localhost:7687"))
+        kwargs.setdefault("user", os.getenv("NEO4J_USER", "neo4j"))
+        kwargs.setdefault("password", os.getenv("NEO4J_PASSWORD"))
+        return Neo4jGraphStore(**kwargs)
+    raise ValueError(f"Unknown knowledge graph backend {backend!r}; expected one of {GRAPH_BACKENDS}")
+
 
-__all__ = ["KnowledgeGraphManager"] 
\ No newline at end of file
+__all__ = ["KnowledgeGraphManager", "CompactGraph", "SQLiteGraphStore", "Neo4jGraphStore", "NEO4J_AVAILABLE",
+           "CentralityIndex", "pagerank", "degree_centrality", "create_graph_store"]
@@ -0,0 +1,449 @@
+"""
+Compact Knowledge Graph for OMNIMIND
+
+Memory-lean graph mode for very large graphs (tens of millions of
+chunk -> document edges). Entity ids are interned to int32, new edges go
+to typed append buffers, and reads compact them into CSR (outgoing) and
+CSC (incoming) NumPy arrays. Properties live in typed columnar side
+tables. The public interface matches KnowledgeGraphManager.
+"""
+
+import sys
+import math
+import threading
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+import numpy as np
+
+from .kg_manager import DIRECTIONS, TokenIndex, batch_rows, entity_tokens
+from .traversal import GraphTraversal, Adjacency
+
+_MISSING_INT = -(1 << 63)
+
+
+class _PropertyColumn:
+    """One property across rows, stored as a typed array.
+
+    Integers go to an int64 array and floats to a float64 array; strings,
+    booleans and other hashable values are dictionary-encoded as int32
+    codes, so a value repeated on many rows is held once. Rows without the
+    property hold a sentinel (a NaN float reads back as missing). A column
+    whose values mix kinds or are unhashable falls back to a plain list.
+    """
+
+    _TYPECODES = {"int": "q", "float": "d", "code": "i"}
+    _FILL = {"int": _MISSING_INT, "float": math.nan, "code": -1, "object": None}
+
+    def __init__(self):
+        self.kind = None
+        self.data = None
+        self.values: List[Any] = []  # Dictionary of a "code" column
+        self.codes: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.data) if self.data is not None else 0
+
+    def set(self, row: int, value: Any):
+        kind = self._kind_of(value)
+        if self.kind is None:
+            self.kind = kind
+            self.data = [] if kind == "object" else array(self._TYPECODES[kind])
+        elif kind != self.kind and self.kind != "object":
+            self._to_object()
+        if len(self.data) <= row:
+            self.data.extend([self._FILL[self.kind]] * (row + 1 - len(self.data)))
+        self.data[row] = self._encode(value)
+
+    def get(self, row: int) -> Any:
+        """The row's value, or None if it has none."""
+        if row >= len(self):
+            return None
+        raw = self.data[row]
+        if self.kind == "code":
+            return self.values[raw] if raw >= 0 else None
+        if self.kind == "int":
+            return raw if raw != _MISSING_INT else None
+        if self.kind == "float":
+            return raw if not math.isnan(raw) else None
+        return raw
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the column and its dictionary."""
+        if self.data is None:
+            return 0
+        if self.kind == "object":
+            return sys.getsizeof(self.data) + sum(sys.getsizeof(v) for v in self.data if v is not None)
+        size = len(self.data) * self.data.itemsize
+        if self.kind == "code":
+            size += sys.getsizeof(self.values) + sys.getsizeof(self.codes)
+            size += sum(sys.getsizeof(v) for v in self.values)
+        return size
+
+    @staticmethod
+    def _kind_of(value: Any) -> str:
+        if isinstance(value, bool):
+            return "code"
+        if isinstance(value, int):
+            return "int" if _MISSING_INT < value < (1 << 63) else "object"
+        if isinstance(value, float):
+            return "float"
+        try:
+            hash(value)
+        except TypeError:
+            return "object"
+        return "code"
+
+    def _encode(self, value: Any) -> Any:
+        if self.kind != "code":
+            return value
+        # Keyed by type too, so True and 1 do not share a code
+        key = (type(value), value)
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def _to_object(self):
+        """Switch to a plain list of decoded values."""
+        decoded = [self.get(row) for row in range(len(self))]
+        self.kind, self.data, self.values, self.codes = "object", decoded, [], {}
+
+
+class CompactGraph(GraphTraversal):
+    """Knowledge graph over interned integer ids and CSR/CSC adjacency.
+
+    After compaction every edge costs 14 bytes: target (int32), type code
+    (int16) and insertion sequence (int32) in source-sorted CSR order, plus
+    an int32 CSC permutation. Each edge property adds one typed column
+    entry (4 bytes for a dictionary-encoded string, 8 for a number).
+    Statistics are running counters, so ``get_graph_stats`` is O(number of
+    types).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+        # Entities: interned ids, type codes and columnar properties
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._entity_type_codes = array("h")
+        self._entity_columns: Dict[str, _PropertyColumn] = {}
+        self._token_index = TokenIndex()
+
+        # Entity and relationship type names share one code table
+        self._type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+
+        # Edges not yet compacted
+        self._pending_sources = array("i")
+        self._pending_targets = array("i")
+        self._pending_types = array("h")
+        self._edge_columns: Dict[str, _PropertyColumn] = {}
+
+        # CSR: edges sorted by source; CSC: CSR positions sorted by target
+        self._out_indptr = np.zeros(1, dtype=np.int64)
+        self._out_targets = np.zeros(0, dtype=np.int32)
+        self._out_types = np.zeros(0, dtype=np.int16)
+        self._out_sequence = np.zeros(0, dtype=np.int32)
+        self._in_indptr = np.zeros(1, dtype=np.int64)
+        self._in_positions = np.zeros(0, dtype=np.int32)
+
+        # Running counters
+        self._edge_count = 0
+        self._entity_type_counts: Dict[int, int] = defaultdict(int)
+        self._relationship_type_counts: Dict[int, int] = defaultdict(int)
+
+    def add_entity(self, entity_id: str, entity_type: str, properties: Dict[str, Any]) -> bool:
+        """Add an entity; False if the id already exists."""
+        return self.add_entities([{"id": entity_id, "type": entity_type, "properties": properties}]) == 1
+
+    def add_relationship(self, source_id: str, target_id: str, relationship_type: str,
+                         properties: Optional[Dict[str, Any]] = None) -> bool:
+        """Add a relationship; False unless both entities exist."""
+        return self.add_relationships([{
+            "source": source_id, "target": target_id,
+            "type": relationship_type, "properties": properties
+        }]) == 1
+
+    def add_entities(self, entities: Iterable[Dict[str, Any]]) -> int:
+        """Add many entities; returns how many were new."""
+        added = 0
+        with self._lock:
+            for entity in entities:
+                entity_id = entity["id"]
+                if entity_id in self._index:
+                    continue
+                number = len(self._ids)
+                self._index[entity_id] = number
+                self._ids.append(entity_id)
+                code = self._type_code(entity["type"])
+                self._entity_type_codes.append(code)
+                self._entity_type_counts[code] += 1
+                properties = entity.get("properties") or {}
+                self._set_columns(self._entity_columns, number, properties)
+                self._token_index.add(number, entity_tokens(entity_id, entity["type"], properties))
+                added += 1
+        return added
+
+    def add_relationships(self, relationships: Iterable[Dict[str, Any]]) -> int:
+        """Buffer many relationships between known entities; returns how many were added."""
+        added = 0
+        with self._lock:
+            for relationship in relationships:
+                source = self._index.get(relationship["source"])
+                target = self._index.get(relationship["target"])
+                if source is None or target is None:
+                    continue
+                code = self._type_code(relationship["type"])
+                self._pending_sources.append(source)
+                self._pending_targets.append(target)
+                self._pending_types.append(code)
+                self._set_columns(self._edge_columns, self._edge_count, relationship.get("properties") or {})
+                self._edge_count += 1
+                self._relationship_type_counts[code] += 1
+                added += 1
+        return added
+
+    def add_batch(self, entities: Optional[Dict[str, List[Any]]] = None,
+                  relationships: Optional[Dict[str, List[Any]]] = None) -> Dict[str, int]:
+        """Add a columnar batch (layout as in KnowledgeGraphManager.add_batch)."""
+        with self._lock:
+            return {
+                "entities": self.add_entities(batch_rows(entities, ("id", "type"))),
+                "relationships": self.add_relationships(batch_rows(relationships, ("source", "target", "type")))
+            }
+
+    def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """An entity with its type and properties, or None."""
+        with self._lock:
+            number = self._index.get(entity_id)
+            if number is None:
+                return None
+            return self._entity_dict(number)
+
+    def get_entities_by_type(self, entity_type: str) -> List[Dict[str, Any]]:
+        """All entities of a type, in insertion order."""
+        with self._lock:
+            code = self._type_codes.get(entity_type)
+            if code is None:
+                return []
+            types = np.frombuffer(self._entity_type_codes, dtype=np.int16)
+            return [self._entity_dict(int(n)) for n in np.flatnonzero(types == code)]
+
+    def get_relationships(self, entity_id: str, direction: str = "both",
+                          relationship_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Relationships of an entity in insertion order, read from CSR/CSC slices."""
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+        with self._lock:
+            number = self._index.get(entity_id)
+            code = self._type_codes.get(relationship_type) if relationship_type is not None else None
+            if number is None or (relationship_type is not None and code is None):
+                return []
+            self._compact()
+            positions = self._edge_positions([number], direction)
+            if code is not None:
+                positions = positions[self._out_types[positions] == code]
+            return self._edge_dicts(positions)
+
+    def get_graph_stats(self) -> Dict[str, Any]:
+        """Entity and relationship counts and types from running counters."""
+        with self._lock:
+            return {
+                "total_entities": len(self._ids),
+                "total_relationships": self._edge_count,
+                "entity_types": [self._type_names[c] for c in self._entity_type_counts],
+                "relationship_types": [self._type_names[c] for c in self._relationship_type_counts]
+            }
+
+    def query(self, query: str, limit: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Token-prefix query, matching KnowledgeGraphManager semantics."""
+        with self._lock:
+            numbers = sorted(self._token_index.match(query))
+            if limit:
+                numbers = numbers[:limit]
+            entities = []
+            name_column = self._entity_columns.get("name")
+            for number in numbers:
+                name = name_column.get(number) if name_column is not None else None
+                entities.append({
+                    "id": self._ids[number],
+                    "type": self._type_names[self._entity_type_codes[number]],
+                    "name": name if name is not None else self._ids[number]
+                })
+            relationships = []
+            if numbers:
+                self._compact()
+                positions = self._edge_positions(numbers, "both")
+                if limit:
+                    positions = positions[:limit]
+                relationships = [
+                    {k: v for k, v in edge.items() if k != "properties"}
+                    for edge in self._edge_dicts(positions)
+                ]
+        return {"entities": entities, "relationships": relationships}
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Bytes held by the compacted adjacency arrays and the property columns.
+
+        ``bytes_per_edge`` covers the adjacency arrays plus the edge
+        property columns.
+        """
+        with self._lock:
+            self._compact()
+            edge_bytes = (self._out_targets.nbytes + self._out_types.nbytes +
+                          self._out_sequence.nbytes + self._in_positions.nbytes)
+            edge_property_bytes = sum(column.nbytes() for column in self._edge_columns.values())
+            return {
+                "edge_bytes": edge_bytes,
+                "edge_property_bytes": edge_property_bytes,
+                "entity_property_bytes": sum(column.nbytes() for column in self._entity_columns.values()),
+                "index_bytes": self._out_indptr.nbytes + self._in_indptr.nbytes,
+                "bytes_per_edge": (edge_bytes + edge_property_bytes) / self._edge_count if self._edge_count else 0.0
+            }
+
+    def edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Interned ids and the CSR edge list expanded to (source, target) index arrays."""
+        with self._lock:
+            self._compact()
+            sources = np.repeat(np.arange(len(self._ids), dtype=np.int32), np.diff(self._out_indptr))
+            return list(self._ids), sources, self._out_targets.copy()
+
+    def close(self):
+        """Nothing to release for the in-memory graph."""
+
+    def _adjacent(self, entity_ids: List[str], direction: str,
+                  relationship_types: Optional[List[str]]) -> List[Adjacency]:
+        """Edges of a frontier from CSR/CSC slices (see GraphTraversal)."""
+        with self._lock:
+            codes = None
+            if relationship_types is not None:
+                codes = [self._type_codes[t] for t in relationship_types if t in self._type_codes]
+                if not codes:
+                    return []
+            self._compact()
+            adjacent = []
+            for entity_id in entity_ids:
+                number = self._index.get(entity_id)
+                if number is None:
+                    continue
+                slices = []
+                if direction in ("out", "both"):
+                    slices.append((np.arange(self._out_indptr[number], self._out_indptr[number + 1]), "target"))
+                if direction in ("in", "both"):
+                    slices.append((self._in_positions[self._in_indptr[number]:self._in_indptr[number + 1]]
+                                   .astype(np.int64), "source"))
+                for positions, far_end in slices:
+                    if codes is not None:
+                        positions = positions[np.isin(self._out_types[positions], codes)]
+                    for position, relationship in zip(positions.tolist(), self._edge_dicts(positions)):
+                        adjacent.append((int(self._out_sequence[position]), entity_id,
+                                         relationship[far_end], relationship))
+            return adjacent
+
+    def _entity_types(self, entity_ids: List[str]) -> Dict[str, str]:
+        with self._lock:
+            types = {}
+            for entity_id in entity_ids:
+                number = self._index.get(entity_id)
+                if number is not None:
+                    types[entity_id] = self._type_names[self._entity_type_codes[number]]
+            return types
+
+    def _type_code(self, name: str) -> int:
+        code = self._type_codes.get(name)
+        if code is None:
+            code = len(self._type_names)
+            self._type_codes[name] = code
+            self._type_names.append(name)
+        return code
+
+    @staticmethod
+    def _set_columns(columns: Dict[str, _PropertyColumn], row: int, properties: Dict[str, Any]):
+        """Write a row's properties into their columns."""
+        for key, value in properties.items():
+            if value is None:
+                continue
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = _PropertyColumn()
+            column.set(row, value)
+
+    @staticmethod
+    def _row_properties(columns: Dict[str, _PropertyColumn], row: int) -> Dict[str, Any]:
+        properties = {}
+        for key, column in columns.items():
+            value = column.get(row)
+            if value is not None:
+                properties[key] = value
+        return properties
+
+    def _entity_dict(self, number: int) -> Dict[str, Any]:
+        return {
+            "id": self._ids[number],
+            "type": self._type_names[self._entity_type_codes[number]],
+            "properties": self._row_properties(self._entity_columns, number)
+        }
+
+    def _edge_sources(self, positions: np.ndarray) -> np.ndarray:
+        """Source entity of each CSR position."""
+        return np.searchsorted(self._out_indptr, positions, side="right") - 1
+
+    def _edge_positions(self, numbers: List[int], direction: str) -> np.ndarray:
+        """CSR positions of the edges touching the given entities, in insertion order."""
+        slices = []
+        for number in numbers:
+            if direction in ("out", "both"):
+                slices.append(np.arange(self._out_indptr[number], self._out_indptr[number + 1]))
+            if direction in ("in", "both"):
+                slices.append(self._in_positions[self._in_indptr[number]:self._in_indptr[number + 1]])
+        if not slices:
+            return np.zeros(0, dtype=np.int64)
+        positions = np.unique(np.concatenate(slices).astype(np.int64))
+        return positions[np.argsort(self._out_sequence[positions], kind="stable")]
+
+    def _edge_dicts(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        sources = self._edge_sources(positions)
+        return [
+            {
+                "source": self._ids[source],
+                "target": self._ids[self._out_targets[position]],
+                "type": self._type_names[self._out_types[position]],
+                "properties": self._row_properties(self._edge_columns, int(self._out_sequence[position]))
+            }
+            for position, source in zip(positions.tolist(), sources.tolist())
+        ]
+
+    def _compact(self):
+        """Merge buffered edges into the CSR/CSC arrays (caller holds the lock)."""
+        node_count = len(self._ids)
+        if not self._pending_sources and len(self._out_indptr) == node_count + 1:
+            return
+
+        old_count = len(self._out_targets)
+        old_sources = np.repeat(np.arange(len(self._out_indptr) - 1, dtype=np.int32),
+                                np.diff(self._out_indptr))
+        sources = np.concatenate([old_sources, np.frombuffer(self._pending_sources, dtype=np.int32)])
+        targets = np.concatenate([self._out_targets, np.frombuffer(self._pending_targets, dtype=np.int32)])
+        types = np.concatenate([self._out_types, np.frombuffer(self._pending_types, dtype=np.int16)])
+        sequence = np.concatenate([
+            self._out_sequence,
+            np.arange(old_count, old_count + len(self._pending_sources), dtype=np.int32)
+        ])
+
+        # Stable sorts keep each source's (and target's) edges in insertion order
+        order = np.argsort(sources, kind="stable")
+        self._out_targets = targets[order]
+        self._out_types = types[order]
+        self._out_sequence = sequence[order]
+        self._out_indptr = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=node_count))])
+
+        self._in_positions = np.argsort(self._out_targets, kind="stable").astype(np.int32)
+        self._in_indptr = np.concatenate([[0], np.cumsum(np.bincount(self._out_targets, minlength=node_count))])
+
+        self._pending_sources = array("i")
+        self._pending_targets = array("i")
+        self._pending_types = array("h")
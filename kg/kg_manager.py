@@ -1,15 +1,113 @@
 """
 Knowledge Graph Manager Module
 """
-from typing import Dict, List, Any, Optional
+import re
+import bisect
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Iterable, Set, Tuple
 
-class KnowledgeGraphManager:
-    """Manages knowledge graph operations."""
+import numpy as np
+
+from .traversal import GraphTraversal, DIRECTIONS, Adjacency
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of a string."""
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+
+def batch_rows(columns: Optional[Dict[str, List[Any]]], keys: Iterable[str]) -> List[Dict[str, Any]]:
+    """Row dicts from a columnar batch (equal-length lists keyed by field).
+    
+    ``properties`` may be omitted; the other ``keys`` are required.
+    """
+    if not columns:
+        return []
+    keys = list(keys)
+    missing = [k for k in keys if k not in columns]
+    if missing:
+        raise ValueError(f"Batch is missing columns: {missing}")
+    length = len(columns[keys[0]])
+    properties = columns.get("properties") or [None] * length
+    if any(len(columns[k]) != length for k in keys) or len(properties) != length:
+        raise ValueError("Batch columns must all have the same length")
+    rows = [dict(zip(keys, values)) for values in zip(*(columns[k] for k in keys))]
+    for row, row_properties in zip(rows, properties):
+        row["properties"] = row_properties or {}
+    return rows
+
+def entity_tokens(entity_id: str, entity_type: str, properties: Optional[Dict[str, Any]]) -> Set[str]:
+    """Tokens an entity is indexed under: those of its id, type and property values."""
+    tokens = set(tokenize(entity_id)) | set(tokenize(entity_type))
+    for value in (properties or {}).values():
+        tokens.update(tokenize(value))
+    return tokens
+
+
+class TokenIndex:
+    """Inverted index from tokens to entity keys with prefix lookup.
+    
+    Posting sets are kept per token; a sorted term dictionary turns a
+    prefix into a contiguous range of terms found by bisection.
+    """
+    
+    def __init__(self):
+        self._postings: Dict[str, Set[Any]] = defaultdict(set)
+        self._terms: List[str] = []
+        
+    def add(self, key: Any, tokens: Iterable[str]):
+        """Index a key under the given tokens."""
+        for token in tokens:
+            postings = self._postings[token]
+            if not postings:
+                bisect.insort(self._terms, token)
+            postings.add(key)
+            
+    def prefix(self, prefix: str) -> Set[Any]:
+        """Keys with a token starting with ``prefix``."""
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\U0010ffff", lo=start)
+        if end - start == 1:
+            return self._postings[self._terms[start]]
+        matches: Set[Any] = set()
+        for term in self._terms[start:end]:
+            matches |= self._postings[term]
+        return matches
+        
+    def match(self, query: str) -> Set[Any]:
+        """Keys matching every query token by prefix, intersecting smallest first."""
+        postings = sorted((self.prefix(token) for token in set(tokenize(query))), key=len)
+        matches: Set[Any] = set(postings[0]) if postings else set()
+        for other in postings[1:]:
+            if not matches:
+                break
+            matches &= other
+        return matches
+
+
+class KnowledgeGraphManager(GraphTraversal):
+    """Manages knowledge graph operations.
+    
+    Relationships are kept in insertion order in ``relationships`` and
+    indexed by position in forward and reverse adjacency maps
+    (entity -> relationship type -> positions), so an entity's edges cost
+    O(degree) to look up. Entities are also indexed by type, and by the
+    tokens of their id, type and property values in an inverted index whose
+    sorted term dictionary serves prefix lookups.
+    """
     
     def __init__(self, use_neo4j: bool = False):
         self.use_neo4j = use_neo4j
         self.entities = {}
         self.relationships = []
+        self._outgoing: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self._incoming: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self._entities_by_type: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._relationship_type_counts: Dict[str, int] = defaultdict(int)
+        self._token_index = TokenIndex()
+        self._entity_order: Dict[str, int] = {}
         
     def add_entity(self, entity_id: str, entity_type: str, properties: Dict[str, Any]) -> bool:
         """Add an entity to the graph.
@@ -27,48 +125,200 @@ class KnowledgeGraphManager:
                 "type": entity_type,
                 "properties": properties
             }
+            self._entities_by_type[entity_type][entity_id] = None
+            self._entity_order[entity_id] = len(self._entity_order)
+            self._token_index.add(entity_id, entity_tokens(entity_id, entity_type, properties))
             return True
         return False
         
-    def add_relationship(self, source_id: str, target_id: str, relationship_type: str) -> bool:
+    def add_relationship(self, source_id: str, target_id: str, relationship_type: str,
+                         properties: Optional[Dict[str, Any]] = None) -> bool:
         """Add a relationship between entities.
         
         Args:
             source_id: Source entity ID
             target_id: Target entity ID
             relationship_type: Type of relationship
+            properties: Relationship properties
             
         Returns:
             Success status
         """
         if source_id in self.entities and target_id in self.entities:
+            position = len(self.relationships)
             self.relationships.append({
                 "source": source_id,
                 "target": target_id,
-                "type": relationship_type
+                "type": relationship_type,
+                "properties": properties or {}
             })
+            self._outgoing[source_id][relationship_type].append(position)
+            self._incoming[target_id][relationship_type].append(position)
+            self._relationship_type_counts[relationship_type] += 1
             return True
         return False
         
+    def add_entities(self, entities: Iterable[Dict[str, Any]]) -> int:
+        """Add many entities.
+        
+        Args:
+            entities: Dicts with ``id``, ``type`` and optional ``properties``
+            
+        Returns:
+            Number of entities added
+        """
+        return sum(
+            self.add_entity(e["id"], e["type"], e.get("properties") or {}) for e in entities
+        )
+        
+    def add_relationships(self, relationships: Iterable[Dict[str, Any]]) -> int:
+        """Add many relationships.
+        
+        Args:
+            relationships: Dicts with ``source``, ``target``, ``type`` and
+                optional ``properties``
+            
+        Returns:
+            Number of relationships added
+        """
+        return sum(
+            self.add_relationship(r["source"], r["target"], r["type"], r.get("properties"))
+            for r in relationships
+        )
+        
+    def add_batch(self, entities: Optional[Dict[str, List[Any]]] = None,
+                  relationships: Optional[Dict[str, List[Any]]] = None) -> Dict[str, int]:
+        """Add a columnar batch of entities and relationships.
+        
+        Args:
+            entities: Columns ``id``, ``type`` and optional ``properties``;
+                repeated ids are added once
+            relationships: Columns ``source``, ``target``, ``type`` and
+                optional ``properties``
+            
+        Returns:
+            Numbers of entities and relationships added
+        """
+        return {
+            "entities": self.add_entities(batch_rows(entities, ("id", "type"))),
+            "relationships": self.add_relationships(batch_rows(relationships, ("source", "target", "type")))
+        }
+        
+    def get_relationships(self, entity_id: str, direction: str = "both",
+                          relationship_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the relationships of an entity.
+        
+        Args:
+            entity_id: Entity ID
+            direction: "out" (entity is the source), "in" (entity is the
+                target) or "both"
+            relationship_type: Only return relationships of this type
+            
+        Returns:
+            Relationships in insertion order
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+        
+        positions = set()
+        if direction in ("out", "both"):
+            positions.update(self._positions(self._outgoing, entity_id, relationship_type))
+        if direction in ("in", "both"):
+            positions.update(self._positions(self._incoming, entity_id, relationship_type))
+        return [self._copy_relationship(p) for p in sorted(positions)]
+        
+    def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Get an entity with its ID, or None if it does not exist."""
+        entity = self.entities.get(entity_id)
+        return {"id": entity_id, **entity} if entity is not None else None
+        
+    def get_entities_by_type(self, entity_type: str) -> List[Dict[str, Any]]:
+        """Get all entities of a type, in insertion order.
+        
+        Args:
+            entity_type: Type of entity
+            
+        Returns:
+            List of entities with their IDs
+        """
+        return [
+            {"id": entity_id, **self.entities[entity_id]}
+            for entity_id in self._entities_by_type.get(entity_type, ())
+        ]
+        
+    def edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Entity ids in insertion order and each relationship's source and target index.
+        
+        Returns:
+            (ids, sources, targets) with int32 positions into ``ids``
+        """
+        ids = list(self.entities)
+        index = {entity_id: i for i, entity_id in enumerate(ids)}
+        count = len(self.relationships)
+        sources = np.fromiter((index[r["source"]] for r in self.relationships), dtype=np.int32, count=count)
+        targets = np.fromiter((index[r["target"]] for r in self.relationships), dtype=np.int32, count=count)
+        return ids, sources, targets
+        
+    def close(self):
+        """Nothing to release for the in-memory graph."""
+        
+    def _copy_relationship(self, position: int) -> Dict[str, Any]:
+        relationship = self.relationships[position]
+        return {**relationship, "properties": dict(relationship["properties"])}
+        
+    def _adjacent(self, entity_ids: List[str], direction: str,
+                  relationship_types: Optional[List[str]]) -> List[Adjacency]:
+        """Edges of a frontier from the adjacency maps (see GraphTraversal)."""
+        maps = []
+        if direction in ("out", "both"):
+            maps.append((self._outgoing, "target"))
+        if direction in ("in", "both"):
+            maps.append((self._incoming, "source"))
+        adjacent = []
+        for entity_id in entity_ids:
+            for adjacency, far_end in maps:
+                by_type = adjacency.get(entity_id)
+                if not by_type:
+                    continue
+                for relationship_type in (relationship_types if relationship_types is not None else list(by_type)):
+                    for position in by_type.get(relationship_type, ()):
+                        adjacent.append((position, entity_id, self.relationships[position][far_end],
+                                         self._copy_relationship(position)))
+        return adjacent
+        
+    def _entity_types(self, entity_ids: List[str]) -> Dict[str, str]:
+        return {i: self.entities[i]["type"] for i in entity_ids if i in self.entities}
+        
+    def _positions(self, adjacency: Dict[str, Dict[str, List[int]]], entity_id: str,
+                   relationship_type: Optional[str]) -> Iterable[int]:
+        """Relationship positions for an entity in one adjacency map."""
+        by_type = adjacency.get(entity_id)
+        if not by_type:
+            return []
+        if relationship_type is not None:
+            return by_type.get(relationship_type, [])
+        return [p for positions in by_type.values() for p in positions]
+        
     def get_graph_stats(self) -> Dict[str, Any]:
         """Get graph statistics.
         
         Returns:
             Dictionary of statistics
         """
-        entity_types = set(e["type"] for e in self.entities.values())
-        relationship_types = set(r["type"] for r in self.relationships)
-        
         return {
             "total_entities": len(self.entities),
             "total_relationships": len(self.relationships),
-            "entity_types": list(entity_types),
-            "relationship_types": list(relationship_types)
+            "entity_types": list(self._entities_by_type),
+            "relationship_types": list(self._relationship_type_counts)
         }
         
     def query(self, query: str, limit: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
         """Query the knowledge graph.
         
+        The query is split into word tokens and each must prefix-match a
+        token of an entity's id, type or property values; matching entities
+        come from intersecting the tokens' posting sets, smallest first.
+        
         Args:
             query: Query string
             limit: Maximum number of results
@@ -76,32 +326,33 @@ class KnowledgeGraphManager:
         Returns:
             Dictionary containing entities and relationships
         """
-        # Simple keyword-based query
-        matching_entities = []
-        for entity_id, entity in self.entities.items():
-            if (query.lower() in entity_id.lower() or
-                query.lower() in entity["type"].lower() or
-                any(query.lower() in str(v).lower() for v in entity["properties"].values())):
-                matching_entities.append({
-                    "id": entity_id,
-                    "type": entity["type"],
-                    "name": entity["properties"].get("name", entity_id)
-                })
-                
-        # Find relationships involving matching entities
-        matching_relationships = []
-        matching_entity_ids = set(e["id"] for e in matching_entities)
-        for rel in self.relationships:
-            if rel["source"] in matching_entity_ids or rel["target"] in matching_entity_ids:
-                matching_relationships.append({
-                    "source": rel["source"],
-                    "target": rel["target"],
-                    "type": rel["type"]
-                })
-                
-        # Apply limit if specified
+        # Every query token must prefix-match a token of the entity
+        ordered_ids = sorted(self._token_index.match(query), key=self._entity_order.__getitem__)
+        if limit:
+            ordered_ids = ordered_ids[:limit]
+        matching_entities = [
+            {
+                "id": entity_id,
+                "type": self.entities[entity_id]["type"],
+                "name": self.entities[entity_id]["properties"].get("name", entity_id)
+            }
+            for entity_id in ordered_ids
+        ]
+        
+        # Find relationships involving matching entities through the adjacency maps
+        positions = set()
+        for entity_id in ordered_ids:
+            positions.update(self._positions(self._outgoing, entity_id, None))
+            positions.update(self._positions(self._incoming, entity_id, None))
+        matching_relationships = [
+            {
+                "source": self.relationships[p]["source"],
+                "target": self.relationships[p]["target"],
+                "type": self.relationships[p]["type"]
+            }
+            for p in sorted(positions)
+        ]
         if limit:
-            matching_entities = matching_entities[:limit]
             matching_relationships = matching_relationships[:limit]
             
         return {
@@ -0,0 +1,260 @@
+"""
+Neo4j Knowledge Graph Store for OMNIMIND
+
+Optional adapter exposing the KnowledgeGraphManager interface over a Neo4j
+database (requires the ``neo4j`` driver). Entities are ``:Entity`` nodes
+keyed by a unique ``id``; relationships are ``:RELATED`` edges carrying
+their type as a property, since Cypher cannot parameterize edge labels.
+Bulk writes are sent as ``UNWIND`` batches, one transaction per batch.
+"""
+
+import json
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+import numpy as np
+import logging
+
+from .kg_manager import DIRECTIONS, tokenize, batch_rows, entity_tokens
+from .traversal import GraphTraversal, Adjacency
+
+try:
+    from neo4j import GraphDatabase
+    NEO4J_AVAILABLE = True
+except ImportError:
+    NEO4J_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_PRIMITIVES = (str, int, float, bool)
+
+_CREATE_ENTITIES = """UNWIND $rows AS row
+    OPTIONAL MATCH (existing:Entity {id: row.id})
+    WITH row WHERE existing IS NULL
+    CREATE (e:Entity {id: row.id, type: row.type, _tokens: row.tokens})
+    SET e += row.properties
+    RETURN count(e)"""
+
+_CREATE_RELATIONSHIPS = """UNWIND $rows AS row
+    MATCH (s:Entity {id: row.source}), (t:Entity {id: row.target})
+    CREATE (s)-[r:RELATED {type: row.type}]->(t)
+    SET r += row.properties
+    RETURN count(r)"""
+
+
+def _neo4j_properties(properties: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Neo4j stores only primitives and lists of them; JSON-encode the rest."""
+    converted = {}
+    for key, value in (properties or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, _PRIMITIVES) or (
+                isinstance(value, list) and all(isinstance(v, _PRIMITIVES) for v in value)):
+            converted[key] = value
+        else:
+            converted[key] = json.dumps(value, default=str)
+    return converted
+
+
+class Neo4jGraphStore(GraphTraversal):
+    """Knowledge graph stored in Neo4j."""
+
+    def __init__(self, uri: str = "bolt://localhost:7687", user: str = "neo4j",
+                 password: str = None, database: str = None, batch_size: int = 5000):
+        if not NEO4J_AVAILABLE:
+            raise ImportError("neo4j is required for the Neo4j graph store")
+        self.database = database
+        self.batch_size = batch_size
+        self._driver = GraphDatabase.driver(uri, auth=(user, password) if password else None)
+        with self._session() as session:
+            session.run("CREATE CONSTRAINT entity_id IF NOT EXISTS FOR (e:Entity) REQUIRE e.id IS UNIQUE")
+            session.run("CREATE INDEX entity_type IF NOT EXISTS FOR (e:Entity) ON (e.type)")
+
+    def add_entity(self, entity_id: str, entity_type: str, properties: Dict[str, Any]) -> bool:
+        return self.add_entities([{"id": entity_id, "type": entity_type, "properties": properties}]) == 1
+
+    def add_relationship(self, source_id: str, target_id: str, relationship_type: str,
+                         properties: Optional[Dict[str, Any]] = None) -> bool:
+        return self.add_relationships([{
+            "source": source_id, "target": target_id,
+            "type": relationship_type, "properties": properties
+        }]) == 1
+
+    def add_entities(self, entities: Iterable[Dict[str, Any]]) -> int:
+        """Create entities that do not exist yet; returns how many were created."""
+        return self._write_batches(_CREATE_ENTITIES, self._entity_rows(entities))
+
+    def add_relationships(self, relationships: Iterable[Dict[str, Any]]) -> int:
+        """Create relationships between existing entities; returns how many were created."""
+        return self._write_batches(_CREATE_RELATIONSHIPS, self._relationship_rows(relationships))
+
+    def add_batch(self, entities: Optional[Dict[str, List[Any]]] = None,
+                  relationships: Optional[Dict[str, List[Any]]] = None) -> Dict[str, int]:
+        """Add a columnar batch of entities and relationships in one transaction."""
+        entity_rows = self._entity_rows(batch_rows(entities, ("id", "type")))
+        relationship_rows = self._relationship_rows(batch_rows(relationships, ("source", "target", "type")))
+
+        def write(tx):
+            return {
+                "entities": tx.run(_CREATE_ENTITIES, rows=entity_rows).single()[0] if entity_rows else 0,
+                "relationships": tx.run(_CREATE_RELATIONSHIPS, rows=relationship_rows).single()[0]
+                if relationship_rows else 0
+            }
+
+        with self._session() as session:
+            return session.execute_write(write)
+
+    @staticmethod
+    def _entity_rows(entities: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        rows, seen = [], set()
+        for entity in entities:
+            if entity["id"] in seen:
+                continue
+            seen.add(entity["id"])
+            tokens = entity_tokens(entity["id"], entity["type"], entity.get("properties"))
+            rows.append({"id": entity["id"], "type": entity["type"], "tokens": sorted(tokens),
+                         "properties": _neo4j_properties(entity.get("properties"))})
+        return rows
+
+    @staticmethod
+    def _relationship_rows(relationships: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{"source": r["source"], "target": r["target"], "type": r["type"],
+                 "properties": _neo4j_properties(r.get("properties"))} for r in relationships]
+
+    def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        with self._session() as session:
+            record = session.run("MATCH (e:Entity {id: $id}) RETURN e", id=entity_id).single()
+        return self._entity_dict(record["e"]) if record else None
+
+    def get_relationships(self, entity_id: str, direction: str = "both",
+                          relationship_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+        pattern = {
+            "out": "(e:Entity {id: $id})-[r:RELATED]->(other)",
+            "in": "(e:Entity {id: $id})<-[r:RELATED]-(other)",
+            "both": "(e:Entity {id: $id})-[r:RELATED]-(other)",
+        }[direction]
+        with self._session() as session:
+            records = session.run(
+                f"""MATCH {pattern}
+                    WHERE $type IS NULL OR r.type = $type
+                    RETURN DISTINCT startNode(r).id AS source, endNode(r).id AS target, r
+                    ORDER BY id(r)""",
+                id=entity_id, type=relationship_type
+            )
+            return [
+                {"source": rec["source"], "target": rec["target"], "type": rec["r"]["type"],
+                 "properties": {k: v for k, v in dict(rec["r"]).items() if k != "type"}}
+                for rec in records
+            ]
+
+    def get_entities_by_type(self, entity_type: str) -> List[Dict[str, Any]]:
+        with self._session() as session:
+            records = session.run("MATCH (e:Entity {type: $type}) RETURN e ORDER BY id(e)", type=entity_type)
+            return [self._entity_dict(rec["e"]) for rec in records]
+
+    def get_graph_stats(self) -> Dict[str, Any]:
+        with self._session() as session:
+            nodes = session.run(
+                "MATCH (e:Entity) RETURN count(e) AS total, collect(DISTINCT e.type) AS types"
+            ).single()
+            edges = session.run(
+                "MATCH ()-[r:RELATED]->() RETURN count(r) AS total, collect(DISTINCT r.type) AS types"
+            ).single()
+        return {
+            "total_entities": nodes["total"],
+            "total_relationships": edges["total"],
+            "entity_types": list(nodes["types"]),
+            "relationship_types": list(edges["types"])
+        }
+
+    def query(self, query: str, limit: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Token-prefix query, matching KnowledgeGraphManager semantics."""
+        tokens = sorted(set(tokenize(query)))
+        if not tokens:
+            return {"entities": [], "relationships": []}
+        with self._session() as session:
+            entities = [
+                {"id": rec["id"], "type": rec["type"], "name": rec["name"] or rec["id"]}
+                for rec in session.run(
+                    """MATCH (e:Entity)
+                       WHERE all(q IN $tokens WHERE any(t IN e._tokens WHERE t STARTS WITH q))
+                       RETURN e.id AS id, e.type AS type, e.name AS name
+                       ORDER BY id(e) LIMIT $limit""",
+                    tokens=tokens, limit=limit or 2 ** 31 - 1
+                )
+            ]
+            relationships = [
+                {"source": rec["source"], "target": rec["target"], "type": rec["type"]}
+                for rec in session.run(
+                    """MATCH (s:Entity)-[r:RELATED]->(t:Entity)
+                       WHERE s.id IN $ids OR t.id IN $ids
+                       RETURN s.id AS source, t.id AS target, r.type AS type
+                       ORDER BY id(r) LIMIT $limit""",
+                    ids=[e["id"] for e in entities], limit=limit or 2 ** 31 - 1
+                )
+            ]
+        return {"entities": entities, "relationships": relationships}
+
+    def edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Entity ids and each edge's source and target index, read in two queries."""
+        with self._session() as session:
+            ids = [rec["id"] for rec in session.run("MATCH (e:Entity) RETURN e.id AS id ORDER BY id(e)")]
+            edges = [(rec["source"], rec["target"]) for rec in session.run(
+                "MATCH (s:Entity)-[r:RELATED]->(t:Entity) RETURN s.id AS source, t.id AS target ORDER BY id(r)"
+            )]
+        index = {entity_id: i for i, entity_id in enumerate(ids)}
+        sources = np.fromiter((index[s] for s, _ in edges), dtype=np.int32, count=len(edges))
+        targets = np.fromiter((index[t] for _, t in edges), dtype=np.int32, count=len(edges))
+        return ids, sources, targets
+
+    def close(self):
+        self._driver.close()
+
+    def _adjacent(self, entity_ids: List[str], direction: str,
+                  relationship_types: Optional[List[str]]) -> List[Adjacency]:
+        """Edges of a frontier in one UNWIND query (see GraphTraversal)."""
+        pattern = {
+            "out": "(e:Entity {id: id})-[r:RELATED]->(other:Entity)",
+            "in": "(e:Entity {id: id})<-[r:RELATED]-(other:Entity)",
+            "both": "(e:Entity {id: id})-[r:RELATED]-(other:Entity)",
+        }[direction]
+        with self._session() as session:
+            records = session.run(
+                f"""UNWIND $ids AS id
+                    MATCH {pattern}
+                    WHERE $types IS NULL OR r.type IN $types
+                    RETURN id(r) AS key, e.id AS near, other.id AS far,
+                           startNode(r).id AS source, endNode(r).id AS target, r""",
+                ids=list(entity_ids), types=relationship_types
+            )
+            return [
+                (rec["key"], rec["near"], rec["far"],
+                 {"source": rec["source"], "target": rec["target"], "type": rec["r"]["type"],
+                  "properties": {k: v for k, v in dict(rec["r"]).items() if k != "type"}})
+                for rec in records
+            ]
+
+    def _entity_types(self, entity_ids: List[str]) -> Dict[str, str]:
+        with self._session() as session:
+            records = session.run(
+                "UNWIND $ids AS id MATCH (e:Entity {id: id}) RETURN e.id AS id, e.type AS type",
+                ids=list(entity_ids)
+            )
+            return {rec["id"]: rec["type"] for rec in records}
+
+    def _session(self):
+        return self._driver.session(database=self.database) if self.database else self._driver.session()
+
+    def _write_batches(self, cypher: str, rows: List[Dict[str, Any]]) -> int:
+        written = 0
+        with self._session() as session:
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                written += session.execute_write(lambda tx: tx.run(cypher, rows=batch).single()[0])
+        return written
+
+    @staticmethod
+    def _entity_dict(node) -> Dict[str, Any]:
+        properties = {k: v for k, v in dict(node).items() if k not in ("id", "type", "_tokens")}
+        return {"id": node["id"], "type": node["type"], "properties": properties}
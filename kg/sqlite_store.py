@@ -0,0 +1,366 @@
+"""
+SQLite Knowledge Graph Store for OMNIMIND
+
+Persistent embedded backend with the same interface as
+KnowledgeGraphManager: entities, edges and their properties live in
+separate tables of a WAL-mode SQLite database, edges are indexed on source,
+target and type, and bulk writes run as one transaction per call.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Iterable, Set, Tuple
+import numpy as np
+import logging
+
+from .kg_manager import DIRECTIONS, tokenize, batch_rows, entity_tokens
+from .traversal import GraphTraversal, Adjacency
+
+logger = logging.getLogger(__name__)
+
+# Stay well under SQLite's bound-parameter limit
+_IN_BATCH = 500
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS entities (
+        id TEXT PRIMARY KEY,
+        type TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS entity_properties (
+        entity_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT,
+        PRIMARY KEY (entity_id, key)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS edges (
+        id INTEGER PRIMARY KEY,
+        source TEXT NOT NULL,
+        target TEXT NOT NULL,
+        type TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS edge_properties (
+        edge_id INTEGER NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT,
+        PRIMARY KEY (edge_id, key)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS entity_tokens (
+        token TEXT NOT NULL,
+        entity_id TEXT NOT NULL,
+        PRIMARY KEY (token, entity_id)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_entities_type ON entities (type)",
+    "CREATE INDEX IF NOT EXISTS idx_edges_source ON edges (source, type)",
+    "CREATE INDEX IF NOT EXISTS idx_edges_target ON edges (target, type)",
+    "CREATE INDEX IF NOT EXISTS idx_edges_type ON edges (type)",
+)
+
+
+def _batches(items: List[Any], size: int = _IN_BATCH) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SQLiteGraphStore(GraphTraversal):
+    """Knowledge graph persisted in SQLite.
+
+    Safe to share across threads: one connection, guarded by a lock.
+    Property values are stored as JSON. Text queries use the same token
+    prefix semantics as KnowledgeGraphManager, backed by a token table.
+    """
+
+    def __init__(self, db_path: str = "data/kg.db"):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def add_entity(self, entity_id: str, entity_type: str, properties: Dict[str, Any]) -> bool:
+        """Add an entity; False if the id already exists."""
+        return self.add_entities([{"id": entity_id, "type": entity_type, "properties": properties}]) == 1
+
+    def add_relationship(self, source_id: str, target_id: str, relationship_type: str,
+                         properties: Optional[Dict[str, Any]] = None) -> bool:
+        """Add a relationship; False unless both entities exist."""
+        return self.add_relationships([{
+            "source": source_id, "target": target_id,
+            "type": relationship_type, "properties": properties
+        }]) == 1
+
+    def add_entities(self, entities: Iterable[Dict[str, Any]]) -> int:
+        """Add many entities in one transaction; returns how many were new."""
+        with self._lock, self._conn:
+            return self._insert_entities(list(entities))
+
+    def add_relationships(self, relationships: Iterable[Dict[str, Any]]) -> int:
+        """Add many relationships in one transaction.
+
+        Relationships whose endpoints are not both known are skipped.
+        Returns the number added.
+        """
+        with self._lock, self._conn:
+            return self._insert_relationships(list(relationships))
+
+    def add_batch(self, entities: Optional[Dict[str, List[Any]]] = None,
+                  relationships: Optional[Dict[str, List[Any]]] = None) -> Dict[str, int]:
+        """Add a columnar batch of entities and relationships in a single transaction.
+
+        Column layout as in KnowledgeGraphManager.add_batch.
+        """
+        entity_rows = batch_rows(entities, ("id", "type"))
+        relationship_rows = batch_rows(relationships, ("source", "target", "type"))
+        with self._lock, self._conn:
+            return {
+                "entities": self._insert_entities(entity_rows),
+                "relationships": self._insert_relationships(relationship_rows)
+            }
+
+    def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """An entity with its type and properties, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT type FROM entities WHERE id = ?", (entity_id,)).fetchone()
+            if row is None:
+                return None
+            properties = self._properties("entity_properties", "entity_id", [entity_id])
+        return {"id": entity_id, "type": row[0], "properties": properties.get(entity_id, {})}
+
+    def get_relationships(self, entity_id: str, direction: str = "both",
+                          relationship_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Relationships of an entity in insertion order (see KnowledgeGraphManager)."""
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+
+        columns = {"out": ["source"], "in": ["target"], "both": ["source", "target"]}[direction]
+        clauses, params = [], []
+        for column in columns:
+            clause = f"{column} = ?"
+            params.append(entity_id)
+            if relationship_type is not None:
+                clause += " AND type = ?"
+                params.append(relationship_type)
+            clauses.append(f"({clause})")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, source, target, type FROM edges WHERE {' OR '.join(clauses)} ORDER BY id",
+                params
+            ).fetchall()
+            return self._edge_dicts(rows)
+
+    def get_entities_by_type(self, entity_type: str) -> List[Dict[str, Any]]:
+        """All entities of a type, in insertion order."""
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM entities WHERE type = ? ORDER BY rowid", (entity_type,)
+            )]
+            properties = self._properties("entity_properties", "entity_id", ids)
+        return [{"id": i, "type": entity_type, "properties": properties.get(i, {})} for i in ids]
+
+    def get_graph_stats(self) -> Dict[str, Any]:
+        """Entity and relationship counts and types."""
+        with self._lock:
+            total_entities = self._conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+            total_relationships = self._conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+            entity_types = [r[0] for r in self._conn.execute("SELECT DISTINCT type FROM entities")]
+            relationship_types = [r[0] for r in self._conn.execute("SELECT DISTINCT type FROM edges")]
+        return {
+            "total_entities": total_entities,
+            "total_relationships": total_relationships,
+            "entity_types": entity_types,
+            "relationship_types": relationship_types
+        }
+
+    def query(self, query: str, limit: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Token-prefix query over entity ids, types and property values."""
+        with self._lock:
+            matching_ids: Optional[Set[str]] = None
+            for token in sorted(set(tokenize(query)), key=len, reverse=True):
+                ids = {row[0] for row in self._conn.execute(
+                    "SELECT entity_id FROM entity_tokens WHERE token >= ? AND token < ?",
+                    (token, token + "\U0010ffff")
+                )}
+                matching_ids = ids if matching_ids is None else matching_ids & ids
+                if not matching_ids:
+                    break
+            if not matching_ids:
+                return {"entities": [], "relationships": []}
+
+            entities = []
+            for batch in _batches(sorted(matching_ids)):
+                marks = ",".join("?" * len(batch))
+                entities.extend(self._conn.execute(
+                    f"SELECT rowid, id, type FROM entities WHERE id IN ({marks})", batch
+                ).fetchall())
+            entities.sort()
+            if limit:
+                entities = entities[:limit]
+            ids = [entity_id for _, entity_id, _ in entities]
+            properties = self._properties("entity_properties", "entity_id", ids)
+
+            edge_rows = {}
+            for batch in _batches(ids):
+                marks = ",".join("?" * len(batch))
+                for row in self._conn.execute(
+                    f"SELECT id, source, target, type FROM edges "
+                    f"WHERE source IN ({marks}) OR target IN ({marks})", batch + batch
+                ):
+                    edge_rows[row[0]] = row
+        relationships = [
+            {"source": source, "target": target, "type": edge_type}
+            for _, source, target, edge_type in sorted(edge_rows.values())
+        ]
+        if limit:
+            relationships = relationships[:limit]
+        return {
+            "entities": [
+                {"id": entity_id, "type": entity_type,
+                 "name": properties.get(entity_id, {}).get("name", entity_id)}
+                for _, entity_id, entity_type in entities
+            ],
+            "relationships": relationships
+        }
+
+    def edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Entity ids in insertion order and each edge's source and target index."""
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute("SELECT id FROM entities ORDER BY rowid")]
+            edges = self._conn.execute("SELECT source, target FROM edges ORDER BY id").fetchall()
+        index = {entity_id: i for i, entity_id in enumerate(ids)}
+        sources = np.fromiter((index[s] for s, _ in edges), dtype=np.int32, count=len(edges))
+        targets = np.fromiter((index[t] for _, t in edges), dtype=np.int32, count=len(edges))
+        return ids, sources, targets
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _adjacent(self, entity_ids: List[str], direction: str,
+                  relationship_types: Optional[List[str]]) -> List[Adjacency]:
+        """Edges of a frontier, fetched with batched IN queries (see GraphTraversal)."""
+        if relationship_types is not None and not relationship_types:
+            return []
+        ends = []
+        if direction in ("out", "both"):
+            ends.append(("source", "target"))
+        if direction in ("in", "both"):
+            ends.append(("target", "source"))
+        type_clause, type_params = "", []
+        if relationship_types is not None:
+            type_clause = f" AND type IN ({','.join('?' * len(relationship_types))})"
+            type_params = list(relationship_types)
+
+        with self._lock:
+            found = []
+            for near_end, far_end in ends:
+                for batch in _batches(list(entity_ids)):
+                    marks = ",".join("?" * len(batch))
+                    found.extend(
+                        (row, near_end, far_end) for row in self._conn.execute(
+                            f"SELECT id, source, target, type FROM edges "
+                            f"WHERE {near_end} IN ({marks}){type_clause} ORDER BY id",
+                            batch + type_params
+                        )
+                    )
+            relationships = self._edge_dicts([row for row, _, _ in found])
+        return [
+            (row[0], relationship[near_end], relationship[far_end], relationship)
+            for (row, near_end, far_end), relationship in zip(found, relationships)
+        ]
+
+    def _entity_types(self, entity_ids: List[str]) -> Dict[str, str]:
+        types = {}
+        with self._lock:
+            for batch in _batches(list(entity_ids)):
+                marks = ",".join("?" * len(batch))
+                types.update(self._conn.execute(
+                    f"SELECT id, type FROM entities WHERE id IN ({marks})", batch
+                ).fetchall())
+        return types
+
+    def _insert_entities(self, entities: List[Dict[str, Any]]) -> int:
+        """Insert entities not stored yet (caller holds the lock and transaction)."""
+        rows, seen = [], set()
+        for entity in entities:
+            if entity["id"] not in seen:
+                seen.add(entity["id"])
+                rows.append(entity)
+        if not rows:
+            return 0
+
+        existing = self._existing_ids([e["id"] for e in rows])
+        new = [e for e in rows if e["id"] not in existing]
+        self._conn.executemany(
+            "INSERT INTO entities (id, type) VALUES (?, ?)",
+            [(e["id"], e["type"]) for e in new]
+        )
+        self._conn.executemany(
+            "INSERT INTO entity_properties (entity_id, key, value) VALUES (?, ?, ?)",
+            [(e["id"], key, json.dumps(value, default=str))
+             for e in new for key, value in (e.get("properties") or {}).items()]
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO entity_tokens (token, entity_id) VALUES (?, ?)",
+            [(token, e["id"]) for e in new
+             for token in entity_tokens(e["id"], e["type"], e.get("properties"))]
+        )
+        return len(new)
+
+    def _insert_relationships(self, relationships: List[Dict[str, Any]]) -> int:
+        """Insert relationships between known entities (caller holds the lock and transaction)."""
+        if not relationships:
+            return 0
+        known = self._existing_ids(list({r["source"] for r in relationships} |
+                                        {r["target"] for r in relationships}))
+        rows = [r for r in relationships if r["source"] in known and r["target"] in known]
+        next_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM edges").fetchone()[0] + 1
+        edges, properties = [], []
+        for edge_id, r in enumerate(rows, start=next_id):
+            edges.append((edge_id, r["source"], r["target"], r["type"]))
+            properties.extend(
+                (edge_id, key, json.dumps(value, default=str))
+                for key, value in (r.get("properties") or {}).items()
+            )
+        self._conn.executemany("INSERT INTO edges (id, source, target, type) VALUES (?, ?, ?, ?)", edges)
+        self._conn.executemany("INSERT INTO edge_properties (edge_id, key, value) VALUES (?, ?, ?)", properties)
+        return len(edges)
+
+    def _existing_ids(self, ids: List[str]) -> Set[str]:
+        """Which of the given entity ids exist (caller holds the lock)."""
+        existing = set()
+        for batch in _batches(ids):
+            marks = ",".join("?" * len(batch))
+            existing.update(row[0] for row in self._conn.execute(
+                f"SELECT id FROM entities WHERE id IN ({marks})", batch
+            ))
+        return existing
+
+    def _properties(self, table: str, owner_column: str, owners: List[Any]) -> Dict[Any, Dict[str, Any]]:
+        """Decoded properties keyed by owner id (caller holds the lock)."""
+        properties: Dict[Any, Dict[str, Any]] = defaultdict(dict)
+        for batch in _batches(owners):
+            marks = ",".join("?" * len(batch))
+            for owner, key, value in self._conn.execute(
+                f"SELECT {owner_column}, key, value FROM {table} WHERE {owner_column} IN ({marks})", batch
+            ):
+                properties[owner][key] = json.loads(value)
+        return properties
+
+    def _edge_dicts(self, rows: List[Tuple[int, str, str, str]]) -> List[Dict[str, Any]]:
+        """Relationship dicts with properties for edge rows (caller holds the lock)."""
+        properties = self._properties("edge_properties", "edge_id", [row[0] for row in rows])
+        return [
+            {"source": source, "target": target, "type": edge_type,
+             "properties": properties.get(edge_id, {})}
+            for edge_id, source, target, edge_type in rows
+        ]
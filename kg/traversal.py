@@ -0,0 +1,134 @@
+"""
+Graph Traversal for OMNIMIND
+
+Breadth-first traversal primitives shared by every knowledge graph store.
+Each BFS level is one batched adjacency lookup for the whole frontier, so
+expanding many seeds costs one call per hop rather than one per entity.
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+DIRECTIONS = ("out", "in", "both")
+
+# (edge key, entity the edge was reached from, entity on the other end, relationship)
+Adjacency = Tuple[Any, str, str, Dict[str, Any]]
+
+
+class GraphTraversal:
+    """Mixin adding k-hop expansion and shortest paths to a graph store.
+
+    Stores implement two batched primitives: ``_adjacent(entity_ids,
+    direction, relationship_types)`` returning ``Adjacency`` tuples, and
+    ``_entity_types(entity_ids)`` mapping known ids to their types.
+    """
+
+    def _adjacent(self, entity_ids: List[str], direction: str,
+                  relationship_types: Optional[List[str]]) -> List[Adjacency]:
+        raise NotImplementedError
+
+    def _entity_types(self, entity_ids: List[str]) -> Dict[str, str]:
+        raise NotImplementedError
+
+    def k_hop(self, seed_ids: Iterable[str], k: int = 1, direction: str = "both",
+              relationship_types: Optional[Iterable[str]] = None,
+              entity_types: Optional[Iterable[str]] = None,
+              max_nodes: Optional[int] = None) -> Dict[str, Any]:
+        """Neighborhood within ``k`` hops of a set of seed entities.
+
+        Args:
+            seed_ids: Entities to expand from; unknown ids are ignored
+            k: Maximum number of hops
+            direction: "out", "in" or "both"
+            relationship_types: Only follow relationships of these types
+            entity_types: Only expand into entities of these types
+            max_nodes: Node budget, seeds included; expansion stops once it
+                is spent and ``truncated`` is set
+
+        Returns:
+            ``nodes`` (id, type, hops) in discovery order, the
+            ``relationships`` between them, and ``truncated``
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+        relationship_types = list(relationship_types) if relationship_types is not None else None
+        entity_types = set(entity_types) if entity_types is not None else None
+
+        seeds = list(dict.fromkeys(seed_ids))
+        types = self._entity_types(seeds)
+        hops = {seed: 0 for seed in seeds if seed in types}
+        edges: Dict[Any, Dict[str, Any]] = {}
+        truncated = False
+
+        frontier = list(hops)
+        for depth in range(1, k + 1):
+            if not frontier or truncated:
+                break
+            adjacent = self._adjacent(frontier, direction, relationship_types)
+            if entity_types is not None:
+                types.update(self._entity_types(
+                    list(dict.fromkeys(n for _, _, n, _ in adjacent if n not in types))
+                ))
+
+            next_frontier = []
+            for key, _, neighbor, relationship in adjacent:
+                if neighbor not in hops:
+                    if entity_types is not None and types.get(neighbor) not in entity_types:
+                        continue
+                    if max_nodes is not None and len(hops) >= max_nodes:
+                        truncated = True
+                        continue
+                    hops[neighbor] = depth
+                    next_frontier.append(neighbor)
+                edges.setdefault(key, relationship)
+            frontier = next_frontier
+
+        missing = [n for n in hops if n not in types]
+        if missing:
+            types.update(self._entity_types(missing))
+        return {
+            "nodes": [{"id": n, "type": types.get(n), "hops": h} for n, h in hops.items()],
+            "relationships": list(edges.values()),
+            "truncated": truncated
+        }
+
+    def shortest_path(self, source_id: str, target_id: str, max_depth: int = 6,
+                      direction: str = "both",
+                      relationship_types: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """Fewest-hop path between two entities, found by BFS.
+
+        Args:
+            source_id: Start entity
+            target_id: End entity
+            max_depth: Give up beyond this many hops
+            direction: "out" follows edges forward, "in" backward, "both" either way
+            relationship_types: Only follow relationships of these types
+
+        Returns:
+            ``nodes`` and ``relationships`` along the path, or None
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+        relationship_types = list(relationship_types) if relationship_types is not None else None
+        if len(self._entity_types([source_id, target_id])) < len({source_id, target_id}):
+            return None
+
+        parents: Dict[str, Optional[Tuple[str, Dict[str, Any]]]] = {source_id: None}
+        frontier = [source_id]
+        for _ in range(max_depth):
+            if target_id in parents or not frontier:
+                break
+            next_frontier = []
+            for _, from_id, neighbor, relationship in self._adjacent(frontier, direction, relationship_types):
+                if neighbor not in parents:
+                    parents[neighbor] = (from_id, relationship)
+                    next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        if target_id not in parents:
+            return None
+        nodes, relationships = [target_id], []
+        while parents[nodes[-1]] is not None:
+            previous, relationship = parents[nodes[-1]]
+            relationships.append(relationship)
+            nodes.append(previous)
+        return {"nodes": nodes[::-1], "relationships": relationships[::-1]}
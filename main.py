@@ -7,7 +7,8 @@ import os
 # Import OMNIMIND components
 from embedder.embedder import MultiModelEmbedder
 from vectordb.vectordb import VectorDB
-from kg.kg_manager import KnowledgeGraphManager
+from api.routes.knowledge import router as knowledge_router, get_kg_manager
+from kg.centrality import CentralityIndex
 from memory.episodic_manager import EpisodicManager
 from memory.semantic_manager import SemanticManager
 from memory.procedural_manager import ProceduralManager
@@ -19,6 +20,8 @@ from planner.planner_engine import PlannerEngine
 from taskloop.auto_loop import AutoLoop
 from taskloop.watchdog import Watchdog
 from pipelines.evidently_monitoring import evidently_monitoring_step
+from pipelines.ingestion_jobs import IngestionJobManager, JobLimitError
+from crawlers.crawl_cache import CrawlCache
 from fastapi import UploadFile, File
 import pandas as pd
 
@@ -32,16 +35,35 @@ app = FastAPI(
     version="0.1.0"
 )
 
+app.include_router(knowledge_router)
+
 # Initialize components
+INGEST_MANIFEST_PATH = os.getenv("OMNIMIND_INGEST_MANIFEST", "data/ingest_manifest.json")
 embedder = MultiModelEmbedder()
 vectordb = VectorDB()
-kg = KnowledgeGraphManager(use_neo4j=False)  # Use simple storage for now
+kg = get_kg_manager()  # Shared with the /kg routes; persisted per OMNIMIND_KG_BACKEND
+
+# PageRank/degree scores recomputed in the background once the graph has changed enough
+kg_centrality = CentralityIndex(kg, interval=float(os.getenv("OMNIMIND_CENTRALITY_INTERVAL", "60")))
+kg_centrality.start()
+
+# Background ingestion jobs; the small pool keeps ingestion from starving search
+ingestion_jobs = IngestionJobManager(
+    max_workers=int(os.getenv("OMNIMIND_INGEST_WORKERS", "2")),
+    max_jobs=int(os.getenv("OMNIMIND_INGEST_MAX_JOBS", "8")),
+    manifest_path=INGEST_MANIFEST_PATH,
+    checkpoint_dir=os.getenv("OMNIMIND_INGEST_CHECKPOINTS", "data/checkpoints"),
+    crawl_cache=CrawlCache(os.getenv("OMNIMIND_CRAWL_CACHE", "data/crawl_cache.db")),
+    vectordb=vectordb,
+    kg=kg
+)
 
 # Initialize memory components
 episodic_manager = EpisodicManager()
 semantic_manager = SemanticManager(vectordb=vectordb, kg_manager=kg)
 procedural_manager = ProceduralManager()
-memory_reasoner = MemoryReasoner(episodic_manager, semantic_manager, procedural_manager)
+memory_reasoner = MemoryReasoner(episodic_manager, semantic_manager, procedural_manager,
+                                 centrality=kg_centrality)
 memory_logger = MemoryLogger()
 
 # Supervisor Core instance
@@ -58,6 +80,9 @@ class SearchRequest(BaseModel):
     query: str
     top_k: int = 5
     collection_name: str = "omnimind_docs"
+    kg_hops: int = 1
+    kg_node_budget: int = 200  # Caps KG expansion so search latency stays predictable
+    centrality_weight: float = 0.1  # Weight of normalized PageRank added to similarity; 0 disables
 
 class SearchResponse(BaseModel):
     query: str
@@ -127,16 +152,22 @@ def search(request: SearchRequest):
             query_vector=query_embedding,
             top_k=request.top_k
         )
-        # 3. Expand with knowledge graph context
-        kg_context = []
-        for result in search_results:
-            doc_id = result.get("document_id", "")
-            if doc_id:
-                related_entities = kg.get_relationships(entity_id=doc_id)
-                kg_context.extend(related_entities)
-        # 4. Calculate search time
+        # 3. Re-rank hits by similarity plus precomputed graph centrality
+        if request.centrality_weight and search_results:
+            centrality = kg_centrality.scores(r.get("document_id") for r in search_results)
+            for result in search_results:
+                result["centrality"] = centrality.get(result.get("document_id"), 0.0)
+            search_results.sort(
+                key=lambda r: r.get("similarity", 0.0) + request.centrality_weight * r["centrality"],
+                reverse=True
+            )
+        # 4. Expand all hits with knowledge graph context in one batched traversal
+        doc_ids = [result["document_id"] for result in search_results if result.get("document_id")]
+        neighborhood = kg.k_hop(doc_ids, k=request.kg_hops, max_nodes=request.kg_node_budget)
+        kg_context = neighborhood["relationships"]
+        # 5. Calculate search time
         search_time_ms = (time.time() - start_time) * 1000
-        # 5. Log as episode
+        # 6. Log as episode
         episodic_manager.log_session(
             session_id="search",
             user_query=request.query,
@@ -148,7 +179,7 @@ def search(request: SearchRequest):
             "query": request.query,
             "results": search_results
         })
-        # 6. Prepare response
+        # 7. Prepare response
         response = SearchResponse(
             query=request.query,
             results=search_results,
@@ -181,28 +212,38 @@ def get_stats():
         logger.error(f"Stats retrieval failed: {e}")
         raise HTTPException(status_code=500, detail=f"Stats retrieval failed: {e}")
 
-@app.post("/ingest")
+@app.post("/ingest", status_code=202)
 def ingest_documents(sources: List[str]):
-    """Ingest documents from sources."""
+    """Queue an ingestion job for the given sources and return its id."""
     try:
-        from pipelines.pipeline import run_pipeline
-        
-        # Run the complete pipeline
-        result = run_pipeline(sources)
-        
-        if result["pipeline_success"]:
-            return {
-                "success": True,
-                "message": f"Ingested {len(sources)} sources successfully",
-                "details": result["final_data"]
-            }
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error", "Pipeline failed"))
-            
+        job_id = ingestion_jobs.submit(sources)
+        return {
+            "success": True,
+            "job_id": job_id,
+            "status": "queued",
+            "message": f"Queued ingestion of {len(sources)} sources"
+        }
+    except JobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         logger.error(f"Ingestion failed: {e}")
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {e}")
 
+@app.get("/ingest/{job_id}")
+def ingest_status(job_id: str):
+    """Status, per-stage progress and throughput of an ingestion job."""
+    job = ingestion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingestion job {job_id} not found")
+    return job
+
+@app.delete("/ingest/{job_id}")
+def cancel_ingest(job_id: str):
+    """Cancel a queued or running ingestion job."""
+    if ingestion_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Ingestion job {job_id} not found")
+    return {"job_id": job_id, "cancelled": ingestion_jobs.cancel(job_id)}
+
 @app.get("/memory/inspect")
 def memory_inspect():
     """Returns a summary of episodic, semantic, and procedural memory for dashboard visualization."""
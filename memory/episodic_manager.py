@@ -1,21 +1,51 @@
 """
 Episodic Memory Manager Module
+
+Sessions are stored in daily segment files (``YYYY-MM-DD.jsonl``) next to a
+small manifest recording each segment's session count and first/last
+timestamps. Range reads open only the segments that overlap the range,
+retention deletes whole segments, and loaded sessions are kept sorted by
+epoch so range queries bisect.
 """
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import bisect
 import json
 import os
+import threading
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _epoch(value) -> float:
+    """Seconds since the epoch for an ISO timestamp or datetime; naive values are UTC."""
+    moment = datetime.fromisoformat(value) if isinstance(value, str) else value
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _segment_day(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%d")
+
 
 class EpisodicManager:
     """Manages episodic memory storage and retrieval."""
     
-    def __init__(self, log_path: str, retention_days: int = 30):
+    def __init__(self, log_path: str, retention_days: int = 30, segment_dir: Optional[str] = None):
         self.log_path = log_path
         self.retention_days = retention_days
-        self.sessions = []
+        self.segment_dir = segment_dir or os.path.splitext(log_path)[0] + "_segments"
+        self.sessions = []  # Loaded sessions, sorted by timestamp
+        self._epochs: List[float] = []  # Parallel to sessions
+        self._segments: Dict[str, Dict[str, Any]] = {}  # Manifest: day -> count, first, last
+        self._loaded = set()
+        self._lock = threading.RLock()
         os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        os.makedirs(self.segment_dir, exist_ok=True)
+        self._load_manifest()
         
-    def log_session(self, session_id: str, user_query: str, 
+    def log_session(self, session_id: str, user_query: str,
                    response: str, status: str, metadata: Dict[str, Any]) -> None:
         """Log a session to episodic memory.
         
@@ -35,63 +65,138 @@ class EpisodicManager:
             "metadata": metadata
         }
         
-        self.sessions.append(session)
-        
-        # Write to log file
-        with open(self.log_path, "a") as f:
-            f.write(json.dumps(session) + "\n")
+        with self._lock:
+            self._append(session, _epoch(session["timestamp"]))
+            self._save_manifest()
             
     def retrieve_sessions(self, session_id: Optional[str] = None,
                         start_date: Optional[datetime] = None,
                         end_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Retrieve sessions from episodic memory.
         
+        Only segments overlapping the date range are read from disk.
+        
         Args:
             session_id: Optional session ID to filter by
             start_date: Optional start date for filtering
             end_date: Optional end date for filtering
             
         Returns:
-            List of matching session records
+            List of matching session records, oldest first
         """
-        filtered = self.sessions
+        start = _epoch(start_date) if start_date else None
+        end = _epoch(end_date) if end_date else None
         
+        with self._lock:
+            for day, segment in self._segments.items():
+                if day in self._loaded:
+                    continue
+                if (start is None or segment["last"] >= start) and (end is None or segment["first"] <= end):
+                    self._load_segment(day)
+                    
+            lo = bisect.bisect_left(self._epochs, start) if start is not None else 0
+            hi = bisect.bisect_right(self._epochs, end) if end is not None else len(self.sessions)
+            filtered = self.sessions[lo:hi]
+            
         if session_id:
             filtered = [s for s in filtered if s["session_id"] == session_id]
             
-        if start_date:
-            filtered = [s for s in filtered if datetime.fromisoformat(s["timestamp"]) >= start_date]
-            
-        if end_date:
-            filtered = [s for s in filtered if datetime.fromisoformat(s["timestamp"]) <= end_date]
-            
         return filtered
         
     def prune_sessions(self) -> int:
         """Prune old sessions beyond retention period.
         
+        Whole segments are deleted once their newest session is past the
+        cutoff; the segment holding the cutoff is kept until it expires.
+        
         Returns:
             Number of sessions pruned
         """
         if self.retention_days < 0:
             return 0
             
-        cutoff_date = datetime.utcnow() - timedelta(days=self.retention_days)
-        original_count = len(self.sessions)
+        cutoff = _epoch(datetime.utcnow() - timedelta(days=self.retention_days))
         
-        # Remove old sessions
-        self.sessions = [
-            s for s in self.sessions
-            if datetime.fromisoformat(s["timestamp"]) > cutoff_date
-        ]
+        with self._lock:
+            expired = [day for day, segment in self._segments.items() if segment["last"] <= cutoff]
+            if not expired:
+                return 0
+            pruned_count = 0
+            newest_expired = 0.0
+            for day in expired:
+                segment = self._segments.pop(day)
+                pruned_count += segment["count"]
+                newest_expired = max(newest_expired, segment["last"])
+                self._loaded.discard(day)
+                path = self._segment_path(day)
+                if os.path.exists(path):
+                    os.remove(path)
+            # Days are disjoint, so the expired sessions are a prefix of the sorted list
+            keep = bisect.bisect_right(self._epochs, newest_expired)
+            del self.sessions[:keep]
+            del self._epochs[:keep]
+            self._save_manifest()
+            
+        return pruned_count
         
-        # Count pruned sessions
-        pruned_count = original_count - len(self.sessions)
+    def _segment_path(self, day: str) -> str:
+        return os.path.join(self.segment_dir, f"{day}.jsonl")
         
-        # Rewrite log file with remaining sessions
-        if pruned_count > 0:
-            with open(self.log_path, "w") as f:
-                for session in self.sessions:
-                    f.write(json.dumps(session) + "\n")
-                    
-        return pruned_count 
\ No newline at end of file
+    def _append(self, session: Dict[str, Any], epoch: float):
+        """Write a session to its day's segment and the sorted in-memory list."""
+        day = _segment_day(epoch)
+        segment = self._segments.get(day)
+        if segment is None:
+            segment = self._segments[day] = {"count": 0, "first": epoch, "last": epoch}
+            self._loaded.add(day)
+        with open(self._segment_path(day), "a") as f:
+            f.write(json.dumps(session) + "\n")
+        segment["count"] += 1
+        segment["first"] = min(segment["first"], epoch)
+        segment["last"] = max(segment["last"], epoch)
+        
+        # Sessions of unloaded segments are read with the rest of the segment later
+        if day in self._loaded:
+            position = bisect.bisect_right(self._epochs, epoch)
+            self._epochs.insert(position, epoch)
+            self.sessions.insert(position, session)
+            
+    def _load_segment(self, day: str):
+        """Merge a segment's sessions into the sorted in-memory list."""
+        path = self._segment_path(day)
+        loaded = []
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        session = json.loads(line)
+                        loaded.append((_epoch(session["timestamp"]), session))
+        loaded.sort(key=lambda item: item[0])
+        if loaded:
+            # Segments cover disjoint days, so the whole block lands in one place
+            position = bisect.bisect_left(self._epochs, loaded[0][0])
+            self._epochs[position:position] = [epoch for epoch, _ in loaded]
+            self.sessions[position:position] = [session for _, session in loaded]
+        self._loaded.add(day)
+        
+    def _load_manifest(self):
+        """Read the segment manifest, migrating a legacy single-file log once."""
+        manifest_path = os.path.join(self.segment_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                self._segments = dict(sorted(json.load(f).get("segments", {}).items()))
+            return
+            
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r") as f:
+                legacy = [json.loads(line) for line in f if line.strip()]
+            for session in sorted(legacy, key=lambda s: _epoch(s["timestamp"])):
+                self._append(session, _epoch(session["timestamp"]))
+        self._save_manifest()
+        
+    def _save_manifest(self):
+        manifest_path = os.path.join(self.segment_dir, MANIFEST_NAME)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"segments": dict(sorted(self._segments.items()))}, f)
+        os.replace(tmp_path, manifest_path)
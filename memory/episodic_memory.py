@@ -1,16 +1,27 @@
 import os
 import json
 import uuid
+import threading
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterable, Tuple
 
 class EpisodicMemory:
     """
     Stores and retrieves episodic memory snapshots in JSONL or SQLite.
+
+    A sidecar index (``<path>.idx``, one ``id<TAB>offset<TAB>length`` line per
+    record) maps ids to byte ranges so lookups seek straight to the record.
+    It grows as ``store_memory`` appends and catches up with records written
+    by other instances; it is rebuilt when it no longer matches the file.
     """
     def __init__(self, path: str = "memory/episodic_memory.jsonl"):
         os.makedirs(os.path.dirname(path), exist_ok=True)
         self.path = path
+        self.index_path = path + ".idx"
+        self._lock = threading.Lock()
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._end = 0  # Bytes of the data file covered by the index
+        self._load_offsets()
 
     def store_memory(self, data: Dict[str, Any]) -> str:
         """
@@ -20,18 +31,40 @@ class EpisodicMemory:
         data = dict(data)
         data["id"] = memory_id
         data["timestamp"] = data.get("timestamp") or datetime.utcnow().isoformat()
-        with open(self.path, "a") as f:
-            f.write(json.dumps(data) + "\n")
+        line = (json.dumps(data) + "\n").encode("utf-8")
+        with self._lock:
+            self._sync()
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(line)
+            if offset == self._end:
+                self._record([(memory_id, offset, len(line))])
+            else:
+                self._sync()
         return memory_id
 
     def get_memory_by_id(self, memory_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves a memory snapshot by its unique ID.
         """
-        for mem in self.get_all_memories():
-            if mem.get("id") == memory_id:
-                return mem
-        return None
+        return self.get_many([memory_id])[0]
+
+    def get_many(self, memory_ids: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Retrieves several memory snapshots, in the order asked for (None for
+        unknown IDs). Records are read in file order with one seek each.
+        """
+        memory_ids = list(memory_ids)
+        with self._lock:
+            self._sync()
+            ranges = {i: self._offsets[i] for i in set(memory_ids) if i in self._offsets}
+        found = {}
+        if ranges:
+            with open(self.path, "rb") as f:
+                for memory_id, (offset, length) in sorted(ranges.items(), key=lambda item: item[1]):
+                    f.seek(offset)
+                    found[memory_id] = json.loads(f.read(length))
+        return [found.get(i) for i in memory_ids]
 
     def get_all_memories(self) -> List[Dict[str, Any]]:
         """
@@ -40,4 +73,63 @@ class EpisodicMemory:
         if not os.path.exists(self.path):
             return []
         with open(self.path, "r") as f:
-            return [json.loads(line) for line in f if line.strip()] 
\ No newline at end of file
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _load_offsets(self):
+        """Read the sidecar index, rebuilding it if it does not match the data file."""
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 3:
+                        continue
+                    offset, length = int(parts[1]), int(parts[2])
+                    self._offsets.setdefault(parts[0], (offset, length))
+                    self._end = max(self._end, offset + length)
+        if not self._index_matches():
+            self._offsets, self._end = {}, 0
+            if os.path.exists(self.index_path):
+                os.remove(self.index_path)
+        self._sync()
+
+    def _index_matches(self) -> bool:
+        """Whether the data file still holds the records the index points at."""
+        if not self._offsets:
+            return True
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < self._end:
+            return False
+        memory_id, (offset, length) = max(self._offsets.items(), key=lambda item: item[1])
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            try:
+                return json.loads(f.read(length)).get("id") == memory_id
+            except ValueError:
+                return False
+
+    def _sync(self):
+        """Index records appended past the covered end of the data file."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) <= self._end:
+            return
+        entries = []
+        with open(self.path, "rb") as f:
+            f.seek(self._end)
+            offset = self._end
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written record; picked up on a later sync
+                if line.strip():
+                    memory_id = json.loads(line).get("id")
+                    if memory_id:
+                        entries.append((memory_id, offset, len(line)))
+                offset += len(line)
+        self._record(entries)
+        self._end = offset
+
+    def _record(self, entries: List[Tuple[str, int, int]]):
+        """Add entries to the in-memory and sidecar indexes."""
+        if entries:
+            with open(self.index_path, "a") as f:
+                f.writelines(f"{memory_id}\t{offset}\t{length}\n" for memory_id, offset, length in entries)
+        for memory_id, offset, length in entries:
+            self._offsets.setdefault(memory_id, (offset, length))
+            self._end = max(self._end, offset + length)
@@ -1,53 +1,195 @@
 import os
 import json
+import time
+import struct
 import logging
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import dateparser
+import numpy as np
+
+from kg.kg_manager import TokenIndex, tokenize
 
 try:
     import faiss
-    import numpy as np
 except ImportError:
     faiss = None
-    np = None
+
+# Fixed .npy header size, so appending rows only rewrites the shape in place
+_NPY_HEADER_BYTES = 128
+
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def _epoch_day(moment: datetime) -> int:
+    """Days since 1970-01-01 of a datetime's own calendar date."""
+    return moment.date().toordinal() - _EPOCH_ORDINAL
+
+
+def _memory_terms(data: Dict[str, Any]):
+    """Epoch day (None if the timestamp cannot be parsed) and topic tokens of a memory.
+
+    Non-ISO timestamps go through dateparser here, once per memory at index
+    time, so queries never parse stored timestamps.
+    """
+    timestamp = data.get("timestamp") or ""
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        moment = dateparser.parse(timestamp) if isinstance(timestamp, str) and timestamp.strip() else None
+    day = _epoch_day(moment) if moment is not None else None
+    return day, set(tokenize(data.get("query", "") + " " + data.get("final_answer", "")))
+
+
+def _write_npy_header(f, rows: int, dimension: int):
+    header = repr({"descr": "<f4", "fortran_order": False, "shape": (rows, dimension)}).encode("latin1")
+    header += b" " * (_NPY_HEADER_BYTES - 10 - len(header) - 1) + b"\n"
+    f.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header)
+
 
 class MemoryIndexer:
     """
     Builds semantic and temporal index for episodic memory.
+
+    Embeddings are appended to a float32 ``.npy`` file and memories to an
+    ``.ids`` log (``id<TAB>row<TAB>epoch day<TAB>tokens``, row -1 for
+    memories without an embedding), both next to ``index_path``; the log is
+    replayed on load into a day-bucket index and a token inverted index. A
+    long-lived FAISS index receives each vector as it is indexed; the files
+    are written in batches every ``flush_every`` memories or
+    ``flush_interval`` seconds, and by ``flush()``. An older JSON index at
+    ``index_path`` is migrated on first load.
     """
-    def __init__(self, memory_path: str = "memory/episodic_memory.jsonl", index_path: str = "memory/memory_index.json"):
+    def __init__(self, memory_path: str = "memory/episodic_memory.jsonl", index_path: str = "memory/memory_index.json",
+                 flush_every: int = 64, flush_interval: float = 5.0):
         self.memory_path = memory_path
         self.index_path = index_path
+        base = os.path.splitext(index_path)[0]
+        self.ids_path = base + ".ids"
+        self.vectors_path = base + ".npy"
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
         self.semantic_index = None
         self.memory_ids = []
-        self.embeddings = []
+        self.vector_ids = []  # Memory id of each stored vector row
+        self.day_index: Dict[int, List[int]] = {}  # Epoch day -> positions in memory_ids
+        self.topic_index = TokenIndex()  # Token -> positions in memory_ids
+        self.dimension = None
+        self._lock = threading.RLock()
+        self._stored_rows = 0
+        self._pending_ids = []
+        self._pending_vectors = []
+        self._last_flush = time.time()
+        self._known = set()
+        self._memory_offset = 0  # Bytes of the memory file checked for unindexed memories
         self._load_index()
 
     def _load_index(self):
-        if os.path.exists(self.index_path):
+        if os.path.exists(self.ids_path):
+            rows = []
+            with open(self.ids_path, "r") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) < 2:
+                        continue
+                    parts += [""] * (4 - len(parts))
+                    rows.append((parts[0], int(parts[1]), int(parts[2]) if parts[2] else None, parts[3].split()))
+            vectors = np.load(self.vectors_path, mmap_mode="r") if os.path.exists(self.vectors_path) else None
+            stored = len(vectors) if vectors is not None else 0
+            # Keep what both files agree on; a flush interrupted mid-way leaves extra rows
+            vector_ids = [memory_id for memory_id, row, _, _ in rows if 0 <= row < stored]
+            for memory_id, row, day, tokens in rows:
+                # Older readers persisted caught-up memories too, so an id can repeat
+                if row < stored and memory_id not in self._known:
+                    self._index_terms(memory_id, day, tokens)
+            self.vector_ids = vector_ids
+            self._stored_rows = len(vector_ids)
+            if vectors is not None:
+                self.dimension = vectors.shape[1]
+                if faiss and vector_ids:
+                    self.semantic_index = faiss.IndexFlatL2(self.dimension)
+                    self.semantic_index.add(np.ascontiguousarray(vectors[:len(vector_ids)], dtype=np.float32))
+        elif os.path.exists(self.index_path):
             with open(self.index_path, "r") as f:
                 data = json.load(f)
-                self.memory_ids = data.get("memory_ids", [])
-                self.embeddings = data.get("embeddings", [])
-        else:
-            self.memory_ids = []
-            self.embeddings = []
+            embeddings = data.get("embeddings", [])
+            memory_ids = data.get("memory_ids", [])
+            from memory.episodic_memory import EpisodicMemory
+            memories = EpisodicMemory(self.memory_path).get_many(memory_ids)
+            for i, (memory_id, m) in enumerate(zip(memory_ids, memories)):
+                self._add(memory_id, embeddings[i] if i < len(embeddings) else None, *_memory_terms(m or {}))
+            self.flush()
+
+    def _index_terms(self, memory_id: str, day: Optional[int], tokens):
+        """Give a memory the next position and add it to the day and topic indexes."""
+        position = len(self.memory_ids)
+        self.memory_ids.append(memory_id)
+        self._known.add(memory_id)
+        if day is not None:
+            self.day_index.setdefault(day, []).append(position)
+        self.topic_index.add(position, tokens)
 
-    def _save_index(self):
-        with open(self.index_path, "w") as f:
-            json.dump({"memory_ids": self.memory_ids, "embeddings": self.embeddings}, f)
+    def _add(self, memory_id: str, embedding: Optional[List[float]], day: Optional[int] = None, tokens=()):
+        """Record a memory in memory; files are written by ``flush``."""
+        row = -1
+        if embedding is not None:
+            vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+            if self.dimension is None:
+                self.dimension = len(vector)
+            elif len(vector) != self.dimension:
+                raise ValueError(f"Embedding has {len(vector)} dimensions, index has {self.dimension}")
+            row = len(self.vector_ids)
+            self.vector_ids.append(memory_id)
+            self._pending_vectors.append(vector)
+            if faiss:
+                if self.semantic_index is None:
+                    self.semantic_index = faiss.IndexFlatL2(self.dimension)
+                self.semantic_index.add(vector.reshape(1, -1))
+        tokens = sorted(tokens)
+        self._index_terms(memory_id, day, tokens)
+        self._pending_ids.append((memory_id, row, day, tokens))
+
+    def flush(self):
+        """
+        Appends buffered vectors and ids to the index files.
+        """
+        with self._lock:
+            if self._pending_vectors:
+                block = np.vstack(self._pending_vectors).astype("<f4")
+                exists = os.path.exists(self.vectors_path)
+                with open(self.vectors_path, "r+b" if exists else "w+b") as f:
+                    row_bytes = self.dimension * 4
+                    f.seek(_NPY_HEADER_BYTES + self._stored_rows * row_bytes)
+                    f.truncate()
+                    f.write(block.tobytes())
+                    self._stored_rows += len(block)
+                    f.seek(0)
+                    _write_npy_header(f, self._stored_rows, self.dimension)
+            # Vectors go first, so every id row on disk has its vector
+            if self._pending_ids:
+                with open(self.ids_path, "a") as f:
+                    f.writelines(
+                        f"{memory_id}\t{row}\t{'' if day is None else day}\t{' '.join(tokens)}\n"
+                        for memory_id, row, day, tokens in self._pending_ids
+                    )
+            self._pending_ids = []
+            self._pending_vectors = []
+            self._last_flush = time.time()
 
     def index_memory(self, data: Dict[str, Any], embed_fn=None):
         """
         Adds a memory to the semantic and temporal index.
         """
         memory_id = data["id"]
-        self.memory_ids.append(memory_id)
+        emb = None
         if embed_fn:
             emb = embed_fn(data.get("final_answer", "") + " " + data.get("query", ""))
-            self.embeddings.append(emb)
-        self._save_index()
+        with self._lock:
+            self._add(memory_id, emb, *_memory_terms(data))
+            if (len(self._pending_ids) >= self.flush_every or
+                    time.time() - self._last_flush >= self.flush_interval):
+                self.flush()
 
     def reindex_all(self, embed_fn=None):
         """
@@ -55,46 +197,76 @@ class MemoryIndexer:
         """
         from memory.episodic_memory import EpisodicMemory
         mem = EpisodicMemory(self.memory_path)
-        self.memory_ids = []
-        self.embeddings = []
-        for m in mem.get_all_memories():
-            self.index_memory(m, embed_fn=embed_fn)
-        self._save_index()
+        with self._lock:
+            for path in (self.ids_path, self.vectors_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.semantic_index = None
+            self.memory_ids = []
+            self.vector_ids = []
+            self.day_index = {}
+            self.topic_index = TokenIndex()
+            self._known = set()
+            self._memory_offset = 0
+            self.dimension = None
+            self._stored_rows = 0
+            self._pending_ids = []
+            self._pending_vectors = []
+            for m in mem.get_all_memories():
+                emb = None
+                if embed_fn:
+                    emb = embed_fn(m.get("final_answer", "") + " " + m.get("query", ""))
+                self._add(m["id"], emb, *_memory_terms(m))
+            self.flush()
 
     def search_by_semantic(self, query: str, embed_fn, top_k: int = 5) -> List[str]:
         """
         Returns memory IDs most similar to the query.
         """
-        if not faiss or not np or not self.embeddings:
-            return []
-        query_emb = np.array([embed_fn(query)], dtype="float32")
-        index = faiss.IndexFlatL2(len(self.embeddings[0]))
-        index.add(np.array(self.embeddings, dtype="float32"))
-        D, I = index.search(query_emb, top_k)
-        return [self.memory_ids[i] for i in I[0] if i < len(self.memory_ids)]
+        with self._lock:
+            if not faiss or self.semantic_index is None or self.semantic_index.ntotal == 0:
+                return []
+            query_emb = np.array([embed_fn(query)], dtype="float32")
+            D, I = self.semantic_index.search(query_emb, min(top_k, self.semantic_index.ntotal))
+            return [self.vector_ids[i] for i in I[0] if 0 <= i < len(self.vector_ids)]
 
     def search_by_date(self, date_str: str) -> List[str]:
         """
         Returns memory IDs for a given date (YYYY-MM-DD or natural language).
         """
         target = dateparser.parse(date_str)
-        from memory.episodic_memory import EpisodicMemory
-        mem = EpisodicMemory(self.memory_path)
-        results = []
-        for m in mem.get_all_memories():
-            ts = dateparser.parse(m.get("timestamp", ""))
-            if ts and target and ts.date() == target.date():
-                results.append(m["id"])
-        return results
+        if not target:
+            return []
+        with self._lock:
+            self._catch_up()
+            return [self.memory_ids[p] for p in self.day_index.get(_epoch_day(target), [])]
 
     def search_by_topic(self, keyword: str) -> List[str]:
         """
-        Returns memory IDs where the topic/keyword appears in query or answer.
+        Returns memory IDs whose query or answer has a word starting with each
+        keyword token.
         """
-        from memory.episodic_memory import EpisodicMemory
-        mem = EpisodicMemory(self.memory_path)
-        results = []
-        for m in mem.get_all_memories():
-            if keyword.lower() in (m.get("query", "") + m.get("final_answer", "")).lower():
-                results.append(m["id"])
-        return results 
\ No newline at end of file
+        with self._lock:
+            self._catch_up()
+            return [self.memory_ids[p] for p in sorted(self.topic_index.match(keyword))]
+
+    def _catch_up(self):
+        """
+        Index memories written to the memory file without going through
+        ``index_memory``. They are kept in memory only: queries never write
+        the index files, which belong to the instance that indexes memories.
+        """
+        if not os.path.exists(self.memory_path) or os.path.getsize(self.memory_path) <= self._memory_offset:
+            return
+        with open(self.memory_path, "rb") as f:
+            f.seek(self._memory_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._memory_offset += len(line)
+                if not line.strip():
+                    continue
+                m = json.loads(line)
+                if m.get("id") and m["id"] not in self._known:
+                    day, tokens = _memory_terms(m)
+                    self._index_terms(m["id"], day, sorted(tokens))
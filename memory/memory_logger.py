@@ -1,3 +1,4 @@
+import os
 import logging
 from memory.episodic_memory import EpisodicMemory
 from memory.memory_indexer import MemoryIndexer
@@ -8,12 +9,29 @@ class MemoryLogger:
     """
     Logs and stores each new session's full memory snapshot.
     """
-    def __init__(self, memory_path="memory/episodic_memory.jsonl"):
+    def __init__(self, memory_path="memory/episodic_memory.jsonl", index_path=None):
         self.memory = EpisodicMemory(memory_path)
-        self.indexer = MemoryIndexer(memory_path)
+        self.indexer = MemoryIndexer(memory_path, index_path or os.path.join(os.path.dirname(memory_path), "memory_index.json"))
 
     def log_memory(self, data: dict, embed_fn=None):
         memory_id = self.memory.store_memory(data)
-        self.indexer.index_memory({**data, "id": memory_id}, embed_fn=embed_fn)
+        # Index the stored record so its assigned timestamp lands in the day buckets
+        self.indexer.index_memory(self.memory.get_memory_by_id(memory_id), embed_fn=embed_fn)
         logger.info(f"Memory snapshot stored and indexed: {memory_id}")
-        return memory_id 
\ No newline at end of file
+        return memory_id
+
+    def flush(self):
+        """
+        Writes index rows still buffered by the indexer.
+        """
+        self.indexer.flush()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+ 
\ No newline at end of file
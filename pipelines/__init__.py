@@ -7,7 +7,10 @@ This module handles ZenML-based MLOps pipelines.
 from .ingestion_pipeline import IngestionPipeline
 from .retrieval_pipeline import RetrievalPipeline
 from .training_pipeline import TrainingPipeline
-from .pipeline import OMNIMINDPipeline, run_pipeline
+from .pipeline import OMNIMINDPipeline, run_pipeline, resume_pipeline
+from .checkpoint import PipelineCheckpoint
+from .ingestion_jobs import IngestionJobManager, JobLimitError
+from .dag_executor import DAGExecutor
 from .ingest_step import ingest_step
 from .chunk_step import chunk_step
 from .embed_step import embed_step
@@ -19,6 +22,11 @@ __all__ = [
     "TrainingPipeline",
     "OMNIMINDPipeline",
     "run_pipeline",
+    "resume_pipeline",
+    "PipelineCheckpoint",
+    "IngestionJobManager",
+    "JobLimitError",
+    "DAGExecutor",
     "ingest_step",
     "chunk_step", 
     "embed_step",
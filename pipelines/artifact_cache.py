@@ -0,0 +1,215 @@
+"""
+Artifact Cache for OMNIMIND
+
+On-disk store of pipeline step outputs, keyed by a hash of the step's code,
+its declared version and its declared inputs, so rerunning a step on
+identical inputs is a lookup instead of a recomputation.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import inspect
+import functools
+import threading
+import uuid
+from typing import List, Dict, Any, Optional, Sequence, Callable
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Record fields stored column-wise in npz instead of inline in JSONL
+_ARRAY_FIELDS = ("embedding",)
+
+
+class ArtifactCache:
+    """Content-addressed store for step outputs.
+
+    Each entry is a directory holding ``meta.json`` for scalar outputs,
+    one JSONL file per list-of-records output and ``arrays.npz`` for NumPy
+    arrays and record fields such as embeddings.
+    """
+
+    def __init__(self, root: str = "data/artifacts"):
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def make_key(self, step_name: str, code_version: str, inputs: Dict[str, Any]) -> str:
+        """Hash of the step identity and its declared inputs."""
+        digest = hashlib.sha256()
+        digest.update(step_name.encode("utf-8"))
+        digest.update(code_version.encode("utf-8"))
+        for name in sorted(inputs):
+            digest.update(name.encode("utf-8"))
+            _hash_value(digest, inputs[name])
+        return digest.hexdigest()
+
+    def _entry_path(self, step_name: str, key: str) -> str:
+        return os.path.join(self.root, step_name, key)
+
+    def load(self, step_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """Load a cached step output, or None on a miss."""
+        path = self._entry_path(step_name, key)
+        meta_file = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_file):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            with open(meta_file, "r") as f:
+                meta = json.load(f)
+            outputs = dict(meta["values"])
+
+            arrays = {}
+            if meta["arrays"] or meta["record_arrays"]:
+                with np.load(os.path.join(path, "arrays.npz")) as npz:
+                    arrays = {name: npz[name] for name in npz.files}
+            for name in meta["arrays"]:
+                outputs[name] = arrays[name]
+
+            for name in meta["records"]:
+                with open(os.path.join(path, f"{name}.jsonl"), "r") as f:
+                    records = [json.loads(line) for line in f if line.strip()]
+                for field in meta["record_arrays"].get(name, []):
+                    column = arrays[f"{name}.{field}"].tolist()
+                    for record, value in zip(records, column):
+                        record[field] = value
+                outputs[name] = records
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable artifact {step_name}/{key}: {e}")
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return outputs
+
+    def save(self, step_name: str, key: str, outputs: Dict[str, Any]) -> bool:
+        """Store a step output. Returns False if it cannot be serialized."""
+        meta = {"values": {}, "arrays": [], "records": [], "record_arrays": {}}
+        arrays = {}
+        records = {}
+
+        for name, value in outputs.items():
+            if isinstance(value, np.ndarray):
+                meta["arrays"].append(name)
+                arrays[name] = value
+            elif isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+                fields = [f for f in _ARRAY_FIELDS if _is_uniform_vector_field(value, f)]
+                meta["records"].append(name)
+                if fields:
+                    meta["record_arrays"][name] = fields
+                    for field in fields:
+                        arrays[f"{name}.{field}"] = np.asarray([v[field] for v in value], dtype=np.float64)
+                records[name] = [{k: v for k, v in r.items() if k not in fields} for r in value]
+            else:
+                meta["values"][name] = value
+
+        final_path = self._entry_path(step_name, key)
+        tmp_path = f"{final_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(tmp_path)
+            for name, rows in records.items():
+                with open(os.path.join(tmp_path, f"{name}.jsonl"), "w") as f:
+                    for row in rows:
+                        f.write(json.dumps(row) + "\n")
+            if arrays:
+                np.savez(os.path.join(tmp_path, "arrays.npz"), **arrays)
+            with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            if os.path.exists(final_path):
+                shutil.rmtree(tmp_path)
+                return True
+            os.replace(tmp_path, final_path)
+            return True
+        except (TypeError, ValueError, OSError) as e:
+            logger.warning(f"Not caching {step_name} output: {e}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return False
+
+    def clear(self, step_name: str = None):
+        """Remove cached artifacts for one step or for all steps."""
+        path = os.path.join(self.root, step_name) if step_name else self.root
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+
+
+def cached_step(inputs: Sequence[str], version: str = "1",
+                context: Callable[[], Any] = None,
+                derived: Dict[str, Callable[[Dict[str, Any]], Any]] = None):
+    """Memoize a pipeline step through the artifact cache.
+
+    The step runs normally unless ``input_data["artifact_cache"]`` holds an
+    ArtifactCache (or a directory path for one). The cache key covers the
+    step's source code, ``version``, the declared ``inputs``, each
+    ``derived`` function applied to input_data (for inputs such as live
+    objects that only matter through a summary of them) and, if given,
+    ``context()`` for state outside input_data that changes the result.
+    Outputs containing an ``error`` are never cached.
+    """
+    def decorator(step_function):
+        try:
+            source = inspect.getsource(step_function)
+        except (OSError, TypeError):
+            source = step_function.__code__.co_code.hex()
+        code_version = hashlib.sha256(f"{version}:{source}".encode("utf-8")).hexdigest()
+        step_name = step_function.__name__
+
+        @functools.wraps(step_function)
+        def wrapper(input_data: Dict[str, Any]) -> Dict[str, Any]:
+            cache = input_data.get("artifact_cache")
+            if cache is None:
+                return step_function(input_data)
+            if isinstance(cache, str):
+                cache = ArtifactCache(cache)
+
+            key_inputs = {name: input_data.get(name) for name in inputs}
+            for name, derive in (derived or {}).items():
+                key_inputs[f"__{name}__"] = derive(input_data)
+            if context is not None:
+                key_inputs["__context__"] = context()
+            key = cache.make_key(step_name, code_version, key_inputs)
+
+            cached = cache.load(step_name, key)
+            if cached is not None:
+                logger.info(f"Artifact cache hit for {step_name} ({key[:12]})")
+                return cached
+
+            result = step_function(input_data)
+            if "error" not in result:
+                cache.save(step_name, key, result)
+            return result
+
+        wrapper.cache_inputs = tuple(inputs)
+        return wrapper
+    return decorator
+
+
+def _is_uniform_vector_field(records: List[Dict[str, Any]], field: str) -> bool:
+    """Whether every record holds an equal-length numeric list in ``field``."""
+    first = records[0].get(field)
+    if not isinstance(first, list) or not first:
+        return False
+    width = len(first)
+    return all(
+        isinstance(r.get(field), list) and len(r[field]) == width
+        and all(isinstance(x, (int, float)) for x in r[field])
+        for r in records
+    )
+
+
+def _hash_value(digest, value: Any):
+    """Feed a canonical encoding of an input value into the digest."""
+    if isinstance(value, np.ndarray):
+        digest.update(str(value.dtype).encode("utf-8"))
+        digest.update(str(value.shape).encode("utf-8"))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=repr).encode("utf-8"))
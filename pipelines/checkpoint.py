@@ -0,0 +1,152 @@
+"""
+Pipeline Checkpoints for OMNIMIND
+
+Records per-stage, per-batch progress of streaming ingestion jobs so a job
+interrupted by a crash or deploy can resume from its last committed batch.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import logging
+from .artifact_cache import ArtifactCache
+
+logger = logging.getLogger(__name__)
+
+# Keys of an embed-stage payload needed to replay its store stage
+_PARTIAL_KEYS = ("embedded_chunks", "manifest_updates", "stale_chunks")
+
+
+class PipelineCheckpoint:
+    """Checkpoint state for one streaming ingestion job.
+
+    ``state.json`` holds the job config and status; each stage commit is
+    appended as one line to ``commits.log`` and replayed on load into the
+    committed batch ids and the store offset (items written so far), so a
+    commit costs one small append rather than a state rewrite. Embeddings of
+    batches that finished embedding but not storing are kept as partial
+    artifacts so a resume does not recompute them.
+    """
+
+    def __init__(self, job_id: str, root: str = "data/checkpoints"):
+        self.job_id = job_id
+        self.path = os.path.join(root, job_id)
+        self.state_file = os.path.join(self.path, "state.json")
+        self.commit_log = os.path.join(self.path, "commits.log")
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        self._partials = ArtifactCache(os.path.join(self.path, "partials"))
+        self.state = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        state = {
+            "job_id": self.job_id,
+            "status": "new",
+            "config": None,
+            "stages": {},
+            "store_offset": 0,
+            "updated_at": None
+        }
+        if os.path.exists(self.state_file):
+            with open(self.state_file, "r") as f:
+                state = json.load(f)
+        self._committed = {(stage, batch_id) for stage, ids in state["stages"].items() for batch_id in ids}
+        if os.path.exists(self.commit_log):
+            with open(self.commit_log, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn final line from an interrupted append
+                    self._apply(state, entry["stage"], entry["batch_id"], entry.get("items", 0))
+        return state
+
+    def _apply(self, state: Dict[str, Any], stage: str, batch_id: str, items: int) -> bool:
+        """Add a commit to the in-memory state; False if it was already there."""
+        if (stage, batch_id) in self._committed:
+            return False
+        self._committed.add((stage, batch_id))
+        state["stages"].setdefault(stage, []).append(batch_id)
+        if stage == "store":
+            state["store_offset"] += items
+        return True
+
+    def _write(self):
+        """Atomically persist the state (caller holds the lock)."""
+        self.state["updated_at"] = datetime.utcnow().isoformat()
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_file, self.state_file)
+
+    @classmethod
+    def exists(cls, job_id: str, root: str = "data/checkpoints") -> bool:
+        """Whether a checkpoint has been written for a job."""
+        return os.path.exists(os.path.join(root, job_id, "state.json"))
+
+    @classmethod
+    def remove(cls, job_id: str, root: str = "data/checkpoints"):
+        """Delete a job's checkpoint, e.g. once the job has completed."""
+        shutil.rmtree(os.path.join(root, job_id), ignore_errors=True)
+
+    @staticmethod
+    def batch_id(index: int, sources: List[str]) -> str:
+        """Stable id of a source micro-batch."""
+        digest = hashlib.sha256("\n".join(sources).encode("utf-8")).hexdigest()
+        return f"{index:06d}-{digest[:12]}"
+
+    @property
+    def config(self) -> Optional[Dict[str, Any]]:
+        return self.state.get("config")
+
+    def save_config(self, sources: List[str], batch_size: int, params: Dict[str, Any]):
+        """Record how the job was started; non-JSON params are left out."""
+        serializable = {}
+        for key, value in params.items():
+            try:
+                json.dumps(value)
+                serializable[key] = value
+            except TypeError:
+                continue
+        with self._lock:
+            self.state["config"] = {
+                "sources": list(sources),
+                "batch_size": batch_size,
+                "params": serializable
+            }
+            self.state["status"] = "running"
+            self._write()
+
+    def is_committed(self, stage: str, batch_id: str) -> bool:
+        """Whether a stage has committed a batch."""
+        return (stage, batch_id) in self._committed
+
+    def commit(self, stage: str, batch_id: str, items: int = 0):
+        """Mark a batch as done for a stage; store commits advance the offset."""
+        with self._lock:
+            if self._apply(self.state, stage, batch_id, items):
+                with open(self.commit_log, "a") as f:
+                    f.write(json.dumps({"stage": stage, "batch_id": batch_id, "items": items}) + "\n")
+
+    def save_partial(self, batch_id: str, payload: Dict[str, Any]) -> bool:
+        """Keep a batch's embed output until the store stage commits it."""
+        partial = {key: payload[key] for key in _PARTIAL_KEYS if key in payload}
+        return self._partials.save("embed", batch_id, partial)
+
+    def load_partial(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Load a batch's saved embed output, if any."""
+        return self._partials.load("embed", batch_id)
+
+    def drop_partial(self, batch_id: str):
+        """Delete a batch's saved embed output once stored."""
+        shutil.rmtree(os.path.join(self._partials.root, "embed", batch_id), ignore_errors=True)
+
+    def mark(self, status: str):
+        """Record the job's overall status (running, completed, failed, cancelled)."""
+        with self._lock:
+            self.state["status"] = status
+            self._write()
@@ -4,18 +4,25 @@ Chunking Pipeline Step for OMNIMIND
 Handles text chunking using the smart chunker.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 import logging
 from chunker.chunker import SmartChunker
+from crawlers.extractors import get_extractor, TextExtractor
+from .artifact_cache import cached_step
 
 logger = logging.getLogger(__name__)
 
 
+@cached_step(inputs=("documents", "chunk_size", "overlap", "language", "chunking_strategy"),
+             derived={"incremental": lambda data: data.get("manifest") is not None})
 def chunk_step(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """Chunk documents into smaller pieces."""
     try:
         documents = input_data.get("documents", [])
         if not documents:
+            if input_data.get("manifest") is not None:
+                # Incremental run where every source was unchanged
+                return {"chunks": [], "total_documents": 0, "total_chunks": 0}
             logger.warning("No documents provided for chunking")
             return {"chunks": [], "error": "No documents provided"}
         
@@ -23,16 +30,30 @@ def chunk_step(input_data: Dict[str, Any]) -> Dict[str, Any]:
         chunk_size = input_data.get("chunk_size", 1000)
         overlap = input_data.get("overlap", 200)
         language = input_data.get("language", "en")
+        chunking_strategy = input_data.get("chunking_strategy", "sentence")
+        chunk_workers = input_data.get("chunk_workers", 1)
         
         # Initialize chunker
         chunker = SmartChunker(
             chunk_size=chunk_size,
             overlap=overlap,
-            language=language
+            language=language,
+            strategy=chunking_strategy
         )
         
-        # Chunk documents
-        chunks = chunker.chunk_documents(documents)
+        # Chunk documents in order; runs of loaded documents go through the
+        # (possibly parallel) batch path, files too large to load are
+        # streamed from disk straight into the output
+        chunks = []
+        loaded = []
+        for doc in documents:
+            if not doc.get("streamed"):
+                loaded.append(doc)
+                continue
+            chunks.extend(chunker.chunk_documents(loaded, max_workers=chunk_workers))
+            loaded = []
+            chunks.extend(_chunk_streamed(chunker, doc))
+        chunks.extend(chunker.chunk_documents(loaded, max_workers=chunk_workers))
         
         # Get chunk statistics
         chunk_stats = chunker.get_chunk_stats(chunks)
@@ -48,9 +69,17 @@ def chunk_step(input_data: Dict[str, Any]) -> Dict[str, Any]:
             "total_chunks": len(chunks),
             "chunk_size": chunk_size,
             "overlap": overlap,
-            "language": language
+            "language": language,
+            "chunking_strategy": chunking_strategy
         }
         
     except Exception as e:
         logger.error(f"Error in chunk step: {e}")
-        return {"error": str(e), "chunks": []} 
\ No newline at end of file
+        return {"error": str(e), "chunks": []}
+
+
+def _chunk_streamed(chunker: SmartChunker, doc: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Chunk a file the loader left on disk, segment by segment."""
+    source = doc.get("source", "")
+    extractor = get_extractor(source) or TextExtractor()
+    return chunker.chunk_document_stream(doc, extractor.extract(source))
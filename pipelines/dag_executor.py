@@ -0,0 +1,180 @@
+"""
+DAG Executor for OMNIMIND
+
+Shared step scheduler for IngestionPipeline, RetrievalPipeline and
+TrainingPipeline: validates the step graph up front and runs independent
+steps concurrently.
+"""
+
+from typing import List, Dict, Any, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DAGExecutor:
+    """Runs pipeline steps as a dependency graph on a thread or process pool.
+
+    Each step receives the pipeline input merged with the outputs of its
+    ancestors (in topological order), so a step's input never depends on
+    which unrelated steps happened to finish first. Steps downstream of a
+    failed or timed-out step are skipped.
+    """
+
+    EXECUTOR_TYPES = ("thread", "process")
+
+    def __init__(self, max_workers: int = 4, executor_type: str = "thread"):
+        if executor_type not in self.EXECUTOR_TYPES:
+            raise ValueError(f"Unknown executor type: {executor_type}")
+        self.max_workers = max_workers
+        self.executor_type = executor_type
+
+    @staticmethod
+    def topological_order(steps: List[Dict[str, Any]]) -> List[str]:
+        """Return step names in dependency order, validating the graph.
+
+        Raises:
+            ValueError: On duplicate step names, unknown dependencies or cycles
+        """
+        names = [step["name"] for step in steps]
+        if len(set(names)) != len(names):
+            duplicates = sorted({name for name in names if names.count(name) > 1})
+            raise ValueError(f"Duplicate step names: {duplicates}")
+
+        known = set(names)
+        for step in steps:
+            missing = [dep for dep in step["dependencies"] if dep not in known]
+            if missing:
+                raise ValueError(f"Step {step['name']} depends on unknown steps: {missing}")
+
+        # Kahn's algorithm, keeping insertion order among ready steps
+        remaining = {step["name"]: set(step["dependencies"]) for step in steps}
+        order = []
+        while remaining:
+            ready = [name for name in names if name in remaining and not remaining[name]]
+            if not ready:
+                raise ValueError(f"Dependency cycle among steps: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+                for deps in remaining.values():
+                    deps.discard(name)
+            order.extend(ready)
+        return order
+
+    def run(self, steps: List[Dict[str, Any]], input_data: Dict[str, Any],
+            runner: Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]
+            ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Execute all steps and return (merged data, per-step records).
+
+        Args:
+            steps: Step dicts with name, function, dependencies and optional timeout
+            input_data: Initial pipeline data
+            runner: Callable running one step, returning a dict with
+                status, output and duration (the pipeline's _execute_step)
+        """
+        order = self.topological_order(steps)
+        position = {name: i for i, name in enumerate(order)}
+        by_name = {step["name"]: step for step in steps}
+        ancestors = self._ancestors(by_name, order)
+
+        outputs: Dict[str, Dict[str, Any]] = {}
+        records: Dict[str, Dict[str, Any]] = {}
+        pending = list(order)
+        running = {}  # future -> (name, started, deadline)
+
+        pool_class = ThreadPoolExecutor if self.executor_type == "thread" else ProcessPoolExecutor
+        pool = pool_class(max_workers=self.max_workers)
+        try:
+            while pending or running:
+                # Submit every step whose dependencies have all finished
+                for name in list(pending):
+                    step = by_name[name]
+                    deps = step["dependencies"]
+                    if not all(dep in records for dep in deps):
+                        continue
+                    pending.remove(name)
+
+                    if any(records[dep]["status"] != "completed" for dep in deps):
+                        step["status"] = "skipped"
+                        records[name] = self._record(step, "skipped", 0.0, error="upstream step did not complete")
+                        continue
+
+                    step_input = dict(input_data)
+                    for ancestor in sorted(ancestors[name], key=position.get):
+                        step_input.update(outputs.get(ancestor, {}))
+
+                    step["status"] = "running"
+                    started = time.time()
+                    timeout = step.get("timeout")
+                    future = pool.submit(runner, step, step_input)
+                    running[future] = (name, started, started + timeout if timeout else None)
+
+                if not running:
+                    continue
+
+                deadlines = [deadline for _, _, deadline in running.values() if deadline]
+                wait_for = max(0.0, min(deadlines) - time.time()) if deadlines else None
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name, started, _ = running.pop(future)
+                    step = by_name[name]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"status": "failed", "error": str(e), "duration": time.time() - started}
+                    step["status"] = result["status"]
+                    if result["status"] == "completed" and isinstance(result.get("output"), dict):
+                        outputs[name] = result["output"]
+                    records[name] = self._record(
+                        step, result["status"], result.get("duration", time.time() - started),
+                        error=result.get("error"), output=result.get("output")
+                    )
+
+                # Give up on steps that overran their timeout
+                now = time.time()
+                for future, (name, started, deadline) in list(running.items()):
+                    if deadline and now >= deadline:
+                        future.cancel()
+                        del running[future]
+                        step = by_name[name]
+                        step["status"] = "timed_out"
+                        logger.error(f"Step {name} timed out after {step['timeout']}s")
+                        records[name] = self._record(step, "timed_out", now - started,
+                                                     error=f"timed out after {step['timeout']}s")
+        finally:
+            # Do not block on steps that timed out and are still running
+            pool.shutdown(wait=not any(r["status"] == "timed_out" for r in records.values()))
+
+        final_data = dict(input_data)
+        for name in order:
+            final_data.update(outputs.get(name, {}))
+        return final_data, [records[name] for name in order]
+
+    @staticmethod
+    def _ancestors(by_name: Dict[str, Dict[str, Any]], order: List[str]) -> Dict[str, set]:
+        """Transitive dependencies of every step."""
+        ancestors: Dict[str, set] = {}
+        for name in order:
+            deps = set(by_name[name]["dependencies"])
+            for dep in list(deps):
+                deps |= ancestors[dep]
+            ancestors[name] = deps
+        return ancestors
+
+    @staticmethod
+    def _record(step: Dict[str, Any], status: str, duration: float,
+                error: str = None, output: Any = None) -> Dict[str, Any]:
+        """Execution record for one step."""
+        record = {
+            "step_name": step["name"],
+            "status": status,
+            "duration": duration,
+            "timeout": step.get("timeout"),
+            "output_keys": list(output.keys()) if isinstance(output, dict) else []
+        }
+        if error:
+            record["error"] = error
+        return record
@@ -4,18 +4,39 @@ Embedding Pipeline Step for OMNIMIND
 Handles text embedding using the multi-model embedder.
 """
 
+import os
+import importlib.util
 from typing import List, Dict, Any
 import logging
 from embedder.embedder import MultiModelEmbedder
+from .artifact_cache import cached_step
 
 logger = logging.getLogger(__name__)
 
 
+def _embedding_backend() -> str:
+    """Which embedder backend would be used, without loading any model.
+    
+    Part of the cache key so embeddings cached from a fallback backend are
+    not served once a better one becomes available.
+    """
+    if os.getenv("OPENAI_API_KEY") and importlib.util.find_spec("openai"):
+        return "openai"
+    if importlib.util.find_spec("sentence_transformers"):
+        return "sentence_transformers"
+    return "dummy"
+
+
+@cached_step(inputs=("chunks", "model_name", "fallback_model"), context=_embedding_backend,
+             derived={"incremental": lambda data: data.get("manifest") is not None})
 def embed_step(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """Embed chunks into vector representations."""
     try:
         chunks = input_data.get("chunks", [])
         if not chunks:
+            if input_data.get("manifest") is not None:
+                # Incremental run with no new chunks to embed
+                return {"embedded_chunks": [], "embedded_count": 0}
             logger.warning("No chunks provided for embedding")
             return {"embedded_chunks": [], "error": "No chunks provided"}
         
@@ -4,9 +4,12 @@ Ingestion Pipeline Step for OMNIMIND
 Handles data ingestion using the basic loader.
 """
 
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Tuple
 import logging
 from crawlers.basic_loader import BasicLoader
+from crawlers.crawl_cache import CrawlCache
+from .source_manifest import SourceManifest
 
 logger = logging.getLogger(__name__)
 
@@ -19,32 +22,99 @@ def ingest_step(input_data: Dict[str, Any]) -> Dict[str, Any]:
             logger.warning("No sources provided for ingestion")
             return {"documents": [], "error": "No sources provided"}
         
-        # Initialize loader
-        loader = BasicLoader()
+        # Initialize loader; a crawl cache makes URL fetches conditional
+        crawl_cache = input_data.get("crawl_cache")
+        owns_cache = isinstance(crawl_cache, str)
+        if owns_cache:
+            crawl_cache = CrawlCache(crawl_cache)
+        loader = BasicLoader(crawl_cache=crawl_cache,
+                             max_file_size=input_data.get("max_file_size", 10 * 1024 * 1024))
+        manifest = input_data.get("manifest")
+        
+        # Skip sources the manifest knows to be unchanged
+        skipped_sources = []
+        manifest_updates = {}
+        headers = {}
+        if manifest is not None:
+            sources, skipped_sources = _filter_unchanged_files(loader, manifest, sources)
+            headers = {s: manifest.conditional_headers(s) for s in sources if loader._is_url(s)}
         
         # Load documents from sources
-        documents = loader.load_multiple(sources)
+        documents = loader.load_multiple(sources, headers=headers) if sources else []
         
         # Filter successful loads
         successful_docs = [doc for doc in documents if doc.get("success", False)]
         failed_docs = [doc for doc in documents if not doc.get("success", False)]
         
+        # A 304 only says the server copy matches what was fetched before, not
+        # that it was stored: a cached page is skipped only once the manifest
+        # below confirms its content. Without cached text the validators came
+        # from the manifest itself, which only records stored sources.
+        skipped_sources.extend(doc["source"] for doc in successful_docs
+                               if doc.get("not_modified") and not doc.get("from_cache"))
+        successful_docs = [doc for doc in successful_docs
+                           if not doc.get("not_modified") or doc.get("from_cache")]
+        
+        if manifest is not None:
+            successful_docs, unchanged, manifest_updates = _filter_unchanged_content(manifest, successful_docs)
+            skipped_sources.extend(unchanged)
+        
         # Log results
         logger.info(f"Ingested {len(successful_docs)} documents successfully")
+        if skipped_sources:
+            logger.info(f"Skipped {len(skipped_sources)} unchanged sources")
         if failed_docs:
             logger.warning(f"Failed to ingest {len(failed_docs)} documents")
         
         # Clean up
         loader.close()
+        if owns_cache:
+            crawl_cache.close()
         
         return {
             "documents": successful_docs,
             "failed_documents": failed_docs,
-            "total_sources": len(sources),
+            "skipped_sources": skipped_sources,
+            "manifest_updates": manifest_updates,
+            "total_sources": len(input_data.get("sources", [])),
             "successful_ingestions": len(successful_docs),
             "failed_ingestions": len(failed_docs)
         }
         
     except Exception as e:
         logger.error(f"Error in ingest step: {e}")
-        return {"error": str(e), "documents": []} 
\ No newline at end of file
+        return {"error": str(e), "documents": []} 
+
+
+def _filter_unchanged_files(loader: BasicLoader, manifest: SourceManifest,
+                            sources: List[str]) -> Tuple[List[str], List[str]]:
+    """Drop local files whose size and mtime match the manifest."""
+    pending, skipped = [], []
+    for source in sources:
+        if not loader._is_url(source):
+            try:
+                stat = os.stat(source)
+            except OSError:
+                pending.append(source)
+                continue
+            if manifest.is_unchanged_file(source, stat.st_size, stat.st_mtime):
+                skipped.append(source)
+                continue
+        pending.append(source)
+    return pending, skipped
+
+
+def _filter_unchanged_content(manifest: SourceManifest, documents: List[Dict[str, Any]]):
+    """Drop documents whose content hash is unchanged."""
+    changed, skipped, updates = [], [], {}
+    for doc in documents:
+        source = doc.get("source", "")
+        doc["content_hash"] = doc.get("content_hash") or SourceManifest.content_hash(doc.get("content", ""))
+        record = manifest.get(source)
+        if record and record.get("content_hash") == doc["content_hash"]:
+            # Touched but identical: refresh validators, keep chunks
+            updates[source] = SourceManifest.source_metadata(doc)
+            skipped.append(source)
+            continue
+        changed.append(doc)
+    return changed, skipped, updates
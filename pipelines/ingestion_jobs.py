@@ -0,0 +1,174 @@
+"""
+Ingestion Jobs for OMNIMIND
+
+Runs streaming ingestion pipelines as background jobs on a bounded worker
+pool, so API handlers only enqueue work and report on it.
+"""
+
+import uuid
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+import logging
+from .pipeline import OMNIMINDPipeline
+from .source_manifest import SourceManifest
+from .checkpoint import PipelineCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+class JobLimitError(RuntimeError):
+    """Raised when the number of queued and running jobs is at its cap."""
+
+
+class IngestionJobManager:
+    """Bounded pool of background ingestion jobs.
+
+    At most ``max_workers`` jobs run at once and at most ``max_jobs`` may be
+    queued or running; further submissions raise JobLimitError. Finished jobs
+    are kept for status queries, oldest dropped beyond ``history_size``.
+    Jobs share the configured stores, so their store steps run one at a time
+    under a common lock; a job's checkpoint is removed once it completes.
+    """
+
+    ACTIVE_STATUSES = ("queued", "running")
+
+    def __init__(self, max_workers: int = 2, max_jobs: int = 8, history_size: int = 100,
+                 manifest_path: str = None, checkpoint_dir: str = None,
+                 **pipeline_kwargs):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.history_size = history_size
+        self.manifest = SourceManifest(manifest_path) if manifest_path else None
+        self.checkpoint_dir = checkpoint_dir
+        self.pipeline_kwargs = pipeline_kwargs
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._store_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="omnimind-ingest-job")
+
+    def submit(self, sources: List[str], **kwargs) -> str:
+        """Enqueue an ingestion job and return its id.
+
+        Raises:
+            JobLimitError: If ``max_jobs`` jobs are already queued or running
+        """
+        with self._lock:
+            active = sum(1 for job in self.jobs.values() if job["status"] in self.ACTIVE_STATUSES)
+            if active >= self.max_jobs:
+                raise JobLimitError(f"Too many ingestion jobs in progress ({active}/{self.max_jobs})")
+
+            job_id = uuid.uuid4().hex
+            self.jobs[job_id] = {
+                "job_id": job_id,
+                "status": "queued",
+                "total_sources": len(sources),
+                "created_at": datetime.utcnow().isoformat(),
+                "started_at": None,
+                "finished_at": None,
+                "progress": {},
+                "result": None,
+                "error": None
+            }
+            self._cancel_events[job_id] = threading.Event()
+            self._prune_history()
+
+        self._pool.submit(self._run_job, job_id, list(sources), {**self.pipeline_kwargs, **kwargs})
+        logger.info(f"Queued ingestion job {job_id} ({len(sources)} sources)")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job's status, per-stage progress and result."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot["progress"] = {stage: dict(m) for stage, m in job["progress"].items()}
+            return snapshot
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Snapshots of all known jobs, oldest first."""
+        with self._lock:
+            job_ids = list(self.jobs)
+        return [job for job in (self.get(job_id) for job_id in job_ids) if job is not None]
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation of a queued or running job.
+
+        Returns False if the job is unknown or already finished.
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job["status"] not in self.ACTIVE_STATUSES:
+                return False
+            self._cancel_events[job_id].set()
+            if job["status"] == "queued":
+                self._finish(job, "cancelled")
+        logger.info(f"Cancellation requested for ingestion job {job_id}")
+        return True
+
+    def shutdown(self, wait: bool = True):
+        """Cancel all active jobs and stop the worker pool."""
+        with self._lock:
+            job_ids = [job_id for job_id, job in self.jobs.items() if job["status"] in self.ACTIVE_STATUSES]
+        for job_id in job_ids:
+            self.cancel(job_id)
+        self._pool.shutdown(wait=wait)
+
+    def _run_job(self, job_id: str, sources: List[str], kwargs: Dict[str, Any]):
+        """Execute one job on a pool thread."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            cancel_event = self._cancel_events.get(job_id)
+            if job is None or cancel_event.is_set():
+                return
+            job["status"] = "running"
+            job["started_at"] = datetime.utcnow().isoformat()
+
+        def on_progress(stage: str, metrics: Dict[str, Any]):
+            with self._lock:
+                job["progress"][stage] = metrics
+
+        if self.checkpoint_dir:
+            kwargs.setdefault("checkpoint_id", job_id)
+            kwargs.setdefault("checkpoint_dir", self.checkpoint_dir)
+        kwargs.setdefault("store_lock", self._store_lock)
+
+        try:
+            pipeline = OMNIMINDPipeline(manifest=self.manifest)
+            result = pipeline.run_streaming(
+                sources, progress_callback=on_progress, cancel_event=cancel_event, **kwargs
+            )
+        except Exception as e:
+            result = {"pipeline_success": False, "error": str(e)}
+
+        with self._lock:
+            final_data = result.get("final_data", {})
+            job["result"] = final_data
+            if "stage_metrics" in result:
+                job["progress"] = result["stage_metrics"]
+            if final_data.get("cancelled"):
+                self._finish(job, "cancelled")
+            elif result["pipeline_success"]:
+                self._finish(job, "completed")
+            else:
+                self._finish(job, "failed", final_data.get("error") or result.get("error"))
+        if job["status"] == "completed" and kwargs.get("checkpoint_id"):
+            PipelineCheckpoint.remove(kwargs["checkpoint_id"], kwargs["checkpoint_dir"])
+        logger.info(f"Ingestion job {job_id} {job['status']}")
+
+    def _finish(self, job: Dict[str, Any], status: str, error: str = None):
+        """Mark a job finished (caller holds the lock)."""
+        job["status"] = status
+        job["error"] = error
+        job["finished_at"] = datetime.utcnow().isoformat()
+
+    def _prune_history(self):
+        """Drop the oldest finished jobs beyond history_size (caller holds the lock)."""
+        finished = [job_id for job_id, job in self.jobs.items() if job["status"] not in self.ACTIVE_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.history_size)]:
+            del self.jobs[job_id]
+            del self._cancel_events[job_id]
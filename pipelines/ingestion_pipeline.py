@@ -6,6 +6,7 @@ Handles data ingestion pipeline using ZenML.
 
 from typing import List, Dict, Any
 import logging
+from .dag_executor import DAGExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -13,18 +14,25 @@ logger = logging.getLogger(__name__)
 class IngestionPipeline:
     """Data ingestion pipeline for OMNIMIND."""
     
-    def __init__(self, pipeline_name: str = "omnimind_ingestion"):
+    def __init__(self, pipeline_name: str = "omnimind_ingestion", max_workers: int = 4,
+                 executor_type: str = "thread"):
         self.pipeline_name = pipeline_name
         self.steps = []
         self.execution_history = []
+        self.executor = DAGExecutor(max_workers=max_workers, executor_type=executor_type)
     
     def add_step(self, step_name: str, step_function: callable, 
-                 dependencies: List[str] = None):
-        """Add a step to the pipeline."""
+                 dependencies: List[str] = None, timeout: float = None):
+        """Add a step to the pipeline.
+        
+        Steps without a dependency path between them may run concurrently;
+        ``timeout`` (seconds) bounds how long the pipeline waits for the step.
+        """
         step = {
             "name": step_name,
             "function": step_function,
             "dependencies": dependencies or [],
+            "timeout": timeout,
             "status": "pending"
         }
         self.steps.append(step)
@@ -32,56 +40,30 @@ class IngestionPipeline:
     
     def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the ingestion pipeline."""
+        execution_id = f"exec_{len(self.execution_history) + 1}"
+        execution_record = {
+            "execution_id": execution_id,
+            "pipeline_name": self.pipeline_name,
+            "steps": [],
+            "status": "running"
+        }
+        
         try:
             logger.info(f"Starting ingestion pipeline: {self.pipeline_name}")
             
-            # Track execution
-            execution_id = f"exec_{len(self.execution_history) + 1}"
-            execution_record = {
-                "execution_id": execution_id,
-                "pipeline_name": self.pipeline_name,
-                "steps": [],
-                "status": "running"
-            }
-            
-            current_data = input_data.copy()
-            
-            # Execute steps in dependency order
-            executed_steps = set()
-            
-            while len(executed_steps) < len(self.steps):
-                for step in self.steps:
-                    if step["name"] in executed_steps:
-                        continue
-                    
-                    # Check if dependencies are met
-                    dependencies_met = all(
-                        dep in executed_steps for dep in step["dependencies"]
-                    )
-                    
-                    if dependencies_met:
-                        # Execute step
-                        step_result = self._execute_step(step, current_data)
-                        executed_steps.add(step["name"])
-                        
-                        # Update current data
-                        current_data.update(step_result.get("output", {}))
-                        
-                        # Record step execution
-                        execution_record["steps"].append({
-                            "step_name": step["name"],
-                            "status": step_result["status"],
-                            "duration": step_result.get("duration", 0),
-                            "output_keys": list(step_result.get("output", {}).keys())
-                        })
-                        
-                        logger.info(f"Executed step: {step['name']}")
+            # Validate the graph and execute steps in dependency order
+            current_data, step_records = self.executor.run(
+                self.steps, input_data.copy(), self._execute_step
+            )
             
-            execution_record["status"] = "completed"
+            execution_record["steps"] = step_records
+            execution_record["status"] = (
+                "completed" if all(r["status"] == "completed" for r in step_records) else "failed"
+            )
             execution_record["final_data_keys"] = list(current_data.keys())
             self.execution_history.append(execution_record)
             
-            logger.info(f"Pipeline completed: {self.pipeline_name}")
+            logger.info(f"Pipeline {execution_record['status']}: {self.pipeline_name}")
             return current_data
             
         except Exception as e:
@@ -0,0 +1,61 @@
+"""
+Manifest Diff Pipeline Step for OMNIMIND
+
+Diffs freshly produced chunks against the ingestion manifest so only new
+chunks are embedded and chunks that disappeared are deleted from storage.
+"""
+
+from typing import List, Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def manifest_step(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce changed documents to chunk upserts and deletes."""
+    try:
+        chunks = input_data.get("chunks", [])
+        manifest = input_data.get("manifest")
+        if manifest is None:
+            return {"chunks": chunks}
+
+        documents = input_data.get("documents", [])
+        chunks_by_source: Dict[str, List[Dict[str, Any]]] = {}
+        for chunk in chunks:
+            chunks_by_source.setdefault(chunk.get("source", ""), []).append(chunk)
+
+        upserts = []
+        stale_chunks = {}
+        manifest_updates = dict(input_data.get("manifest_updates", {}))
+
+        for doc in documents:
+            source = doc.get("source", "")
+            doc_chunks = chunks_by_source.get(source, [])
+            previous = set(manifest.chunk_hashes(source))
+            current = [chunk["content_hash"] for chunk in doc_chunks]
+
+            upserts.extend(chunk for chunk in doc_chunks if chunk["content_hash"] not in previous)
+            removed = previous.difference(current)
+            if removed:
+                stale_chunks[source] = sorted(removed)
+
+            update = manifest.source_metadata(doc)
+            update["chunk_hashes"] = list(dict.fromkeys(current))
+            manifest_updates[source] = update
+
+        logger.info(
+            f"Manifest diff: {len(upserts)} new chunks, "
+            f"{len(chunks) - len(upserts)} unchanged, "
+            f"{sum(len(v) for v in stale_chunks.values())} stale"
+        )
+
+        return {
+            "chunks": upserts,
+            "stale_chunks": stale_chunks,
+            "manifest_updates": manifest_updates,
+            "unchanged_chunks": len(chunks) - len(upserts)
+        }
+
+    except Exception as e:
+        logger.error(f"Error in manifest step: {e}")
+        return {"error": str(e), "chunks": []}
@@ -1,9 +1,28 @@
+import atexit
+import threading
 from memory.memory_logger import MemoryLogger
 
-def memory_step(data: dict, embed_fn=None):
+_memory_logger = None
+_memory_logger_lock = threading.Lock()
+
+
+def _default_logger() -> MemoryLogger:
+    """
+    The process-wide logger, created on first use. Reusing it keeps the
+    index loaded between calls; buffered rows are flushed on the indexer's
+    schedule and at exit.
+    """
+    global _memory_logger
+    with _memory_logger_lock:
+        if _memory_logger is None:
+            _memory_logger = MemoryLogger()
+            atexit.register(_memory_logger.flush)
+        return _memory_logger
+
+
+def memory_step(data: dict, embed_fn=None, memory_logger: MemoryLogger = None):
     """
     Pipeline step: stores memory snapshot and updates index.
     """
-    logger = MemoryLogger()
-    memory_id = logger.log_memory(data, embed_fn=embed_fn)
-    return {"memory_id": memory_id} 
\ No newline at end of file
+    memory_id = (memory_logger or _default_logger()).log_memory(data, embed_fn=embed_fn)
+    return {"memory_id": memory_id}
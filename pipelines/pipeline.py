@@ -4,20 +4,39 @@ Main Pipeline for OMNIMIND
 Orchestrates the complete ingest → chunk → embed → store pipeline.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
 import logging
+import queue
+import threading
+import time
 from .ingest_step import ingest_step
 from .chunk_step import chunk_step
 from .embed_step import embed_step
 from .store_step import store_step
+from .manifest_step import manifest_step
+from .source_manifest import SourceManifest
+from .artifact_cache import ArtifactCache
+from .checkpoint import PipelineCheckpoint
 
 logger = logging.getLogger(__name__)
 
+# Marks the end of a stage's input stream
+_END_OF_STREAM = object()
+
 
 class OMNIMINDPipeline:
     """Main pipeline orchestrator for OMNIMIND."""
     
-    def __init__(self):
+    # Per-stage (input key, output key) used when streaming micro-batches
+    STREAM_KEYS = {
+        "ingest": ("sources", "documents"),
+        "chunk": ("documents", "chunks"),
+        "diff": ("chunks", "chunks"),
+        "embed": ("chunks", "embedded_chunks"),
+        "store": ("embedded_chunks", "stored_count")
+    }
+    
+    def __init__(self, manifest_path: str = None, manifest: SourceManifest = None):
         self.steps = [
             ("ingest", ingest_step),
             ("chunk", chunk_step),
@@ -25,6 +44,12 @@ class OMNIMINDPipeline:
             ("store", store_step)
         ]
         self.execution_history = []
+        
+        # Incremental mode: skip unchanged sources and diff changed ones.
+        # Concurrent runs against one manifest file should share an instance.
+        self.manifest = manifest or (SourceManifest(manifest_path) if manifest_path else None)
+        if self.manifest is not None:
+            self.steps.insert(2, ("diff", manifest_step))
     
     def run(self, sources: List[str], **kwargs) -> Dict[str, Any]:
         """Run the complete pipeline."""
@@ -36,6 +61,10 @@ class OMNIMINDPipeline:
                 "sources": sources,
                 **kwargs
             }
+            if self.manifest is not None:
+                pipeline_data["manifest"] = self.manifest
+            if isinstance(pipeline_data.get("artifact_cache"), str):
+                pipeline_data["artifact_cache"] = ArtifactCache(pipeline_data["artifact_cache"])
             
             # Execute each step
             for step_name, step_function in self.steps:
@@ -85,6 +114,240 @@ class OMNIMINDPipeline:
                 "execution_history": self.execution_history
             }
     
+    def run_streaming(self, sources: List[str], batch_size: int = 8,
+                      queue_size: int = 4, checkpoint_id: str = None,
+                      checkpoint_dir: str = "data/checkpoints",
+                      progress_callback: Callable[[str, Dict[str, Any]], None] = None,
+                      cancel_event: threading.Event = None, **kwargs) -> Dict[str, Any]:
+        """Run the pipeline as overlapping stages over micro-batches.
+        
+        Each step runs in its own worker thread and consumes a bounded queue
+        of micro-batches, so fetching, chunking, embedding and storing
+        overlap. A full queue blocks the upstream stage, which keeps memory
+        flat: at most ``queue_size`` batches wait between any two stages, and
+        no stage output is retained once the next stage has consumed it.
+        
+        With ``checkpoint_id`` every stage commits the batches it finishes to
+        a PipelineCheckpoint. Batches already stored are skipped, and batches
+        embedded but not stored go straight to the store stage with their
+        saved embeddings, so rerunning the same job resumes where it stopped.
+        
+        ``progress_callback(stage, metrics)`` is called from the stage's
+        worker after every batch. Setting ``cancel_event`` stops feeding new
+        batches; in-flight batches are dropped and the run reports
+        ``cancelled``.
+        """
+        try:
+            logger.info(f"Starting streaming OMNIMIND pipeline ({len(sources)} sources)")
+            started = time.time()
+            
+            params = dict(kwargs)
+            if self.manifest is not None:
+                params["manifest"] = self.manifest
+            if isinstance(params.get("artifact_cache"), str):
+                params["artifact_cache"] = ArtifactCache(params["artifact_cache"])
+            if "vectordb" not in params or "kg" not in params:
+                from vectordb.vectordb import VectorDB
+                from kg.kg_manager import KnowledgeGraphManager
+                params.setdefault("vectordb", VectorDB(backend=params.get("backend", "simple")))
+                params.setdefault("kg", KnowledgeGraphManager(use_neo4j=params.get("use_neo4j", False)))
+            
+            checkpoint = None
+            if checkpoint_id:
+                checkpoint = PipelineCheckpoint(checkpoint_id, checkpoint_dir)
+                if checkpoint.config is None:
+                    checkpoint.save_config(sources, batch_size, kwargs)
+                else:
+                    checkpoint.mark("running")
+            
+            queues = [queue.Queue(maxsize=queue_size) for _ in self.steps]
+            metrics = {
+                name: {"batches": 0, "items_in": 0, "items_out": 0, "items_skipped": 0,
+                       "busy_seconds": 0.0, "max_queue_depth": 0, "throughput_per_sec": 0.0}
+                for name, _ in self.steps
+            }
+            errors = []
+            
+            workers = []
+            for i, (step_name, step_function) in enumerate(self.steps):
+                outbox = queues[i + 1] if i + 1 < len(queues) else None
+                worker = threading.Thread(
+                    target=self._stage_worker,
+                    args=(step_name, step_function, queues[i], outbox, params,
+                          metrics[step_name], errors, checkpoint,
+                          progress_callback, cancel_event),
+                    name=f"omnimind-{step_name}",
+                    daemon=True
+                )
+                worker.start()
+                workers.append(worker)
+            
+            # Feed source micro-batches; blocks when the ingest queue is full
+            store_queue = queues[[name for name, _ in self.steps].index("store")]
+            resumed_batches = 0
+            for index, offset in enumerate(range(0, len(sources), batch_size)):
+                if errors or (cancel_event is not None and cancel_event.is_set()):
+                    break
+                payload = {"sources": sources[offset:offset + batch_size]}
+                if checkpoint is not None:
+                    batch_id = checkpoint.batch_id(index, payload["sources"])
+                    if checkpoint.is_committed("store", batch_id):
+                        resumed_batches += 1
+                        continue
+                    payload["batch_id"] = batch_id
+                    partial = (checkpoint.load_partial(batch_id)
+                               if checkpoint.is_committed("embed", batch_id) else None)
+                    if partial is not None:
+                        # Enqueued before the end marker reaches the store stage
+                        resumed_batches += 1
+                        store_queue.put({**payload, **partial})
+                        continue
+                queues[0].put(payload)
+            queues[0].put(_END_OF_STREAM)
+            
+            for worker in workers:
+                worker.join()
+            
+            elapsed = time.time() - started
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            for step_name, stage in metrics.items():
+                self.execution_history.append({
+                    "step": step_name,
+                    "streaming": True,
+                    "batches": stage["batches"],
+                    "items_in": stage["items_in"],
+                    "items_out": stage["items_out"],
+                    "success": not any(name == step_name for name, _ in errors)
+                })
+            
+            final_data = {
+                "sources": sources,
+                "total_sources": len(sources),
+                "successful_ingestions": metrics["ingest"]["items_out"],
+                "skipped_sources": metrics["ingest"]["items_skipped"],
+                "failed_ingestions": (metrics["ingest"]["items_in"] - metrics["ingest"]["items_out"]
+                                      - metrics["ingest"]["items_skipped"]),
+                "total_chunks": metrics["chunk"]["items_out"],
+                "embedded_count": metrics["embed"]["items_out"],
+                "stored_count": metrics["store"]["items_out"]
+            }
+            if cancelled and not errors:
+                errors.append(("pipeline", "cancelled"))
+            final_data["cancelled"] = cancelled
+            if checkpoint is not None:
+                checkpoint.mark("cancelled" if cancelled else "failed" if errors else "completed")
+                final_data["checkpoint_id"] = checkpoint_id
+                final_data["resumed_batches"] = resumed_batches
+                final_data["store_offset"] = checkpoint.state["store_offset"]
+            if errors:
+                final_data["error"] = "; ".join(f"{name}: {error}" for name, error in errors)
+                logger.error(f"Streaming pipeline failed: {final_data['error']}")
+            else:
+                logger.info(f"Streaming pipeline completed in {elapsed:.2f}s")
+            
+            return {
+                "pipeline_success": not errors,
+                "steps_executed": len(self.steps),
+                "final_data": final_data,
+                "stage_metrics": metrics,
+                "elapsed_seconds": elapsed,
+                "execution_history": self.execution_history
+            }
+            
+        except Exception as e:
+            logger.error(f"Streaming pipeline execution failed: {e}")
+            return {
+                "pipeline_success": False,
+                "error": str(e),
+                "steps_executed": len(self.execution_history),
+                "execution_history": self.execution_history
+            }
+    
+    def _stage_worker(self, step_name: str, step_function, inbox: queue.Queue,
+                      outbox: queue.Queue, params: Dict[str, Any],
+                      stage_metrics: Dict[str, Any], errors: List,
+                      checkpoint: PipelineCheckpoint = None,
+                      progress_callback: Callable[[str, Dict[str, Any]], None] = None,
+                      cancel_event: threading.Event = None) -> None:
+        """Consume micro-batches for one stage until the stream ends."""
+        input_key, output_key = self.STREAM_KEYS[step_name]
+        
+        while True:
+            payload = inbox.get()
+            if payload is _END_OF_STREAM:
+                if outbox is not None:
+                    outbox.put(_END_OF_STREAM)
+                return
+            
+            # After a failure or cancellation keep draining so upstream
+            # stages never block
+            if errors or (cancel_event is not None and cancel_event.is_set()):
+                continue
+            
+            # Empty batches only matter in incremental mode, where the store
+            # stage still has manifest updates and deletes to apply
+            batch = payload.get(input_key) or []
+            if not batch and "manifest" not in params:
+                continue
+            
+            stage_metrics["max_queue_depth"] = max(stage_metrics["max_queue_depth"], inbox.qsize() + 1)
+            batch_started = time.time()
+            try:
+                step_result = step_function({**params, **payload})
+            except Exception as e:
+                step_result = {"error": str(e)}
+            stage_metrics["busy_seconds"] += time.time() - batch_started
+            stage_metrics["batches"] += 1
+            stage_metrics["items_in"] += len(batch)
+            if stage_metrics["busy_seconds"] > 0:
+                stage_metrics["throughput_per_sec"] = stage_metrics["items_in"] / stage_metrics["busy_seconds"]
+            
+            if "error" in step_result:
+                logger.error(f"Step {step_name} failed: {step_result['error']}")
+                errors.append((step_name, step_result["error"]))
+                continue
+            
+            output = step_result.get(output_key, [])
+            produced = output if isinstance(output, int) else len(output)
+            stage_metrics["items_out"] += produced
+            stage_metrics["items_skipped"] += len(step_result.get("skipped_sources", []))
+            
+            batch_id = payload.get("batch_id")
+            if checkpoint is not None and batch_id:
+                if step_name == "embed":
+                    checkpoint.save_partial(batch_id, {**payload, **step_result})
+                checkpoint.commit(step_name, batch_id, items=produced)
+                if step_name == "store":
+                    checkpoint.drop_partial(batch_id)
+            
+            if progress_callback is not None:
+                progress_callback(step_name, dict(stage_metrics))
+            
+            if outbox is not None:
+                # Later stages may need earlier outputs of the same batch
+                # (e.g. the manifest diff needs the batch's documents)
+                outbox.put({**payload, **step_result})
+    
+    def resume(self, job_id: str, checkpoint_dir: str = "data/checkpoints",
+               **kwargs) -> Dict[str, Any]:
+        """Resume a checkpointed streaming job from its last committed batch.
+        
+        Sources, batch size and JSON-serializable parameters come from the
+        checkpoint; live objects such as ``vectordb`` and ``kg`` are not
+        persisted and should be passed again in ``kwargs``.
+        """
+        if not PipelineCheckpoint.exists(job_id, checkpoint_dir):
+            logger.error(f"No checkpoint found for job {job_id}")
+            return {"pipeline_success": False, "error": f"No checkpoint found for job {job_id}"}
+        
+        config = PipelineCheckpoint(job_id, checkpoint_dir).config
+        logger.info(f"Resuming job {job_id}")
+        params = {**config["params"], **kwargs}
+        return self.run_streaming(
+            config["sources"], batch_size=config["batch_size"],
+            checkpoint_id=job_id, checkpoint_dir=checkpoint_dir, **params
+        )
+    
     def get_execution_history(self) -> List[Dict[str, Any]]:
         """Get pipeline execution history."""
         return self.execution_history.copy()
@@ -96,7 +359,20 @@ class OMNIMINDPipeline:
 
 
 # Convenience function for running the pipeline
-def run_pipeline(sources: List[str], **kwargs) -> Dict[str, Any]:
-    """Run the OMNIMIND pipeline with given sources."""
-    pipeline = OMNIMINDPipeline()
-    return pipeline.run(sources, **kwargs) 
\ No newline at end of file
+def run_pipeline(sources: List[str], streaming: bool = False,
+                 manifest_path: str = None, **kwargs) -> Dict[str, Any]:
+    """Run the OMNIMIND pipeline with given sources.
+    
+    Checkpointing is only available in streaming mode, so passing
+    ``checkpoint_id`` implies ``streaming=True``.
+    """
+    pipeline = OMNIMINDPipeline(manifest_path=manifest_path)
+    if streaming or kwargs.get("checkpoint_id"):
+        return pipeline.run_streaming(sources, **kwargs)
+    return pipeline.run(sources, **kwargs)
+
+
+def resume_pipeline(job_id: str, manifest_path: str = None, **kwargs) -> Dict[str, Any]:
+    """Resume a checkpointed streaming OMNIMIND pipeline job."""
+    pipeline = OMNIMINDPipeline(manifest_path=manifest_path)
+    return pipeline.resume(job_id, **kwargs)
@@ -6,6 +6,7 @@ Handles information retrieval pipeline using ZenML.
 
 from typing import List, Dict, Any
 import logging
+from .dag_executor import DAGExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -13,18 +14,30 @@ logger = logging.getLogger(__name__)
 class RetrievalPipeline:
     """Information retrieval pipeline for OMNIMIND."""
     
-    def __init__(self, pipeline_name: str = "omnimind_retrieval"):
+    def __init__(self, pipeline_name: str = "omnimind_retrieval", max_workers: int = 4,
+                 executor_type: str = "thread"):
         self.pipeline_name = pipeline_name
         self.steps = []
         self.execution_history = []
+        self.executor = DAGExecutor(max_workers=max_workers, executor_type=executor_type)
     
     def add_step(self, step_name: str, step_function, 
-                 dependencies: List[str] = None):
-        """Add a step to the pipeline."""
+                 dependencies: List[str] = None, timeout: float = None):
+        """Add a step to the pipeline.
+        
+        Without ``dependencies`` the step depends on the previously added
+        one, so steps run in order and see all earlier outputs; pass
+        ``dependencies=[]`` (or an explicit list) to let steps without a
+        dependency path between them run concurrently. ``timeout``
+        (seconds) bounds how long the pipeline waits for the step.
+        """
+        if dependencies is None:
+            dependencies = [self.steps[-1]["name"]] if self.steps else []
         step = {
             "name": step_name,
             "function": step_function,
-            "dependencies": dependencies or [],
+            "dependencies": list(dependencies),
+            "timeout": timeout,
             "status": "pending"
         }
         self.steps.append(step)
@@ -32,6 +45,13 @@ class RetrievalPipeline:
     
     def execute(self, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute the retrieval pipeline."""
+        execution_record = {
+            "execution_id": f"exec_{len(self.execution_history) + 1}",
+            "pipeline_name": self.pipeline_name,
+            "steps": [],
+            "status": "running"
+        }
+        
         try:
             logger.info(f"Starting retrieval pipeline: {self.pipeline_name}")
             
@@ -40,17 +60,24 @@ class RetrievalPipeline:
                 "context": context or {}
             }
             
-            # Execute pipeline steps
-            current_data = input_data.copy()
+            # Execute pipeline steps in dependency order
+            current_data, step_records = self.executor.run(
+                self.steps, input_data, self._execute_step
+            )
             
-            for step in self.steps:
-                step_result = self._execute_step(step, current_data)
-                current_data.update(step_result.get("output", {}))
+            execution_record["steps"] = step_records
+            execution_record["status"] = (
+                "completed" if all(r["status"] == "completed" for r in step_records) else "failed"
+            )
+            self.execution_history.append(execution_record)
             
             return current_data
             
         except Exception as e:
             logger.error(f"Retrieval pipeline failed: {e}")
+            execution_record["status"] = "failed"
+            execution_record["error"] = str(e)
+            self.execution_history.append(execution_record)
             return {"error": str(e)}
     
     def _execute_step(self, step: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
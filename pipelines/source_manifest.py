@@ -0,0 +1,103 @@
+"""
+Source Manifest for OMNIMIND
+
+Tracks what each ingestion source produced last time so re-ingestion can
+skip unchanged sources and diff changed ones down to upserts and deletes.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SourceManifest:
+    """Persistent ingestion manifest keyed by source (URL or file path).
+
+    Each record holds the source's content hash, its HTTP validators (ETag,
+    Last-Modified) or file stat (mtime, size), and the content hashes of the
+    chunks it produced.
+    """
+
+    def __init__(self, path: str = "data/ingest_manifest.json"):
+        self.path = path
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """Load the manifest from disk if it exists."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                self.sources = json.load(f).get("sources", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ingest manifest {self.path}: {e}")
+            self.sources = {}
+
+    def save(self):
+        """Atomically write the manifest to disk."""
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"sources": self.sources}, f)
+            os.replace(tmp_path, self.path)
+
+    def get(self, source: str) -> Optional[Dict[str, Any]]:
+        """Get the manifest record for a source."""
+        return self.sources.get(source)
+
+    def is_unchanged_file(self, source: str, size: int, mtime: float) -> bool:
+        """Check whether a local file still matches its recorded stat."""
+        record = self.sources.get(source)
+        return bool(record) and record.get("size") == size and record.get("mtime") == mtime
+
+    def conditional_headers(self, source: str) -> Dict[str, str]:
+        """HTTP validators to send when re-fetching a URL source."""
+        record = self.sources.get(source) or {}
+        headers = {}
+        if record.get("etag"):
+            headers["If-None-Match"] = record["etag"]
+        if record.get("last_modified"):
+            headers["If-Modified-Since"] = record["last_modified"]
+        return headers
+
+    def chunk_hashes(self, source: str) -> List[str]:
+        """Content hashes of the chunks a source produced last time."""
+        return list((self.sources.get(source) or {}).get("chunk_hashes", []))
+
+    def commit(self, updates: Dict[str, Dict[str, Any]]):
+        """Merge per-source updates into the manifest (in memory)."""
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            for source, update in updates.items():
+                record = dict(self.sources.get(source, {}))
+                record.update(update)
+                record["updated_at"] = now
+                self.sources[source] = record
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """Hash of a source's extracted content."""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def source_metadata(document: Dict[str, Any]) -> Dict[str, Any]:
+        """Validators and stat fields worth recording for a loaded document."""
+        metadata = {
+            key: document[key]
+            for key in ("content_hash", "etag", "last_modified", "mtime")
+            if document.get(key) is not None
+        }
+        if "size_bytes" in document:
+            metadata["size"] = document["size_bytes"]
+        return metadata
@@ -4,6 +4,7 @@ Storage Pipeline Step for OMNIMIND
 Handles storing embeddings in vector database and knowledge graph.
 """
 
+from contextlib import nullcontext
 from typing import List, Dict, Any
 import logging
 from vectordb.vectordb import VectorDB
@@ -16,7 +17,8 @@ def store_step(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """Store embedded chunks in vector database and knowledge graph."""
     try:
         embedded_chunks = input_data.get("embedded_chunks", [])
-        if not embedded_chunks:
+        manifest = input_data.get("manifest")
+        if not embedded_chunks and manifest is None:
             logger.warning("No embedded chunks provided for storage")
             return {"stored_count": 0, "error": "No embedded chunks provided"}
         
@@ -25,17 +27,27 @@ def store_step(input_data: Dict[str, Any]) -> Dict[str, Any]:
         backend = input_data.get("backend", "simple")
         use_neo4j = input_data.get("use_neo4j", False)
         
-        # Initialize vector database
-        vectordb = VectorDB(backend=backend)
-        
-        # Initialize knowledge graph
-        kg = KnowledgeGraphManager(use_neo4j=use_neo4j)
-        
-        # Store in vector database
-        vector_success = vectordb.add_vectors(collection_name, embedded_chunks)
+        # Reuse stores passed in by the caller (e.g. across streaming batches)
+        vectordb = input_data.get("vectordb") or VectorDB(backend=backend)
+        kg = input_data.get("kg") or KnowledgeGraphManager(use_neo4j=use_neo4j)
         
-        # Store in knowledge graph
-        kg_success = _store_in_kg(kg, embedded_chunks)
+        # Concurrent jobs sharing these stores pass one store_lock so their writes never interleave
+        with input_data.get("store_lock") or nullcontext():
+            # Store in vector database
+            vector_success = vectordb.add_vectors(collection_name, embedded_chunks) if embedded_chunks else True
+            
+            # Store in knowledge graph
+            kg_success = _store_in_kg(kg, embedded_chunks)
+            
+            # Drop chunks that disappeared from changed sources, then record
+            # what each source now produces so the next run can skip it
+            deleted_count = 0
+            if manifest is not None:
+                for source, content_hashes in input_data.get("stale_chunks", {}).items():
+                    deleted_count += vectordb.delete_vectors(collection_name, source, content_hashes)
+                if vector_success:
+                    manifest.commit(input_data.get("manifest_updates", {}))
+                    manifest.save()
         
         # Get statistics
         vector_stats = vectordb.get_collection_stats(collection_name)
@@ -48,6 +60,7 @@ def store_step(input_data: Dict[str, Any]) -> Dict[str, Any]:
         
         return {
             "stored_count": len(embedded_chunks),
+            "deleted_count": deleted_count,
             "vector_success": vector_success,
             "kg_success": kg_success,
             "vector_stats": vector_stats,
@@ -63,42 +76,51 @@ def store_step(input_data: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _store_in_kg(kg: KnowledgeGraphManager, embedded_chunks: List[Dict[str, Any]]) -> bool:
-    """Store chunks in knowledge graph."""
+    """Store chunks in knowledge graph as one columnar batch.
+    
+    Each document entity is written once per batch, however many of its
+    chunks the batch holds. Chunk ids are only unique within a document
+    (``chunk_0``, ...), so chunk entities are keyed ``<document_id>:<chunk_id>``.
+    """
     try:
+        if not embedded_chunks:
+            return True
+        
+        documents: Dict[str, Dict[str, Any]] = {}
+        chunk_ids, chunk_properties, edge_sources, edge_properties = [], [], [], []
         for chunk in embedded_chunks:
-            # Add document entity
             doc_id = chunk.get("document_id", "unknown")
-            kg.add_entity(
-                entity_id=doc_id,
-                entity_type="document",
-                properties={
+            if doc_id not in documents:
+                documents[doc_id] = {
                     "title": chunk.get("document_title", ""),
                     "source": chunk.get("source", ""),
                     "content_type": chunk.get("document_type", "")
                 }
-            )
             
-            # Add chunk entity
             chunk_id = chunk.get("chunk_id", "unknown")
-            kg.add_entity(
-                entity_id=chunk_id,
-                entity_type="chunk",
-                properties={
-                    "text": chunk.get("text", "")[:100] + "...",  # Truncate for storage
-                    "size": chunk.get("size", 0),
-                    "embedding_model": chunk.get("embedding_model", "")
-                }
-            )
-            
-            # Add relationship between document and chunk
-            kg.add_relationship(
-                source_id=doc_id,
-                target_id=chunk_id,
-                relationship_type="contains",
-                properties={"chunk_index": chunk.get("chunk_id", "")}
-            )
+            chunk_ids.append(f"{doc_id}:{chunk_id}")
+            chunk_properties.append({
+                "text": chunk.get("text", "")[:100] + "...",  # Truncate for storage
+                "size": chunk.get("size", 0),
+                "embedding_model": chunk.get("embedding_model", "")
+            })
+            edge_sources.append(doc_id)
+            edge_properties.append({"chunk_index": chunk_id})
         
+        kg.add_batch(
+            entities={
+                "id": list(documents) + chunk_ids,
+                "type": ["document"] * len(documents) + ["chunk"] * len(chunk_ids),
+                "properties": list(documents.values()) + chunk_properties
+            },
+            relationships={
+                "source": edge_sources,
+                "target": chunk_ids,
+                "type": ["contains"] * len(chunk_ids),
+                "properties": edge_properties
+            }
+        )
         return True
     except Exception as e:
         logger.error(f"Error storing in knowledge graph: {e}")
-        return False 
\ No newline at end of file
+        return False
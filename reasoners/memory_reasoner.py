@@ -14,10 +14,14 @@ class MemoryReasoner:
     def __init__(self,
                  episodic_manager: Optional[EpisodicManager] = None,
                  semantic_manager: Optional[SemanticManager] = None,
-                 procedural_manager: Optional[ProceduralManager] = None):
+                 procedural_manager: Optional[ProceduralManager] = None,
+                 centrality=None, centrality_weight: float = 0.1):
         self.episodic_manager = episodic_manager or EpisodicManager()
         self.semantic_manager = semantic_manager or SemanticManager()
         self.procedural_manager = procedural_manager or ProceduralManager()
+        # Optional kg.centrality.CentralityIndex used to re-rank semantic hits
+        self.centrality = centrality
+        self.centrality_weight = centrality_weight
 
     def search_memory(self, query: str, query_embedding: Optional[List[float]] = None, top_k: int = 5) -> Dict[str, List[Dict[str, Any]]]:
         """Search all memory stores for relevant information.
@@ -53,8 +57,18 @@ class MemoryReasoner:
         """
         ranked = []
         
-        # Prioritize semantic results
-        for item in results.get("semantic", []):
+        # Prioritize semantic results, boosted by graph centrality when available
+        semantic = results.get("semantic", [])
+        if self.centrality is not None and semantic:
+            scores = self.centrality.scores(item.get("document_id") or item.get("id") for item in semantic)
+            for item in semantic:
+                item["_centrality"] = scores.get(item.get("document_id") or item.get("id"), 0.0)
+            semantic = sorted(
+                semantic,
+                key=lambda item: item.get("similarity", 0.0) + self.centrality_weight * item["_centrality"],
+                reverse=True
+            )
+        for item in semantic:
             item["_memory_type"] = "semantic"
             ranked.append(item)
             
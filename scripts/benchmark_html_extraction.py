@@ -0,0 +1,121 @@
+"""
+Benchmark HTML-to-text extraction for OMNIMIND.
+
+Compares the BeautifulSoup tree path BasicLoader used to take with the
+event-based extractor (stdlib and lxml backends) on a corpus of saved pages:
+
+    python scripts/benchmark_html_extraction.py --corpus path/to/pages
+
+Without --corpus a synthetic corpus of article-like pages is generated.
+"""
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawlers.html_extractor import extract_text, LXML_AVAILABLE
+
+
+def load_corpus(directory: str) -> List[bytes]:
+    """Read every .html/.htm file under a directory."""
+    pages = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.lower().endswith((".html", ".htm")):
+                with open(os.path.join(root, name), "rb") as f:
+                    pages.append(f.read())
+    return pages
+
+
+def synthetic_corpus(count: int = 200, paragraphs: int = 60) -> List[bytes]:
+    """Article-like pages with navigation, scripts, inline styles and a footer."""
+    pages = []
+    for i in range(count):
+        body = "".join(
+            f"<p>Paragraph {j} of page {i} discusses <a href='/p/{j}'>topic {j}</a> "
+            f"with <b>bold</b> and <em>emphasis</em> &amp; entities.</p>"
+            for j in range(paragraphs)
+        )
+        pages.append((
+            "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Page {i}</title>"
+            "<style>body {{ font-family: sans-serif; }}</style>"
+            "<script>window.analytics = {{ id: {i} }};</script></head><body>"
+            "<nav><ul>" + "".join(f"<li><a href='/s/{k}'>Section {k}</a></li>" for k in range(20)) +
+            "</ul></nav><main><h1>Article {i}</h1>" + body + "</main>"
+            "<aside>Related links</aside><footer>Copyright OMNIMIND</footer></body></html>"
+        ).format(i=i).encode("utf-8"))
+    return pages
+
+
+def bs4_extract(page: bytes) -> str:
+    """The previous BasicLoader path: full tree, decompose script/style."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(page, "html.parser")
+    for script in soup(["script", "style"]):
+        script.decompose()
+    return soup.get_text(separator=" ", strip=True)
+
+
+def run(name: str, extract: Callable[[bytes], str], pages: List[bytes], repeat: int) -> Dict[str, float]:
+    """Time an extractor over the corpus; best of ``repeat`` runs."""
+    total_bytes = sum(len(p) for p in pages)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            extract(page)
+        best = min(best, time.perf_counter() - start)
+    return {"name": name, "seconds": best, "mb_per_sec": total_bytes / best / 1e6}
+
+
+def overlap(reference: str, candidate: str) -> float:
+    """Share of the reference's distinct words present in the candidate."""
+    words = set(reference.split())
+    return len(words & set(candidate.split())) / len(words) if words else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML text extraction")
+    parser.add_argument("--corpus", help="Directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not pages:
+        print(f"No .html pages found under {args.corpus}")
+        return
+    print(f"{len(pages)} pages, {sum(len(p) for p in pages) / 1e6:.1f} MB")
+
+    candidates = [("stdlib", lambda p: extract_text(p, backend="stdlib"))]
+    if LXML_AVAILABLE:
+        candidates.append(("lxml", lambda p: extract_text(p, backend="lxml")))
+    # Same drop set as the old path, to compare parsing cost alone
+    candidates.append(("stdlib (script/style only)",
+                       lambda p: extract_text(p, drop_tags={"script", "style"}, backend="stdlib")))
+
+    try:
+        results = [run("bs4 html.parser", bs4_extract, pages, args.repeat)]
+    except ImportError:
+        print("beautifulsoup4 not installed; skipping the baseline")
+        results = []
+    results += [run(name, extract, pages, args.repeat) for name, extract in candidates]
+
+    baseline = results[0]["seconds"] if results and results[0]["name"].startswith("bs4") else None
+    for result in results:
+        speedup = f"  x{baseline / result['seconds']:.1f}" if baseline else ""
+        print(f"{result['name']:<28} {result['seconds']:8.3f}s  {result['mb_per_sec']:7.2f} MB/s{speedup}")
+
+    if baseline:
+        sample = pages[:50]
+        reference = [bs4_extract(p) for p in sample]
+        for name, extract in candidates:
+            score = sum(overlap(r, extract(p)) for r, p in zip(reference, sample)) / len(sample)
+            print(f"{name:<28} word overlap with bs4: {score:.1%}")
+
+
+if __name__ == "__main__":
+    main()
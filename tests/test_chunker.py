@@ -0,0 +1,65 @@
+"""
+Tests for SmartChunker chunking strategies.
+"""
+
+import pytest
+from chunker.chunker import SmartChunker
+
+
+def _make_document(n_sentences: int, prefix: str = "Paragraph") -> str:
+    return " ".join(
+        f"{prefix} sentence number {i} describes a distinct fact about topic {i * 7 % 13}."
+        for i in range(n_sentences)
+    )
+
+
+def test_content_defined_chunks_respect_size_limits():
+    chunker = SmartChunker(chunk_size=400, strategy="content")
+    chunks = chunker.chunk_text(_make_document(80))
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(chunk["text"]) <= 400
+        assert chunk["chunk_id"] == f"chunk_{chunk['content_hash'][:16]}"
+        assert chunk["size"] == len(chunk["text"])
+
+
+def test_content_defined_chunks_survive_prefix_insertion():
+    chunker = SmartChunker(chunk_size=400, strategy="content")
+    original = _make_document(120)
+    revised = "A brand new introductory sentence was inserted at the top. " + original
+
+    original_hashes = [c["content_hash"] for c in chunker.chunk_text(original)]
+    revised_hashes = [c["content_hash"] for c in chunker.chunk_text(revised)]
+
+    # Only the chunks around the edit should change
+    shared = set(original_hashes) & set(revised_hashes)
+    assert len(shared) >= 0.8 * len(original_hashes)
+    assert original_hashes[-1] == revised_hashes[-1]
+
+
+def test_sentence_strategy_chunks_carry_content_hash():
+    chunker = SmartChunker(chunk_size=200, overlap=50)
+    chunks = chunker.chunk_text(_make_document(10))
+
+    assert chunks
+    assert all(len(c["content_hash"]) == 64 for c in chunks)
+
+
+def test_unknown_strategy_rejected():
+    with pytest.raises(ValueError):
+        SmartChunker(strategy="fixed")
+
+
+def test_parallel_chunk_documents_matches_serial():
+    chunker = SmartChunker(chunk_size=300, overlap=50)
+    documents = [
+        {"id": f"doc_{i}", "title": f"Doc {i}", "content": _make_document(5 + i % 9, prefix=f"Doc{i}")}
+        for i in range(24)
+    ]
+
+    serial = chunker.chunk_documents(documents)
+    parallel = chunker.chunk_documents(documents, max_workers=4, batch_chars=1500)
+
+    assert parallel == serial
+    assert [c["document_id"] for c in parallel] == [c["document_id"] for c in serial]
@@ -0,0 +1,485 @@
+"""
+Tests for OMNIMIND crawlers against a local HTTP server.
+"""
+
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves /slow/<n>, /flaky/<n>, /html, /etag, /dated and /missing."""
+
+    flaky_hits = {}
+    full_responses = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self._reply(200, "<html><p>Cached page</p></html>", "text/html", {"ETag": '"v1"'})
+        elif self.path == "/dated":
+            if self.headers.get("If-Modified-Since") == "Mon, 05 Oct 2026 10:00:00 GMT":
+                self.send_response(304)
+                self.end_headers()
+                return
+            self._reply(200, "dated body", "text/plain",
+                        {"Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"})
+        elif self.path.startswith("/slow/"):
+            time.sleep(0.2)
+            self._reply(200, f"page {self.path.rsplit('/', 1)[1]}", "text/plain")
+        elif self.path.startswith("/flaky/"):
+            with self.lock:
+                hits = self.flaky_hits[self.path] = self.flaky_hits.get(self.path, 0) + 1
+            if hits == 1:
+                self._reply(503, "busy", "text/plain")
+            else:
+                self._reply(200, "recovered", "text/plain")
+        elif self.path == "/html":
+            self._reply(200, "<html><script>x()</script><p>Hello <b>world</b></p></html>", "text/html")
+        else:
+            self._reply(404, "not found", "text/plain")
+
+    def _reply(self, status, body, content_type, headers=None):
+        data = body.encode("utf-8")
+        with self.lock:
+            _Handler.full_responses += 1
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    _Handler.flaky_hits = {}
+    _Handler.full_responses = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_load_multiple_fetches_urls_concurrently(http_server, tmp_path):
+    from crawlers.basic_loader import BasicLoader
+
+    local = tmp_path / "local.txt"
+    local.write_text("local text")
+    urls = [f"{http_server}/slow/{i}" for i in range(20)]
+    sources = urls[:10] + [str(local)] + urls[10:]
+
+    started = time.time()
+    results = BasicLoader(max_per_host=20).load_multiple(sources)
+    elapsed = time.time() - started
+
+    # 20 requests of 0.2s each take ~4s one after another
+    assert elapsed < 2.0
+    assert [r["source"] for r in results] == sources
+    assert all(r["success"] for r in results)
+    assert results[10]["content"] == "local text"
+    assert results[11]["content"] == "page 10"
+
+
+def test_load_multiple_retries_and_reports_failures(http_server):
+    from crawlers.basic_loader import BasicLoader
+
+    loader = BasicLoader(max_retries=2)
+    results = loader.load_multiple([
+        f"{http_server}/flaky/a", f"{http_server}/missing", f"{http_server}/html"
+    ])
+
+    assert results[0]["success"] and results[0]["content"] == "recovered"
+    assert not results[1]["success"] and "404" in results[1]["error"]
+    assert results[2]["content"] == "Hello world"
+    assert results[2]["content_type"].startswith("text/html")
+
+
+def test_async_fetcher_respects_per_host_limit(http_server):
+    from crawlers.async_fetcher import AsyncFetcher
+
+    fetcher = AsyncFetcher(max_per_host=2)
+    started = time.time()
+    results = fetcher.fetch_many([f"{http_server}/slow/{i}" for i in range(6)])
+    elapsed = time.time() - started
+
+    assert [r["response"].text for r in results] == [f"page {i}" for i in range(6)]
+    assert elapsed >= 0.55
+
+
+def test_async_fetcher_busy_host_does_not_starve_others(http_server):
+    from crawlers.async_fetcher import AsyncFetcher
+
+    fetcher = AsyncFetcher(max_connections=2, max_per_host=1)
+    heavy = [f"{http_server}/slow/{i}" for i in range(6)]
+    light = http_server.replace("127.0.0.1", "localhost") + "/slow/light"
+    finished = {}
+    fetch = fetcher.fetch
+
+    async def timed_fetch(client, url, headers=None):
+        result = await fetch(client, url, headers=headers)
+        finished[url] = time.time() - started
+        return result
+
+    fetcher.fetch = timed_fetch
+    started = time.time()
+    results = fetcher.fetch_many(heavy + [light])
+
+    assert all(r["error"] is None for r in results)
+    # The heavy host is served one request at a time; the light one gets the free slot at once
+    assert finished[heavy[-1]] >= 1.1
+    assert finished[light] < 0.6
+
+
+def test_crawl_cache_short_circuits_unchanged_pages(http_server, tmp_path, monkeypatch):
+    from crawlers.basic_loader import BasicLoader
+    from crawlers.crawl_cache import CrawlCache
+
+    cache = CrawlCache(str(tmp_path / "crawl.db"))
+    urls = [f"{http_server}/etag", f"{http_server}/dated"]
+    first = BasicLoader(crawl_cache=cache).load_multiple(urls)
+    assert [r["status_code"] for r in first] == [200, 200]
+    assert first[0]["content"] == "Cached page"
+    assert len(cache) == 2
+
+    # Revalidation must not extract anything
+    loader = BasicLoader(crawl_cache=CrawlCache(str(tmp_path / "crawl.db")))
+    monkeypatch.setattr(loader, "_extract_text_from_response",
+                        lambda response: pytest.fail("extracted an unchanged page"))
+    second = loader.load_multiple(urls)
+    assert [r["status_code"] for r in second] == [304, 304]
+    assert all(r["not_modified"] and r["from_cache"] for r in second)
+    assert [r["content"] for r in second] == [r["content"] for r in first]
+    assert second[0]["content_hash"] == first[0]["content_hash"]
+    assert loader.load_url(urls[0])["from_cache"]
+    assert _Handler.full_responses == 2
+
+
+def test_ingest_step_skips_not_modified_urls(http_server, tmp_path):
+    from pipelines.ingest_step import ingest_step
+    from pipelines.source_manifest import SourceManifest
+
+    manifest = SourceManifest(str(tmp_path / "manifest.json"))
+    params = {"sources": [f"{http_server}/etag"], "crawl_cache": str(tmp_path / "crawl.db"),
+              "manifest": manifest}
+    first = ingest_step(params)
+    assert first["successful_ingestions"] == 1
+
+    # Fetched but never stored: the 304 brings back the cached page to process
+    second = ingest_step(params)
+    assert second["skipped_sources"] == []
+    assert [doc["content"] for doc in second["documents"]] == ["Cached page"]
+    assert second["documents"][0]["from_cache"]
+    assert _Handler.full_responses == 1
+
+    # Once the store step has committed the source, the 304 skips it
+    manifest.commit({params["sources"][0]: SourceManifest.source_metadata(first["documents"][0])})
+    third = ingest_step(params)
+    assert third["documents"] == []
+    assert third["skipped_sources"] == params["sources"]
+    assert third["failed_ingestions"] == 0
+
+
+def test_ingest_step_keeps_not_modified_urls_without_a_manifest(http_server, tmp_path):
+    from pipelines.ingest_step import ingest_step
+
+    params = {"sources": [f"{http_server}/etag"], "crawl_cache": str(tmp_path / "crawl.db")}
+    ingest_step(params)
+
+    # Nothing confirms the page was stored, so the cached text goes downstream
+    second = ingest_step(params)
+    assert second["skipped_sources"] == []
+    assert [doc["content"] for doc in second["documents"]] == ["Cached page"]
+
+
+def test_extractors_stream_structured_files(tmp_path):
+    import json
+    import zipfile
+    from crawlers.extractors import CsvExtractor, JsonExtractor, DocxExtractor, get_extractor
+
+    csv_path = tmp_path / "rows.csv"
+    csv_path.write_text("name,value\n" + "".join(f"item{i},{i * 2}\n" for i in range(1000)))
+    segments = list(CsvExtractor(rows_per_segment=100).extract(str(csv_path)))
+    assert len(segments) == 10
+    assert segments[0].startswith("name: item0; value: 0\n")
+
+    records = [{"id": i, "meta": {"tags": ["a", "b"]}, "text": f"record {i}"} for i in range(50)]
+    json_path = tmp_path / "records.json"
+    json_path.write_text(json.dumps(records, indent=2))
+    text = "".join(JsonExtractor(records_per_segment=7, read_size=64).extract(str(json_path)))
+    assert text.count("meta.tags[1]: b") == 50
+    assert "text: record 49" in text
+
+    jsonl_path = tmp_path / "records.jsonl"
+    jsonl_path.write_text("\n".join(json.dumps(r) for r in records[:3]))
+    assert "".join(get_extractor(str(jsonl_path)).extract(str(jsonl_path))).count("id: ") == 3
+
+    docx_path = tmp_path / "doc.docx"
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t>Paragraph {i}</w:t></w:r></w:p>" for i in range(3))
+    with zipfile.ZipFile(docx_path, "w") as archive:
+        archive.writestr("word/document.xml", f'<w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>')
+    assert list(DocxExtractor().extract(str(docx_path))) == ["Paragraph 0\nParagraph 1\nParagraph 2\n"]
+
+
+def test_loaders_detect_encoding_and_stream_large_files(tmp_path):
+    from crawlers.basic_loader import BasicLoader
+    from crawlers.file_ingestor import FileIngestor
+
+    french = ("Le café était très animé ce matin-là. Les élèves répétaient leçons et poèmes, "
+              "pendant que le garçon préparait des crêpes à la crème.\n") * 5
+    latin = tmp_path / "latin.txt"
+    latin.write_bytes(french.encode("latin-1"))
+    assert BasicLoader().load_file(str(latin))["content"] == french
+    assert FileIngestor(base_path=str(tmp_path)).ingest_local_file(str(latin))["content"] == french
+
+    large = tmp_path / "large.txt"
+    line = "A sentence that is repeated to build a large file.\n"
+    large.write_text(line * (11 * 1024 * 1024 // len(line)))
+    result = BasicLoader().load_file(str(large))
+    assert result["success"] and result["streamed"] and result["content"] == ""
+    assert result["content_hash"] == hashlib.sha256(large.read_bytes()).hexdigest()
+
+
+def test_chunk_step_streams_files_over_the_size_cap(tmp_path):
+    from chunker.chunker import SmartChunker
+    from pipelines.ingest_step import ingest_step
+    from pipelines.chunk_step import chunk_step
+
+    text = "".join(f"Paragraph {i} describes a separate topic at some length. "
+                   f"It closes with sentence number {i}.\n" for i in range(400))
+    path = tmp_path / "big.txt"
+    path.write_text(text)
+
+    small = [tmp_path / "first.txt", tmp_path / "last.txt"]
+    for p in small:
+        p.write_text(f"The {p.stem} file holds one short sentence.\n")
+
+    sources = [str(small[0]), str(path), str(small[1])]
+    ingested = ingest_step({"sources": sources, "max_file_size": 1024})
+    assert [bool(d.get("streamed")) for d in ingested["documents"]] == [False, True, False]
+    chunked = chunk_step({**ingested, "chunk_size": 500, "chunking_strategy": "content"})
+    expected = SmartChunker(chunk_size=500, strategy="content").chunk_text(text)
+    big_chunks = [c for c in chunked["chunks"] if c["source"] == str(path)]
+    assert [c["text"] for c in big_chunks] == [c["text"] for c in expected]
+    # Chunks follow the order of the documents
+    assert [c["source"] for c in chunked["chunks"]] == (
+        [str(small[0])] + [str(path)] * len(expected) + [str(small[1])]
+    )
+
+
+def test_chunk_stream_consumes_segments_lazily(tmp_path):
+    from chunker.chunker import SmartChunker
+    from crawlers.file_ingestor import FileIngestor
+
+    consumed = []
+    def segments():
+        for i in range(200):
+            consumed.append(i)
+            yield f"Segment {i} explains one idea in a full sentence. It adds a second sentence too.\n"
+
+    chunker = SmartChunker(chunk_size=300, overlap=0)
+    stream = chunker.chunk_stream(segments())
+    first = next(stream)
+    assert len(consumed) < 50
+    chunks = [first] + list(stream)
+    assert [c["chunk_id"] for c in chunks] == [f"chunk_{i}" for i in range(len(chunks))]
+    assert all(c["size"] <= 300 for c in chunks if "size" in c)
+    joined = " ".join(c["text"] for c in chunks)
+    assert all(f"Segment {i} explains" in joined for i in range(200))
+
+    csv_path = tmp_path / "rows.csv"
+    csv_path.write_text("name,notes\n" + "".join(f"row{i},Row {i} has notes.\n" for i in range(500)))
+    file_chunks = list(FileIngestor(base_path=str(tmp_path)).chunk_file(str(csv_path), chunker))
+    assert file_chunks and all(c["document_type"] == "text/csv" for c in file_chunks)
+    assert "row499" in file_chunks[-1]["text"]
+
+
+def test_chunk_stream_content_boundaries_do_not_depend_on_segments():
+    from chunker.chunker import SmartChunker
+
+    chunker = SmartChunker(chunk_size=400, strategy="content")
+    text = "".join(f"Sentence {i} talks about item {i * 7} in plain words. " for i in range(600))
+
+    def segments(body, size):
+        return (body[i:i + size] for i in range(0, len(body), size))
+
+    whole = chunker.chunk_text(text)
+    for size in (37, 500, 4096):
+        streamed = list(chunker.chunk_stream(segments(text, size)))
+        assert [c["chunk_id"] for c in streamed] == [c["chunk_id"] for c in whole]
+        assert [c["start"] for c in streamed] == [c["start"] for c in whole]
+
+    # An edit near the start leaves the chunks after it untouched
+    edited = list(chunker.chunk_stream(segments("An extra opening sentence here. " + text, 300)))
+    kept = {c["chunk_id"] for c in edited}
+    assert sum(c["chunk_id"] in kept for c in whole) >= len(whole) - 2
+
+
+def test_directory_scanner_emits_only_changed_files(tmp_path):
+    import os
+    from crawlers.directory_scanner import DirectoryScanner
+
+    tree = tmp_path / "tree"
+    paths = []
+    for d in range(3):
+        (tree / f"dir{d}" / "nested").mkdir(parents=True)
+        for f in range(4):
+            path = tree / f"dir{d}" / ("nested" if f % 2 else "") / f"file{f}.txt"
+            path.write_text(f"contents of {d}/{f}")
+            paths.append(str(path))
+    (tree / "skip.bin").write_bytes(b"\x00")
+
+    scanner = DirectoryScanner(str(tmp_path / "scan.db"), max_workers=4, extensions=[".txt"])
+    first = list(scanner.scan(str(tree)))
+    assert sorted(e["path"] for e in first) == sorted(paths)
+    assert {e["status"] for e in first} == {"new"}
+    scanner.commit(first)
+    assert list(scanner.scan(str(tree))) == []
+
+    # One real edit, one touch with identical content, one deletion
+    with open(paths[0], "w") as f:
+        f.write("changed contents")
+    os.utime(paths[1], (1, 1))
+    os.remove(paths[2])
+
+    rescanner = DirectoryScanner(str(tmp_path / "scan.db"), extensions=[".txt"])
+    changed = list(rescanner.scan(str(tree)))
+    assert [(e["path"], e["status"]) for e in changed] == [(paths[0], "modified")]
+    assert rescanner.deleted == [paths[2]]
+    assert rescanner.get(paths[1])["mtime"] == 1
+    # Not committed yet, so it is emitted again
+    assert [e["path"] for e in rescanner.scan(str(tree))] == [paths[0]]
+
+
+def test_ingest_directory_skips_unchanged_files(tmp_path):
+    from crawlers.file_ingestor import FileIngestor
+
+    docs = tmp_path / "docs"
+    (docs / "sub").mkdir(parents=True)
+    (docs / "a.txt").write_text("alpha")
+    (docs / "sub" / "b.md").write_text("beta")
+    (docs / "c.xyz").write_text("ignored")
+
+    ingestor = FileIngestor(base_path=str(tmp_path / "base"))
+    assert sorted(r["content"] for r in ingestor.ingest_directory(str(docs))) == ["alpha", "beta"]
+
+    manifest = str(tmp_path / "scan.db")
+    assert len(ingestor.ingest_directory(str(docs), manifest_path=manifest)) == 2
+    assert ingestor.ingest_directory(str(docs), manifest_path=manifest) == []
+    (docs / "sub" / "b.md").write_text("beta, revised")
+    assert [r["content"] for r in ingestor.ingest_directory(str(docs), manifest_path=manifest)] == ["beta, revised"]
+
+
+def test_normalize_url_and_bloom_filter():
+    from crawlers.frontier import normalize_url, BloomFilter
+
+    assert normalize_url("HTTP://Example.COM:80/a/./b/../c?b=2&a=1#frag") == "http://example.com/a/c?a=1&b=2"
+    assert normalize_url("../x/", base="https://example.com/docs/page") == "https://example.com/x/"
+    assert normalize_url("https://example.com:8443") == "https://example.com:8443/"
+    assert normalize_url("mailto:someone@example.com") is None
+
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    assert all(bloom.add(f"url-{i}") for i in range(5000))
+    assert all(f"url-{i}" in bloom for i in range(5000))
+    assert not bloom.add("url-42")
+    false_positives = sum(f"other-{i}" in bloom for i in range(5000))
+    assert false_positives < 100
+    assert len(bloom.bits) < 20_000
+
+
+def test_frontier_crawl_respects_scope_depth_and_politeness():
+    import threading
+    from crawlers.web_crawler import WebCrawler
+
+    # a.test/ -> a.test/1, a.test/2, b.a.test/ and out.test/; a.test/1 -> a.test/1/deep
+    graph = {
+        "http://a.test/": ["/1", "/2", "http://b.a.test/", "http://out.test/", "/1#dup"],
+        "http://a.test/1": ["/1/deep"],
+        "http://a.test/2": ["/"],
+        "http://b.a.test/": ["http://b.a.test/x"],
+        "http://a.test/1/deep": ["/1/deeper"],
+    }
+    fetch_times = {}
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            fetch_times.setdefault(url.split("/")[2], []).append(time.time())
+        time.sleep(0.02)
+        return {"url": url, "links": graph.get(url, [])}
+
+    crawler = WebCrawler(allowed_domains=["a.test"], max_depth=2, max_workers=4,
+                         politeness_delay=0.1, fetch_page=fetch)
+    results = crawler.crawl(["http://a.test/"])
+
+    depths = {r["url"]: r["depth"] for r in results}
+    assert depths == {
+        "http://a.test/": 0, "http://a.test/1": 1, "http://a.test/2": 1,
+        "http://b.a.test/": 1, "http://a.test/1/deep": 2, "http://b.a.test/x": 2
+    }
+    for times in fetch_times.values():
+        assert all(later - earlier >= 0.095 for earlier, later in zip(times, times[1:]))
+    metrics = crawler.last_metrics
+    assert metrics["fetched"] == 6 and metrics["queued"] == 0 and metrics["in_flight"] == 0
+    assert metrics["max_queue_depth"] >= 2 and metrics["pages_per_sec"] > 0
+
+    limited = WebCrawler(allowed_domains=["a.test"], max_depth=2, politeness_delay=0, fetch_page=fetch)
+    assert len(limited.crawl(["http://a.test/"], max_pages=2)) == 2
+
+
+def test_crawl_urls_runs_concurrently(http_server):
+    import requests
+    from crawlers.web_crawler import WebCrawler
+
+    crawler = WebCrawler(max_workers=10, fetch_page=lambda url: {"url": url, "text": requests.get(url).text})
+    urls = [f"{http_server}/slow/{i}" for i in range(10)]
+    started = time.time()
+    results = crawler.crawl_urls(urls)
+    assert time.time() - started < 1.0
+    assert [r["text"] for r in results] == [f"page {i}" for i in range(10)]
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "lxml"])
+def test_html_extractor_streams_text_and_drops_boilerplate(backend):
+    if backend == "lxml":
+        pytest.importorskip("lxml")
+    from crawlers.html_extractor import HTMLTextExtractor, extract_text
+
+    html = ("<html><head><title>Title</title><style>p { color: red }</style></head><body>"
+            "<nav><a href='/'>Home</a></nav><p>Caf&eacute; <b>menu</b></p><!-- hidden -->"
+            "<script>var s = '<p>not text</p>';</script><svg><text>icon</text></svg>"
+            "<p>Last paragraph</p><footer>Copyright</footer></body></html>")
+    assert extract_text(html, backend=backend) == "Title Café menu Last paragraph"
+
+    # Text nodes split across chunks come out whole, and pieces arrive before close()
+    extractor = HTMLTextExtractor(backend=backend)
+    pieces = []
+    for i in range(0, len(html), 5):
+        pieces.extend(extractor.feed(html[i:i + 5]))
+    assert pieces[:2] == ["Title", "Café"]
+    assert pieces + extractor.close() == ["Title", "Café", "menu", "Last paragraph"]
+
+    kept = extract_text(html, drop_tags=["script", "style"], backend=backend)
+    assert kept.startswith("Title Home Café") and kept.endswith("Copyright")
+
+
+def test_extract_text_decodes_declared_charsets():
+    from crawlers.html_extractor import extract_text
+
+    page = "<html><head><meta charset='windows-1252'></head><p>naïve café</p></html>"
+    assert extract_text(page.encode("cp1252")) == "naïve café"
+    assert extract_text("<p>über</p>".encode("latin-1"), encoding="iso-8859-1") == "über"
+    assert extract_text("<p>über</p>".encode("utf-8")) == "über"
@@ -0,0 +1,384 @@
+"""
+Tests for the OMNIMIND knowledge graph.
+"""
+
+import pytest
+
+
+def _sample_graph():
+    from kg.kg_manager import KnowledgeGraphManager
+
+    kg = KnowledgeGraphManager(use_neo4j=False)
+    kg.add_entity("doc1", "document", {"title": "Graph databases"})
+    kg.add_entity("doc2", "document", {"title": "Vector search"})
+    for i in range(3):
+        kg.add_entity(f"chunk{i}", "chunk", {"text": f"chunk {i}"})
+    kg.add_relationship("doc1", "chunk0", "contains")
+    kg.add_relationship("doc1", "chunk1", "contains")
+    kg.add_relationship("doc2", "chunk2", "contains")
+    kg.add_relationship("doc1", "doc2", "cites")
+    kg.add_relationship("chunk2", "doc1", "mentions")
+    return kg
+
+
+def test_get_relationships_by_direction_and_type():
+    kg = _sample_graph()
+
+    outgoing = kg.get_relationships("doc1", direction="out")
+    assert [(r["target"], r["type"]) for r in outgoing] == [("chunk0", "contains"), ("chunk1", "contains"), ("doc2", "cites")]
+    assert kg.get_relationships("doc1", direction="in") == [
+        {"source": "chunk2", "target": "doc1", "type": "mentions", "properties": {}}
+    ]
+    assert len(kg.get_relationships("doc1")) == 4
+    assert [r["target"] for r in kg.get_relationships("doc1", relationship_type="cites")] == ["doc2"]
+    assert kg.get_relationships("unknown") == []
+
+    # Returned relationships are copies
+    outgoing[0]["type"] = "changed"
+    assert kg.relationships[0]["type"] == "contains"
+
+    with pytest.raises(ValueError):
+        kg.get_relationships("doc1", direction="sideways")
+
+
+def test_type_index_and_query_use_adjacency():
+    kg = _sample_graph()
+
+    assert [e["id"] for e in kg.get_entities_by_type("document")] == ["doc1", "doc2"]
+    assert kg.get_entities_by_type("missing") == []
+    stats = kg.get_graph_stats()
+    assert stats["total_relationships"] == 5
+    assert sorted(stats["relationship_types"]) == ["cites", "contains", "mentions"]
+
+    result = kg.query("vector")
+    assert [e["id"] for e in result["entities"]] == ["doc2"]
+    assert [(r["source"], r["target"]) for r in result["relationships"]] == [
+        ("doc2", "chunk2"), ("doc1", "doc2")
+    ]
+
+
+def test_query_intersects_prefix_postings():
+    from kg.kg_manager import KnowledgeGraphManager
+
+    kg = KnowledgeGraphManager(use_neo4j=False)
+    kg.add_entity("paper_1", "document", {"title": "Graph Databases at Scale", "year": 2021})
+    kg.add_entity("paper_2", "document", {"title": "Graphical models", "year": 2019})
+    kg.add_entity("person_1", "author", {"name": "Ada Graphson"})
+    kg.add_relationship("person_1", "paper_1", "wrote")
+
+    assert [e["id"] for e in kg.query("graph")["entities"]] == ["paper_1", "paper_2", "person_1"]
+    assert [e["id"] for e in kg.query("GRAPH data")["entities"]] == ["paper_1"]
+    assert [e["id"] for e in kg.query("author")["entities"]] == ["person_1"]
+    assert [e["id"] for e in kg.query("2019")["entities"]] == ["paper_2"]
+    assert [e["id"] for e in kg.query("paper")["entities"]] == ["paper_1", "paper_2"]
+    assert kg.query("graph missing") == {"entities": [], "relationships": []}
+    assert kg.query("") == {"entities": [], "relationships": []}
+
+    result = kg.query("ada")
+    assert result["entities"][0]["name"] == "Ada Graphson"
+    assert result["relationships"] == [{"source": "person_1", "target": "paper_1", "type": "wrote"}]
+    assert len(kg.query("graph", limit=2)["entities"]) == 2
+
+
+@pytest.fixture(params=["memory", "compact", "sqlite"])
+def graph_store(request, tmp_path):
+    from kg import create_graph_store
+
+    store = create_graph_store(request.param, **({"db_path": str(tmp_path / "kg.db")} if request.param == "sqlite" else {}))
+    yield store
+    store.close()
+
+
+def test_graph_stores_share_the_bulk_interface(graph_store):
+    added = graph_store.add_entities([
+        {"id": "doc1", "type": "document", "properties": {"title": "Graph databases"}},
+        {"id": "chunk1", "type": "chunk", "properties": {"text": "Adjacency lists"}},
+        {"id": "chunk2", "type": "chunk", "properties": {"text": "Edge tables"}},
+        {"id": "doc1", "type": "document", "properties": {"title": "duplicate"}},
+    ])
+    assert added == 3
+    assert not graph_store.add_entity("chunk1", "chunk", {})
+    assert graph_store.add_relationships([
+        {"source": "doc1", "target": "chunk1", "type": "contains", "properties": {"chunk_index": 0}},
+        {"source": "doc1", "target": "chunk2", "type": "contains", "properties": {"chunk_index": 1}},
+        {"source": "doc1", "target": "missing", "type": "contains"},
+    ]) == 2
+    assert graph_store.add_relationship("chunk1", "chunk2", "next")
+
+    assert graph_store.get_relationships("doc1", direction="out") == [
+        {"source": "doc1", "target": "chunk1", "type": "contains", "properties": {"chunk_index": 0}},
+        {"source": "doc1", "target": "chunk2", "type": "contains", "properties": {"chunk_index": 1}},
+    ]
+    assert [r["type"] for r in graph_store.get_relationships("chunk2", direction="in")] == ["contains", "next"]
+    assert graph_store.get_relationships("chunk1", relationship_type="next")[0]["target"] == "chunk2"
+    assert [e["id"] for e in graph_store.get_entities_by_type("chunk")] == ["chunk1", "chunk2"]
+    assert graph_store.get_entity("doc1")["properties"] == {"title": "Graph databases"}
+    assert graph_store.get_entity("missing") is None
+
+    stats = graph_store.get_graph_stats()
+    assert (stats["total_entities"], stats["total_relationships"]) == (3, 3)
+    assert sorted(stats["relationship_types"]) == ["contains", "next"]
+
+    result = graph_store.query("graph")
+    assert [e["id"] for e in result["entities"]] == ["doc1"]
+    assert [r["target"] for r in result["relationships"]] == ["chunk1", "chunk2"]
+    assert [e["id"] for e in graph_store.query("chunk", limit=1)["entities"]] == ["chunk1"]
+
+
+def test_sqlite_store_persists_across_instances(tmp_path):
+    from kg import SQLiteGraphStore
+
+    path = str(tmp_path / "kg.db")
+    store = SQLiteGraphStore(path)
+    store.add_entities({"id": f"e{i}", "type": "node", "properties": {"n": i}} for i in range(1000))
+    store.add_relationships({"source": f"e{i}", "target": f"e{i + 1}", "type": "next"} for i in range(999))
+    store.close()
+
+    reopened = SQLiteGraphStore(path)
+    assert reopened.get_graph_stats()["total_relationships"] == 999
+    assert reopened.get_entity("e10") == {"id": "e10", "type": "node", "properties": {"n": 10}}
+    assert [r["source"] for r in reopened.get_relationships("e10")] == ["e9", "e10"]
+    reopened.close()
+
+
+def test_add_batch_takes_columns_and_dedupes(graph_store):
+    result = graph_store.add_batch(
+        entities={
+            "id": ["doc1", "doc1", "chunk1", "chunk2"],
+            "type": ["document", "document", "chunk", "chunk"],
+            "properties": [{"title": "A"}, {"title": "A"}, {"size": 10}, {"size": 12}]
+        },
+        relationships={
+            "source": ["doc1", "doc1"],
+            "target": ["chunk1", "chunk2"],
+            "type": ["contains", "contains"],
+            "properties": [{"chunk_index": 0}, {"chunk_index": 1}]
+        }
+    )
+    assert result == {"entities": 3, "relationships": 2}
+    assert [r["properties"]["chunk_index"] for r in graph_store.get_relationships("doc1")] == [0, 1]
+    assert graph_store.add_batch(entities={"id": ["doc1"], "type": ["document"]}) == {"entities": 0, "relationships": 0}
+
+    with pytest.raises(ValueError):
+        graph_store.add_batch(relationships={"source": ["doc1"], "target": [], "type": ["contains"]})
+
+
+def test_compact_graph_uses_csr_arrays_and_running_counters():
+    from kg import CompactGraph
+
+    graph = CompactGraph()
+    documents = 50
+    graph.add_batch(entities={"id": [f"doc{d}" for d in range(documents)], "type": ["document"] * documents})
+    chunk_ids = [f"chunk{i}" for i in range(2000)]
+    graph.add_batch(
+        entities={"id": chunk_ids, "type": ["chunk"] * len(chunk_ids)},
+        relationships={"source": [f"doc{i % documents}" for i in range(len(chunk_ids))],
+                       "target": chunk_ids, "type": ["contains"] * len(chunk_ids)}
+    )
+    assert [r["target"] for r in graph.get_relationships("doc3", direction="out")][:3] == ["chunk3", "chunk53", "chunk103"]
+
+    # Edges added after a compaction are merged in on the next read
+    graph.add_entity("doc_new", "document", {"title": "Late"})
+    graph.add_relationship("doc_new", "chunk3", "cites", {"weight": 0.5})
+    assert graph.get_relationships("chunk3", direction="in") == [
+        {"source": "doc3", "target": "chunk3", "type": "contains", "properties": {}},
+        {"source": "doc_new", "target": "chunk3", "type": "cites", "properties": {"weight": 0.5}},
+    ]
+
+    stats = graph.get_graph_stats()
+    assert (stats["total_entities"], stats["total_relationships"]) == (2051, 2001)
+    assert sorted(stats["relationship_types"]) == ["cites", "contains"]
+    usage = graph.memory_usage()
+    assert usage["edge_bytes"] == 14 * 2001
+    # One float "weight" column, padded to every edge
+    assert usage["edge_property_bytes"] == 8 * 2001
+    assert usage["bytes_per_edge"] == 22
+
+
+def test_compact_graph_dictionary_encodes_edge_properties():
+    from kg import CompactGraph
+
+    graph = CompactGraph()
+    documents, chunks_per_document = 200, 100
+    doc_ids = [f"doc{d}" for d in range(documents)]
+    chunk_ids = [f"{doc}:chunk_{i}" for doc in doc_ids for i in range(chunks_per_document)]
+    graph.add_batch(entities={"id": doc_ids + chunk_ids,
+                              "type": ["document"] * documents + ["chunk"] * len(chunk_ids)})
+    # The edge properties store_step writes
+    graph.add_batch(relationships={
+        "source": [chunk_id.split(":")[0] for chunk_id in chunk_ids],
+        "target": chunk_ids,
+        "type": ["contains"] * len(chunk_ids),
+        "properties": [{"chunk_index": chunk_id.split(":")[1], "rank": i % chunks_per_document}
+                       for i, chunk_id in enumerate(chunk_ids)]
+    })
+
+    usage = graph.memory_usage()
+    assert usage["bytes_per_edge"] < 14 + 4 + 8 + 1
+    assert graph.get_relationships("doc7:chunk_42", direction="in")[0]["properties"] == {
+        "chunk_index": "chunk_42", "rank": 42
+    }
+
+    # Mixed kinds fall back to a plain list without losing values
+    graph.add_relationship("doc0", "doc1", "cites", {"rank": "high", "tags": ["a"]})
+    assert graph.get_relationships("doc0", direction="out")[-1]["properties"] == {"rank": "high", "tags": ["a"]}
+    assert graph.get_relationships("doc1:chunk_3", direction="in")[0]["properties"]["rank"] == 3
+
+
+def test_k_hop_expands_seeds_in_batches_within_budget(graph_store):
+    graph_store.add_batch(
+        entities={
+            "id": ["doc1", "doc2", "chunk1", "chunk2", "chunk3", "topic", "author"],
+            "type": ["document", "document", "chunk", "chunk", "chunk", "topic", "person"]
+        },
+        relationships={
+            "source": ["doc1", "doc1", "doc2", "chunk1", "chunk3", "author"],
+            "target": ["chunk1", "chunk2", "chunk3", "topic", "topic", "doc1"],
+            "type": ["contains", "contains", "contains", "mentions", "mentions", "wrote"]
+        }
+    )
+
+    one_hop = graph_store.k_hop(["doc1", "doc2", "missing"], k=1)
+    assert [n["id"] for n in one_hop["nodes"]][:2] == ["doc1", "doc2"]
+    assert {n["id"]: n["hops"] for n in one_hop["nodes"]} == {
+        "doc1": 0, "doc2": 0, "chunk1": 1, "chunk2": 1, "author": 1, "chunk3": 1
+    }
+    assert len(one_hop["relationships"]) == 4 and not one_hop["truncated"]
+
+    two_hop = graph_store.k_hop(["doc1"], k=2, direction="out")
+    assert {n["id"]: n["hops"] for n in two_hop["nodes"]} == {"doc1": 0, "chunk1": 1, "chunk2": 1, "topic": 2}
+
+    chunks_only = graph_store.k_hop(["doc1"], k=2, entity_types=["chunk", "topic"])
+    assert "author" not in {n["id"] for n in chunks_only["nodes"]}
+    assert sorted(n["type"] for n in chunks_only["nodes"]) == ["chunk", "chunk", "document", "topic"]
+    assert graph_store.k_hop(["doc1"], relationship_types=["wrote"])["relationships"][0]["source"] == "author"
+
+    budgeted = graph_store.k_hop(["doc1", "doc2"], k=3, max_nodes=4)
+    assert len(budgeted["nodes"]) == 4 and budgeted["truncated"]
+    ids = {n["id"] for n in budgeted["nodes"]}
+    assert all(r["source"] in ids and r["target"] in ids for r in budgeted["relationships"])
+
+
+def test_shortest_path_follows_direction(graph_store):
+    graph_store.add_entities({"id": name, "type": "node"} for name in "abcde")
+    graph_store.add_relationships([
+        {"source": "a", "target": "b", "type": "link"},
+        {"source": "b", "target": "c", "type": "link"},
+        {"source": "c", "target": "d", "type": "link"},
+        {"source": "a", "target": "e", "type": "shortcut"},
+        {"source": "d", "target": "e", "type": "link"},
+    ])
+
+    path = graph_store.shortest_path("a", "d", direction="out")
+    assert path["nodes"] == ["a", "b", "c", "d"]
+    assert [(r["source"], r["target"]) for r in path["relationships"]] == [("a", "b"), ("b", "c"), ("c", "d")]
+    assert graph_store.shortest_path("a", "d")["nodes"] == ["a", "e", "d"]
+    assert graph_store.shortest_path("d", "a", direction="out") is None
+    assert graph_store.shortest_path("a", "d", relationship_types=["link"], max_depth=2) is None
+    assert graph_store.shortest_path("a", "a") == {"nodes": ["a"], "relationships": []}
+
+
+def test_pagerank_matches_closed_form_and_ranks_hubs():
+    import numpy as np
+    from kg.centrality import pagerank, degree_centrality
+
+    # Two-node cycle: symmetric, so both get half the rank
+    ranks, _ = pagerank(np.array([0, 1]), np.array([1, 0]), 2)
+    assert np.allclose(ranks, [0.5, 0.5])
+
+    # Star: every leaf links to the hub; leaves are dangling-free, hub is dangling
+    sources, targets = np.array([1, 2, 3, 4]), np.array([0, 0, 0, 0])
+    ranks, iterations = pagerank(sources, targets, 5)
+    assert ranks.sum() == pytest.approx(1.0)
+    assert ranks.argmax() == 0 and np.allclose(ranks[1:], ranks[1])
+    warm, warm_iterations = pagerank(sources, targets, 5, initial=ranks)
+    assert np.allclose(warm, ranks, atol=1e-5) and warm_iterations <= 2 < iterations
+    assert degree_centrality(sources, targets, 5).tolist() == [1.0, 0.25, 0.25, 0.25, 0.25]
+
+
+def test_centrality_index_refreshes_past_threshold(graph_store):
+    from kg.centrality import CentralityIndex
+
+    graph_store.add_entities({"id": f"doc{i}", "type": "document"} for i in range(4))
+    graph_store.add_entity("hub", "topic", {})
+    graph_store.add_relationships({"source": f"doc{i}", "target": "hub", "type": "mentions"} for i in range(4))
+    ids, sources, targets = graph_store.edge_arrays()
+    assert ids[-1] == "hub" and targets.tolist() == [4, 4, 4, 4] and sources.tolist() == [0, 1, 2, 3]
+
+    index = CentralityIndex(graph_store, refresh_threshold=0.5, min_changes=2)
+    assert index.score("hub") == 0.0 and index.is_stale()
+    assert index.refresh_if_stale()
+    assert index.score("hub") == 1.0 and 0 < index.score("doc0") < 1
+    assert index.scores(["hub", "missing"], metric="degree") == {"hub": 1.0, "missing": 0.0}
+    with pytest.raises(ValueError):
+        index.score("hub", metric="closeness")
+
+    # One more edge is below the threshold; enough new ones trigger a refresh
+    graph_store.add_entity("other", "topic", {})
+    assert not index.refresh_if_stale()
+    graph_store.add_relationships({"source": f"doc{i}", "target": "other", "type": "mentions"} for i in range(4))
+    assert index.refresh_if_stale()
+    assert index.score("other") == pytest.approx(index.score("hub"))
+    assert index.last_refresh["relationships"] == 8
+
+
+def test_centrality_background_refresh_and_reasoner_rerank():
+    import time
+    from kg.kg_manager import KnowledgeGraphManager
+    from kg.centrality import CentralityIndex
+    from reasoners.memory_reasoner import MemoryReasoner
+
+    kg = KnowledgeGraphManager()
+    for name in ("popular", "obscure", "a", "b"):
+        kg.add_entity(name, "document", {})
+    kg.add_relationship("a", "popular", "cites")
+    kg.add_relationship("b", "popular", "cites")
+
+    index = CentralityIndex(kg, interval=0.01)
+    index.start()
+    try:
+        deadline = time.time() + 5
+        while not index.last_refresh and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        index.stop()
+    assert index.score("popular") == 1.0
+
+    reasoner = MemoryReasoner(object(), object(), object(), centrality=index, centrality_weight=0.5)
+    ranked = reasoner.rank_relevance({
+        "semantic": [{"document_id": "obscure", "similarity": 0.8},
+                     {"document_id": "popular", "similarity": 0.7}],
+        "episodic": [{"id": "e1"}]
+    }, "query")
+    assert [r.get("document_id") for r in ranked] == ["popular", "obscure", None]
+    assert ranked[0]["_centrality"] == 1.0 and ranked[-1]["_memory_type"] == "episodic"
+
+
+def test_centrality_ranks_documents_of_a_stored_graph(tmp_path):
+    from kg.kg_manager import KnowledgeGraphManager
+    from kg.centrality import CentralityIndex
+    from pipelines.store_step import store_step
+    from reasoners.memory_reasoner import MemoryReasoner
+    from vectordb.vectordb import VectorDB
+
+    # The graph ingestion builds: only document -> chunk "contains" edges
+    kg = KnowledgeGraphManager()
+    chunks = [{"document_id": doc_id, "chunk_id": f"chunk_{i}", "text": "t", "embedding": [1.0, 0.0]}
+              for doc_id, count in (("large", 50), ("small", 1)) for i in range(count)]
+    store_step({"embedded_chunks": chunks, "kg": kg,
+                "vectordb": VectorDB(db_path=str(tmp_path / "vectordb"), backend="simple")})
+
+    index = CentralityIndex(kg)
+    index.refresh()
+    assert index.score("large") == 1.0
+    assert index.score("small") < 0.1
+
+    # Directed PageRank cannot tell the documents apart
+    directed = CentralityIndex(kg, directed=True)
+    directed.refresh()
+    assert directed.score("large") == pytest.approx(directed.score("small"))
+
+    reasoner = MemoryReasoner(object(), object(), object(), centrality=index, centrality_weight=0.5)
+    ranked = reasoner.rank_relevance({"semantic": [{"document_id": "small", "similarity": 0.8},
+                                                   {"document_id": "large", "similarity": 0.7}]}, "query")
+    assert [r["document_id"] for r in ranked] == ["large", "small"]
@@ -1,33 +1,38 @@
+import json
+import dateparser
 import pytest
 from memory.episodic_memory import EpisodicMemory
 from memory.memory_indexer import MemoryIndexer
 from memory.memory_query import MemoryQuery
 from verifier.immutable_verifier import ImmutableVerifier
 
-def test_store_and_retrieve_memory():
-    mem = EpisodicMemory("memory/test_mem.jsonl")
+def test_store_and_retrieve_memory(tmp_path):
+    mem = EpisodicMemory(str(tmp_path / "test_mem.jsonl"))
     data = {"query": "test", "final_answer": "42", "chain_of_thought": "reasoning", "proof_hash": "abc", "hypothetical_branches": [], "config_hash": "def"}
     memory_id = mem.store_memory(data)
     retrieved = mem.get_memory_by_id(memory_id)
     assert retrieved["final_answer"] == "42"
 
-def test_index_and_reindex():
-    mem = EpisodicMemory("memory/test_mem.jsonl")
-    idx = MemoryIndexer("memory/test_mem.jsonl", "memory/test_index.json")
+def test_index_and_reindex(tmp_path):
+    memory_path = str(tmp_path / "test_mem.jsonl")
+    mem = EpisodicMemory(memory_path)
+    idx = MemoryIndexer(memory_path, str(tmp_path / "test_index.json"))
     idx.reindex_all(embed_fn=lambda x: [1.0, 2.0, 3.0])
     assert isinstance(idx.memory_ids, list)
 
-def test_query_by_date():
-    mem = EpisodicMemory("memory/test_mem.jsonl")
-    idx = MemoryIndexer("memory/test_mem.jsonl", "memory/test_index.json")
-    q = MemoryQuery("memory/test_mem.jsonl")
+def test_query_by_date(tmp_path):
+    memory_path = str(tmp_path / "test_mem.jsonl")
+    mem = EpisodicMemory(memory_path)
+    idx = MemoryIndexer(memory_path, str(tmp_path / "test_index.json"))
+    q = MemoryQuery(memory_path)
     mem.store_memory({"query": "date test", "final_answer": "ok", "timestamp": "2024-06-01T12:00:00"})
     results = q.query_by_date("2024-06-01")
     assert results
 
-def test_query_by_topic():
-    mem = EpisodicMemory("memory/test_mem.jsonl")
-    q = MemoryQuery("memory/test_mem.jsonl")
+def test_query_by_topic(tmp_path):
+    memory_path = str(tmp_path / "test_mem.jsonl")
+    mem = EpisodicMemory(memory_path)
+    q = MemoryQuery(memory_path)
     mem.store_memory({"query": "topic test", "final_answer": "ok"})
     results = q.query_by_topic("topic")
     assert results
@@ -35,4 +40,136 @@ def test_query_by_topic():
 def test_hash_memory():
     data = {"query": "hash test", "final_answer": "ok"}
     proof = ImmutableVerifier.hash_memory(data)
-    assert len(proof) == 64 
\ No newline at end of file
+    assert len(proof) == 64
+
+
+def test_offset_index_get_many_and_rebuild(tmp_path):
+    path = str(tmp_path / "episodes.jsonl")
+    mem = EpisodicMemory(path)
+    ids = [mem.store_memory({"query": f"q{i}", "final_answer": str(i)}) for i in range(5)]
+    third, missing, first = mem.get_many([ids[3], "missing", ids[0]])
+    assert (third["final_answer"], missing, first["final_answer"]) == ("3", None, "0")
+    assert len(open(path + ".idx").readlines()) == 5
+
+    # Records appended by another instance are picked up incrementally
+    other_id = EpisodicMemory(path).store_memory({"query": "other", "final_answer": "x"})
+    assert mem.get_memory_by_id(other_id)["query"] == "other"
+
+    # A rewritten data file no longer matches the sidecar, so it is rebuilt
+    with open(path, "w") as f:
+        f.write(json.dumps({"id": "fresh", "query": "rewritten"}) + "\n")
+    reopened = EpisodicMemory(path)
+    assert reopened.get_memory_by_id(ids[0]) is None
+    assert reopened.get_memory_by_id("fresh")["query"] == "rewritten"
+    assert open(path + ".idx").read().startswith("fresh\t0\t")
+
+def test_indexer_appends_vectors_and_reloads(tmp_path):
+    import numpy as np
+    memory_path, index_path = str(tmp_path / "mem.jsonl"), str(tmp_path / "index.json")
+    idx = MemoryIndexer(memory_path, index_path, flush_every=3)
+    embed = lambda text: [float(len(text)), 1.0]
+    for i in range(4):
+        idx.index_memory({"id": f"m{i}", "query": "x" * i}, embed_fn=embed)
+    idx.index_memory({"id": "no-embedding", "query": "skip"})
+    assert np.load(str(tmp_path / "index.npy")).shape == (3, 2)  # One batch flushed so far
+    assert idx.search_by_semantic("xx", embed, top_k=1) == ["m1"]  # Unflushed vectors are searchable
+
+    idx.flush()
+    reloaded = MemoryIndexer(memory_path, index_path)
+    assert reloaded.memory_ids == ["m0", "m1", "m2", "m3", "no-embedding"]
+    assert reloaded.search_by_semantic("xxxx", embed, top_k=2) == ["m3", "m2"]
+
+def test_indexer_migrates_json_index(tmp_path):
+    index_path = tmp_path / "index.json"
+    index_path.write_text(json.dumps({"memory_ids": ["a", "b"], "embeddings": [[0.0, 1.0], [1.0, 0.0]]}))
+    idx = MemoryIndexer(str(tmp_path / "mem.jsonl"), str(index_path))
+    assert idx.memory_ids == ["a", "b"]
+    assert idx.search_by_semantic("q", lambda text: [0.9, 0.1], top_k=1) == ["b"]
+    assert (tmp_path / "index.ids").read_text() == "a\t0\t\t\nb\t1\t\t\n"
+
+def test_indexer_day_and_topic_indexes(tmp_path, monkeypatch):
+    memory_path, index_path = str(tmp_path / "mem.jsonl"), str(tmp_path / "index.json")
+    mem = EpisodicMemory(memory_path)
+    idx = MemoryIndexer(memory_path, index_path)
+    for query, timestamp in [("Graph databases", "2024-06-01T09:00:00"), ("vector search", "2024-06-01T23:00:00"),
+                             ("graph traversal", "2024-06-02T08:00:00+02:00")]:
+        data = {"query": query, "final_answer": "ok", "timestamp": timestamp}
+        idx.index_memory({**data, "id": mem.store_memory(data)})
+    mem.store_memory({"query": "written without the indexer", "final_answer": "graph", "timestamp": "2024-06-02"})
+
+    # Stored timestamps are never run through dateparser, only the user's date string
+    parsed = []
+    real_parse = dateparser.parse
+    monkeypatch.setattr(dateparser, "parse", lambda text, *a, **k: parsed.append(text) or real_parse(text, *a, **k))
+    assert len(idx.search_by_date("2024-06-01")) == 2
+    assert len(idx.search_by_date("June 2, 2024")) == 2
+    assert parsed == ["2024-06-01", "June 2, 2024"]
+
+    assert len(idx.search_by_topic("GRAPH")) == 3
+    assert idx.search_by_topic("graph trav") == [idx.memory_ids[2]]
+    assert idx.search_by_topic("") == []
+
+    idx.flush()
+    reloaded = MemoryIndexer(memory_path, index_path)
+    assert reloaded.search_by_topic("vector") == [idx.memory_ids[1]]
+    assert reloaded.day_index == idx.day_index  # The unindexed memory is caught up again
+
+    # Timestamps that are not ISO 8601 are parsed once, when indexed
+    parsed.clear()
+    idx.index_memory({"id": "legacy", "query": "old format", "final_answer": "ok",
+                      "timestamp": "June 3, 2024 10:00 AM"})
+    assert parsed == ["June 3, 2024 10:00 AM"]
+    assert idx.search_by_date("2024-06-03") == ["legacy"]
+    assert parsed == ["June 3, 2024 10:00 AM", "2024-06-03"]
+
+def test_memory_logger_persists_each_memory(tmp_path):
+    from memory.memory_logger import MemoryLogger
+    memory_path = str(tmp_path / "mem.jsonl")
+    embed = lambda text: [float(len(text)), 1.0]
+    with MemoryLogger(memory_path, index_path=str(tmp_path / "index.json")) as writer:
+        memory_id = writer.log_memory({"query": "logged once", "final_answer": "ok"}, embed_fn=embed)
+
+    reloaded = MemoryIndexer(memory_path, str(tmp_path / "index.json"))
+    assert reloaded.memory_ids == [memory_id]
+    assert reloaded.search_by_semantic("logged once", embed, top_k=1) == [memory_id]
+
+def test_memory_step_reuses_one_logger(tmp_path, monkeypatch):
+    from memory import memory_logger as memory_logger_module
+    from pipelines import memory_step as memory_step_module
+    memory_path = str(tmp_path / "mem.jsonl")
+    created = []
+    real_logger = memory_logger_module.MemoryLogger
+    monkeypatch.setattr(memory_step_module, "MemoryLogger",
+                        lambda: created.append(1) or real_logger(memory_path))
+    monkeypatch.setattr(memory_step_module, "_memory_logger", None)
+
+    ids = [memory_step_module.memory_step({"query": f"step {i}", "final_answer": "ok"})["memory_id"]
+           for i in range(3)]
+    assert len(created) == 1
+    shared = memory_step_module._memory_logger
+    assert shared.indexer.memory_ids == ids
+    assert not (tmp_path / "memory_index.ids").exists()  # Buffered until the flush schedule or exit
+    shared.flush()
+    assert MemoryIndexer(memory_path, str(tmp_path / "memory_index.json")).memory_ids == ids
+
+def test_queries_never_write_the_index(tmp_path):
+    from memory.memory_logger import MemoryLogger
+    memory_path, index_path = str(tmp_path / "mem.jsonl"), str(tmp_path / "memory_index.json")
+    mem = EpisodicMemory(memory_path)
+    unindexed = mem.store_memory({"query": "written directly", "final_answer": "ok"})
+    query = MemoryQuery(memory_path)
+    assert [m["id"] for m in query.query_by_topic("written")] == [unindexed]
+    assert not (tmp_path / "memory_index.ids").exists()
+
+    with MemoryLogger(memory_path) as writer:
+        logged = writer.log_memory({"query": "written by the logger", "final_answer": "ok"})
+    assert query.query_by_topic("logger")[0]["id"] == logged
+    reloaded = MemoryIndexer(memory_path, index_path)
+    assert reloaded.memory_ids == [logged]
+    assert reloaded.search_by_topic("written") == [logged, unindexed]
+
+    # Logs written by older readers repeat ids; replay keeps the first row
+    with open(tmp_path / "memory_index.ids", "a") as f:
+        f.write(f"{logged}\t-1\t\twritten\n")
+    assert MemoryIndexer(memory_path, index_path).memory_ids == [logged]
+
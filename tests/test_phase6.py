@@ -44,6 +44,38 @@ def test_episodic_manager():
         remaining = manager.retrieve_sessions()
         assert len(remaining) == 0
 
+def test_episodic_manager_daily_segments():
+    """Test segment migration, overlapping-segment range reads and whole-segment pruning."""
+    import json
+    from datetime import datetime, timedelta
+    with tempfile.TemporaryDirectory() as tmpdir:
+        log_path = os.path.join(tmpdir, "episodic.jsonl")
+        recent = datetime.utcnow() - timedelta(hours=1)
+        with open(log_path, "w") as f:
+            for session_id, timestamp in [("b", "2024-01-02T09:00:00"), ("a", "2024-01-01T23:59:00"),
+                                          ("c", "2024-01-02T18:30:00"), ("d", recent.isoformat())]:
+                f.write(json.dumps({"session_id": session_id, "timestamp": timestamp}) + "\n")
+        
+        manager = EpisodicManager(log_path=log_path, retention_days=7)
+        segment_dir = os.path.join(tmpdir, "episodic_segments")
+        assert sorted(os.listdir(segment_dir)) == sorted(
+            ["2024-01-01.jsonl", "2024-01-02.jsonl", recent.strftime("%Y-%m-%d") + ".jsonl", "manifest.json"]
+        )
+        
+        # A fresh manager reads only the segments overlapping the range
+        manager = EpisodicManager(log_path=log_path, retention_days=7)
+        day_two = manager.retrieve_sessions(start_date=datetime(2024, 1, 2), end_date=datetime(2024, 1, 2, 12))
+        assert [s["session_id"] for s in day_two] == ["b"]
+        assert manager._loaded == {"2024-01-02"}
+        assert [s["session_id"] for s in manager.retrieve_sessions()] == ["a", "b", "c", "d"]
+        
+        manager.log_session("e", "query", "response", "good", {})
+        assert manager.prune_sessions() == 3
+        assert [s["session_id"] for s in manager.retrieve_sessions()] == ["d", "e"]
+        assert not os.path.exists(os.path.join(segment_dir, "2024-01-01.jsonl"))
+        reloaded = EpisodicManager(log_path=log_path, retention_days=7)
+        assert [s["session_id"] for s in reloaded.retrieve_sessions(start_date=recent)] == ["d", "e"]
+
 def test_semantic_manager():
     """Test clustering and semantic search."""
     with tempfile.TemporaryDirectory() as tmpdir:
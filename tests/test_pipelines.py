@@ -0,0 +1,414 @@
+"""
+Tests for OMNIMIND pipeline orchestration.
+"""
+
+import os
+import tempfile
+import pytest
+
+def _document_text(doc_index: int, n_sentences: int) -> str:
+    return " ".join(
+        f"Document {doc_index} sentence {j} covers a separate subject in detail."
+        for j in range(n_sentences)
+    )
+
+
+@pytest.fixture
+def sample_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for i in range(5):
+            path = os.path.join(tmpdir, f"doc_{i}.txt")
+            with open(path, "w") as f:
+                f.write(_document_text(i, 6 * (i + 1)))
+            paths.append(path)
+        yield tmpdir, paths
+
+
+def test_streaming_pipeline_stores_every_chunk(sample_files):
+    from pipelines.pipeline import OMNIMINDPipeline
+    from vectordb.vectordb import VectorDB
+    from kg.kg_manager import KnowledgeGraphManager
+
+    tmpdir, paths = sample_files
+    vectordb = VectorDB(db_path=os.path.join(tmpdir, "vectordb"), backend="simple")
+    pipeline = OMNIMINDPipeline()
+    result = pipeline.run_streaming(
+        paths, batch_size=2, queue_size=1, chunk_size=120, overlap=20,
+        vectordb=vectordb, kg=KnowledgeGraphManager()
+    )
+
+    assert result["pipeline_success"]
+    metrics = result["stage_metrics"]
+    assert metrics["ingest"]["batches"] == 3
+    assert metrics["ingest"]["items_out"] == len(paths)
+    assert metrics["store"]["items_out"] == metrics["chunk"]["items_out"]
+    assert vectordb.get_collection_stats("omnimind_docs")["vector_count"] == metrics["chunk"]["items_out"]
+    assert all("throughput_per_sec" in stage for stage in metrics.values())
+    assert "chunks" not in result["final_data"]
+
+    # Each batch was appended to disk as its own frame; a fresh instance reads them all
+    reloaded = VectorDB(db_path=os.path.join(tmpdir, "vectordb"), backend="simple")
+    assert reloaded.get_collection_stats("omnimind_docs")["vector_count"] == metrics["chunk"]["items_out"]
+
+
+def test_incremental_pipeline_skips_unchanged_sources(sample_files):
+    from pipelines.pipeline import OMNIMINDPipeline
+    from vectordb.vectordb import VectorDB
+    from kg.kg_manager import KnowledgeGraphManager
+
+    tmpdir, paths = sample_files
+    manifest_path = os.path.join(tmpdir, "manifest.json")
+    vectordb = VectorDB(db_path=os.path.join(tmpdir, "vectordb"), backend="simple")
+    params = dict(chunk_size=120, overlap=0, chunking_strategy="content",
+                  vectordb=vectordb, kg=KnowledgeGraphManager())
+
+    first = OMNIMINDPipeline(manifest_path=manifest_path).run(paths, **params)
+    assert first["pipeline_success"]
+    stored = vectordb.get_collection_stats("omnimind_docs")["vector_count"]
+    assert stored > 0
+
+    # Nothing changed: every source is skipped before loading
+    second = OMNIMINDPipeline(manifest_path=manifest_path).run(paths, **params)
+    assert second["pipeline_success"]
+    assert sorted(second["final_data"]["skipped_sources"]) == sorted(paths)
+    assert second["final_data"]["stored_count"] == 0
+
+    # Rewrite one document's tail: only its new chunks are embedded
+    with open(paths[4], "w") as f:
+        f.write(_document_text(4, 15) + " A freshly appended closing sentence.")
+    os.utime(paths[4], (1, 1))
+    third = OMNIMINDPipeline(manifest_path=manifest_path).run(paths, **params)
+    data = third["final_data"]
+    assert third["pipeline_success"]
+    assert len(data["skipped_sources"]) == len(paths) - 1
+    assert 0 < data["stored_count"] < data["total_chunks"] + data["unchanged_chunks"]
+    assert data["deleted_count"] > 0
+    assert vectordb.get_collection_stats("omnimind_docs")["vector_count"] == (
+        stored - data["deleted_count"] + data["stored_count"]
+    )
+
+
+def test_ingestion_pipeline_runs_independent_steps_concurrently():
+    import time
+    from pipelines.ingestion_pipeline import IngestionPipeline
+
+    def slow(key):
+        def step(data):
+            time.sleep(0.3)
+            return {key: data["value"] + 1}
+        return step
+
+    pipeline = IngestionPipeline()
+    pipeline.add_step("left", slow("left"))
+    pipeline.add_step("right", slow("right"))
+    pipeline.add_step("join", lambda d: {"total": d["left"] + d["right"]}, dependencies=["left", "right"])
+
+    started = time.time()
+    result = pipeline.execute({"value": 1})
+    elapsed = time.time() - started
+
+    assert result["total"] == 4
+    assert elapsed < 0.55
+    record = pipeline.get_execution_history()[-1]
+    assert record["status"] == "completed"
+    assert [s["step_name"] for s in record["steps"]] == ["left", "right", "join"]
+    assert all(s["duration"] > 0 for s in record["steps"][:2])
+
+
+def test_ingestion_pipeline_rejects_cycles_and_unknown_dependencies():
+    from pipelines.ingestion_pipeline import IngestionPipeline
+
+    pipeline = IngestionPipeline()
+    pipeline.add_step("a", lambda d: {}, dependencies=["b"])
+    pipeline.add_step("b", lambda d: {}, dependencies=["a"])
+    assert "cycle" in pipeline.execute({})["error"]
+
+    pipeline = IngestionPipeline()
+    pipeline.add_step("a", lambda d: {}, dependencies=["missing"])
+    assert "unknown" in pipeline.execute({})["error"]
+
+
+def test_step_timeout_skips_dependents():
+    import time
+    from pipelines.training_pipeline import TrainingPipeline
+
+    pipeline = TrainingPipeline()
+    pipeline.add_step("hang", lambda d: time.sleep(1) or {"late": True}, timeout=0.1)
+    pipeline.add_step("after", lambda d: {"ran": True}, dependencies=["hang"])
+    pipeline.add_step("other", lambda d: {"other": True}, dependencies=[])
+
+    result = pipeline.execute({})
+
+    statuses = {s["step_name"]: s["status"] for s in pipeline.execution_history[-1]["steps"]}
+    assert statuses == {"hang": "timed_out", "after": "skipped", "other": "completed"}
+    assert result.get("other") is True
+    assert "ran" not in result
+
+
+def test_pipeline_steps_default_to_running_in_order():
+    from pipelines.retrieval_pipeline import RetrievalPipeline
+    from pipelines.training_pipeline import TrainingPipeline
+
+    for pipeline in (RetrievalPipeline(), TrainingPipeline()):
+        pipeline.add_step("a", lambda d: {"x": 1})
+        pipeline.add_step("b", lambda d: {"y": d.get("x", "MISSING")})
+        pipeline.add_step("c", lambda d: {"z": (d.get("x"), d.get("y"))})
+        result = pipeline.execute({} if isinstance(pipeline, TrainingPipeline) else "q")
+        assert (result["y"], result["z"]) == (1, (1, 1))
+        assert [s["dependencies"] for s in pipeline.steps] == [[], ["a"], ["b"]]
+
+
+def test_embed_step_is_memoized_through_artifact_cache(tmp_path):
+    from pipelines.artifact_cache import ArtifactCache
+    from pipelines.embed_step import embed_step
+
+    cache = ArtifactCache(str(tmp_path / "artifacts"))
+    chunks = [
+        {"text": f"Chunk number {i} about caching.", "chunk_id": f"chunk_{i}", "source": "doc"}
+        for i in range(4)
+    ]
+
+    first = embed_step({"chunks": chunks, "artifact_cache": cache, "collection_name": "a"})
+    second = embed_step({"chunks": chunks, "artifact_cache": cache, "collection_name": "b"})
+
+    assert cache.misses == 1 and cache.hits == 1
+    assert second == first
+    assert list((tmp_path / "artifacts" / "embed_step").glob("*/arrays.npz"))
+
+    embed_step({"chunks": chunks[:2], "artifact_cache": cache})
+    assert cache.misses == 2
+
+
+def test_cached_steps_key_empty_inputs_on_incremental_mode(tmp_path):
+    from pipelines.artifact_cache import ArtifactCache
+    from pipelines.chunk_step import chunk_step
+    from pipelines.embed_step import embed_step
+    from pipelines.source_manifest import SourceManifest
+
+    cache = ArtifactCache(str(tmp_path / "artifacts"))
+    manifest = SourceManifest(str(tmp_path / "manifest.json"))
+
+    # An incremental run with nothing new must not answer for a plain empty run
+    assert "error" not in chunk_step({"documents": [], "manifest": manifest, "artifact_cache": cache})
+    assert "error" not in embed_step({"chunks": [], "manifest": manifest, "artifact_cache": cache})
+    assert chunk_step({"documents": [], "artifact_cache": cache})["error"] == "No documents provided"
+    assert embed_step({"chunks": [], "artifact_cache": cache})["error"] == "No chunks provided"
+
+
+def test_streaming_pipeline_resumes_from_checkpoint(sample_files, tmp_path):
+    from pipelines.pipeline import OMNIMINDPipeline
+    from pipelines.checkpoint import PipelineCheckpoint
+    from pipelines.embed_step import embed_step
+    from pipelines.store_step import store_step
+    from vectordb.vectordb import VectorDB
+    from kg.kg_manager import KnowledgeGraphManager
+
+    tmpdir, paths = sample_files
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    vectordb = VectorDB(db_path=os.path.join(tmpdir, "vectordb"), backend="simple")
+    kg = KnowledgeGraphManager()
+
+    # Store fails on the second batch, as if the process died mid-job
+    store_calls = []
+    def crashing_store(data):
+        store_calls.append(data["batch_id"])
+        if len(store_calls) == 2:
+            return {"error": "simulated crash"}
+        return store_step(data)
+
+    crashed = OMNIMINDPipeline()
+    crashed.steps[-1] = ("store", crashing_store)
+    first = crashed.run_streaming(
+        paths, batch_size=2, queue_size=1, checkpoint_id="job-1", checkpoint_dir=checkpoint_dir,
+        chunk_size=120, overlap=20, vectordb=vectordb, kg=kg
+    )
+    assert not first["pipeline_success"]
+    state = PipelineCheckpoint("job-1", checkpoint_dir).state
+    assert state["status"] == "failed"
+    assert state["stages"]["store"] == store_calls[:1]
+    assert store_calls[1] in state["stages"]["embed"]
+    assert state["config"]["params"] == {"chunk_size": 120, "overlap": 20}
+
+    embedded_batches = []
+    def counting_embed(data):
+        embedded_batches.append(data["batch_id"])
+        return embed_step(data)
+
+    resumed = OMNIMINDPipeline()
+    resumed.steps[2] = ("embed", counting_embed)
+    result = resumed.resume("job-1", checkpoint_dir=checkpoint_dir, vectordb=vectordb, kg=kg)
+
+    assert result["pipeline_success"]
+    data = result["final_data"]
+    assert data["resumed_batches"] == 1 + (len(state["stages"]["embed"]) - 1)
+    assert not set(embedded_batches) & set(state["stages"]["embed"])
+    final_state = PipelineCheckpoint("job-1", checkpoint_dir).state
+    assert final_state["status"] == "completed"
+    assert len(final_state["stages"]["store"]) == 3
+    assert data["store_offset"] == vectordb.get_collection_stats("omnimind_docs")["vector_count"]
+    assert not list((tmp_path / "checkpoints" / "job-1" / "partials" / "embed").glob("*"))
+
+    assert OMNIMINDPipeline().resume("missing", checkpoint_dir=checkpoint_dir)["pipeline_success"] is False
+
+
+def _wait_for_job(manager, job_id, timeout=10.0):
+    import time
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job["status"] not in manager.ACTIVE_STATUSES:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_ingestion_job_reports_progress(sample_files):
+    from pipelines.ingestion_jobs import IngestionJobManager
+    from vectordb.vectordb import VectorDB
+    from kg.kg_manager import KnowledgeGraphManager
+
+    tmpdir, paths = sample_files
+    manager = IngestionJobManager(
+        max_workers=1, vectordb=VectorDB(db_path=os.path.join(tmpdir, "vectordb"), backend="simple"),
+        kg=KnowledgeGraphManager()
+    )
+    try:
+        job_id = manager.submit(paths, batch_size=2, chunk_size=120, overlap=20)
+        job = _wait_for_job(manager, job_id)
+    finally:
+        manager.shutdown()
+
+    assert job["status"] == "completed"
+    assert job["result"]["successful_ingestions"] == len(paths)
+    assert job["progress"]["store"]["items_out"] == job["result"]["stored_count"] > 0
+    assert all(stage["throughput_per_sec"] > 0 for stage in job["progress"].values())
+    assert manager.get("unknown") is None
+
+
+def test_concurrent_jobs_share_the_store_without_losing_writes(sample_files, tmp_path):
+    from pipelines.ingestion_jobs import IngestionJobManager
+    from vectordb.vectordb import VectorDB
+    from kg.kg_manager import KnowledgeGraphManager
+
+    tmpdir, paths = sample_files
+    db_path = os.path.join(tmpdir, "vectordb")
+    checkpoint_dir = tmp_path / "checkpoints"
+    manager = IngestionJobManager(
+        max_workers=4, checkpoint_dir=str(checkpoint_dir),
+        vectordb=VectorDB(db_path=db_path, backend="simple"), kg=KnowledgeGraphManager()
+    )
+    try:
+        job_ids = [manager.submit(paths, batch_size=1, chunk_size=60, overlap=0) for _ in range(4)]
+        jobs = [_wait_for_job(manager, job_id) for job_id in job_ids]
+    finally:
+        manager.shutdown()
+
+    assert all(job["status"] == "completed" for job in jobs)
+    stored = sum(job["result"]["stored_count"] for job in jobs)
+    assert VectorDB(db_path=db_path, backend="simple").get_collection_stats("omnimind_docs")["vector_count"] == stored
+    assert not list(checkpoint_dir.glob("*"))
+
+
+def test_ingestion_jobs_are_capped_and_cancellable(sample_files, monkeypatch):
+    import threading
+    import pipelines.pipeline as pipeline_module
+    from pipelines.ingest_step import ingest_step
+    from pipelines.ingestion_jobs import IngestionJobManager, JobLimitError
+
+    tmpdir, paths = sample_files
+    release = threading.Event()
+    def blocking_ingest(data):
+        release.wait(5)
+        return ingest_step(data)
+    monkeypatch.setattr(pipeline_module, "ingest_step", blocking_ingest)
+
+    manager = IngestionJobManager(max_workers=1, max_jobs=2)
+    try:
+        running = manager.submit(paths, batch_size=1)
+        queued = manager.submit(paths, batch_size=1)
+        with pytest.raises(JobLimitError):
+            manager.submit(paths)
+
+        assert manager.cancel(queued)
+        assert manager.get(queued)["status"] == "cancelled"
+        assert manager.cancel(running)
+        release.set()
+        job = _wait_for_job(manager, running)
+        assert job["status"] == "cancelled"
+        assert job["result"]["stored_count"] == 0
+        assert not manager.cancel(running)
+
+        # Finished jobs no longer count towards the cap
+        manager.submit([], batch_size=1)
+    finally:
+        release.set()
+        manager.shutdown()
+
+
+def test_store_step_writes_kg_batch_with_edge_properties(tmp_path):
+    from pipelines.store_step import store_step
+    from vectordb.vectordb import VectorDB
+    from kg.kg_manager import KnowledgeGraphManager
+
+    kg = KnowledgeGraphManager()
+    chunks = [
+        {"document_id": "doc_a", "document_title": "A", "chunk_id": f"chunk_a{i}",
+         "text": f"chunk {i}", "embedding": [float(i), 1.0]}
+        for i in range(3)
+    ] + [{"document_id": "doc_b", "chunk_id": "chunk_b0", "text": "other", "embedding": [0.0, 1.0]}]
+    result = store_step({
+        "embedded_chunks": chunks,
+        "vectordb": VectorDB(db_path=str(tmp_path / "vectordb"), backend="simple"),
+        "kg": kg
+    })
+
+    assert result["kg_success"]
+    stats = kg.get_graph_stats()
+    assert (stats["total_entities"], stats["total_relationships"]) == (6, 4)
+    assert [r["properties"]["chunk_index"] for r in kg.get_relationships("doc_a", direction="out")] == [
+        "chunk_a0", "chunk_a1", "chunk_a2"
+    ]
+
+
+def test_store_step_keeps_chunks_of_different_documents_apart(tmp_path):
+    from pipelines.store_step import store_step
+    from vectordb.vectordb import VectorDB
+    from kg.kg_manager import KnowledgeGraphManager
+
+    kg = KnowledgeGraphManager()
+    chunks = [
+        {"document_id": doc_id, "chunk_id": f"chunk_{i}", "text": f"{doc_id} {i}", "embedding": [float(i), 1.0]}
+        for doc_id in ("docA", "docB") for i in range(2)
+    ]
+    store_step({
+        "embedded_chunks": chunks,
+        "vectordb": VectorDB(db_path=str(tmp_path / "vectordb"), backend="simple"),
+        "kg": kg
+    })
+
+    assert kg.get_graph_stats()["total_entities"] == 6
+    assert kg.get_relationships("chunk_0") == []
+    assert [r["source"] for r in kg.get_relationships("docA:chunk_0")] == ["docA"]
+    reached = {node["id"] for node in kg.k_hop(["docA"], k=2)["nodes"]}
+    assert reached == {"docA", "docA:chunk_0", "docA:chunk_1"}
+
+
+def test_checkpoint_commits_append_to_a_log(tmp_path):
+    from pipelines.checkpoint import PipelineCheckpoint
+
+    checkpoint = PipelineCheckpoint("job-log", str(tmp_path))
+    checkpoint.save_config(["a", "b"], 1, {})
+    state_file = tmp_path / "job-log" / "state.json"
+    written = state_file.read_text()
+    for i in range(3):
+        checkpoint.commit("embed", f"batch-{i}")
+        checkpoint.commit("store", f"batch-{i}", items=5)
+    checkpoint.commit("store", "batch-0", items=5)  # Repeated commits are ignored
+
+    assert state_file.read_text() == written
+    assert len((tmp_path / "job-log" / "commits.log").read_text().splitlines()) == 6
+    reloaded = PipelineCheckpoint("job-log", str(tmp_path))
+    assert reloaded.state["store_offset"] == 15
+    assert reloaded.state["stages"]["store"] == ["batch-0", "batch-1", "batch-2"]
+    assert reloaded.is_committed("embed", "batch-2") and not reloaded.is_committed("store", "batch-3")
@@ -9,6 +9,7 @@ from typing import List, Dict, Any, Optional
 import logging
 import json
 import pickle
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,8 @@ class VectorDB:
         self.collections = {}
         self._faiss_indexes = {}
         self._chroma_client = None
+        # Serializes loads and writes of simple collections across threads
+        self._lock = threading.RLock()
         
         # Initialize backend
         self._init_backend()
@@ -75,6 +78,11 @@ class VectorDB:
                 "documents": []
             }
             
+            # A (re)created collection starts empty; drop vectors appended earlier
+            vectors_file = os.path.join(collection_path, "vectors.pkl")
+            if os.path.exists(vectors_file):
+                os.remove(vectors_file)
+            
             # Save collection metadata
             metadata_file = os.path.join(collection_path, "metadata.json")
             with open(metadata_file, 'w') as f:
@@ -86,13 +94,50 @@ class VectorDB:
             logger.error(f"Error creating collection {name}: {e}")
             return False
     
+    def _load_collection(self, name: str) -> bool:
+        """Make sure a simple collection is in memory, loading it from disk if persisted."""
+        with self._lock:
+            if name in self.collections:
+                return True
+            
+            collection_path = os.path.join(self.db_path, name)
+            metadata_file = os.path.join(collection_path, "metadata.json")
+            if not os.path.exists(metadata_file):
+                return False
+            
+            try:
+                with open(metadata_file, 'r') as f:
+                    metadata = json.load(f).get("metadata", {})
+                vectors = []
+                vectors_file = os.path.join(collection_path, "vectors.pkl")
+                if os.path.exists(vectors_file):
+                    # One pickled list per appended batch (a compacted file holds just one)
+                    with open(vectors_file, 'rb') as f:
+                        while True:
+                            try:
+                                vectors.extend(pickle.load(f))
+                            except EOFError:
+                                break
+            except Exception as e:
+                logger.error(f"Error loading collection {name}: {e}")
+                return False
+            
+            self.collections[name] = {
+                "path": collection_path,
+                "metadata": metadata,
+                "vectors": vectors,
+                "documents": [v.get("text", "") for v in vectors]
+            }
+            return True
+    
     def add_vectors(self, collection_name: str, vectors: List[Dict[str, Any]]) -> bool:
         """Add vectors to a collection."""
         try:
             if self.backend == "chroma" and self._chroma_client:
                 return self._add_vectors_chroma(collection_name, vectors)
             else:
-                return self._add_vectors_simple(collection_name, vectors)
+                with self._lock:
+                    return self._add_vectors_simple(collection_name, vectors)
         except Exception as e:
             logger.error(f"Error adding vectors to {collection_name}: {e}")
             return False
@@ -112,7 +157,8 @@ class VectorDB:
                     metadatas.append({
                         "document_id": vector_data.get("document_id", ""),
                         "chunk_id": vector_data.get("chunk_id", f"chunk_{i}"),
-                        "source": vector_data.get("source", "")
+                        "source": vector_data.get("source", ""),
+                        "content_hash": vector_data.get("content_hash", "")
                     })
                     ids.append(f"doc_{i}")
             
@@ -131,21 +177,58 @@ class VectorDB:
     
     def _add_vectors_simple(self, collection_name: str, vectors: List[Dict[str, Any]]) -> bool:
         """Add vectors using simple storage."""
-        if collection_name not in self.collections:
+        if not self._load_collection(collection_name):
             self.create_collection(collection_name)
         
         collection = self.collections[collection_name]
         collection["vectors"].extend(vectors)
         collection["documents"].extend([v.get("text", "") for v in vectors])
         
-        # Save vectors
+        # Append this batch as its own pickle frame; _load_collection reads them all
         vectors_file = os.path.join(collection["path"], "vectors.pkl")
-        with open(vectors_file, 'wb') as f:
+        with open(vectors_file, 'ab') as f:
             pickle.dump(vectors, f)
         
         logger.info(f"Added {len(vectors)} vectors to collection: {collection_name}")
         return True
     
+    def delete_vectors(self, collection_name: str, source: str, content_hashes: List[str]) -> int:
+        """Delete a source's chunks by content hash. Returns the number removed."""
+        try:
+            content_hashes = set(content_hashes)
+            if not content_hashes:
+                return 0
+            
+            if self.backend == "chroma" and self._chroma_client:
+                collection = self._chroma_client.get_collection(name=collection_name)
+                collection.delete(where={"$and": [
+                    {"source": source},
+                    {"content_hash": {"$in": sorted(content_hashes)}}
+                ]})
+                return len(content_hashes)
+            
+            with self._lock:
+                if not self._load_collection(collection_name):
+                    return 0
+                
+                collection = self.collections[collection_name]
+                kept = [
+                    v for v in collection["vectors"]
+                    if not (v.get("source") == source and v.get("content_hash") in content_hashes)
+                ]
+                removed = len(collection["vectors"]) - len(kept)
+                if removed:
+                    collection["vectors"] = kept
+                    collection["documents"] = [v.get("text", "") for v in kept]
+                    vectors_file = os.path.join(collection["path"], "vectors.pkl")
+                    with open(vectors_file, 'wb') as f:
+                        pickle.dump(kept, f)
+                    logger.info(f"Deleted {removed} vectors from collection: {collection_name}")
+                return removed
+        except Exception as e:
+            logger.error(f"Error deleting vectors from {collection_name}: {e}")
+            return 0
+    
     def search(self, collection_name: str, query_vector: List[float], 
                top_k: int = 5) -> List[Dict[str, Any]]:
         """Search for similar vectors."""
@@ -192,7 +275,7 @@ class VectorDB:
     def _search_simple(self, collection_name: str, query_vector: List[float], 
                       top_k: int) -> List[Dict[str, Any]]:
         """Search using simple storage."""
-        if collection_name not in self.collections:
+        if not self._load_collection(collection_name):
             logger.warning(f"Collection {collection_name} not found")
             return []
         
@@ -205,7 +288,8 @@ class VectorDB:
         # Calculate similarities
         similarities = []
         for i, vector_data in enumerate(vectors):
-            if "embedding" in vector_data:
+            # Skip vectors from a different embedding model (dimension mismatch)
+            if "embedding" in vector_data and len(vector_data["embedding"]) == len(query_vector):
                 similarity = self._cosine_similarity(query_vector, vector_data["embedding"])
                 similarities.append((similarity, i, vector_data))
         
@@ -279,7 +363,7 @@ class VectorDB:
             except:
                 return {"error": "Collection not found"}
         
-        if collection_name not in self.collections:
+        if not self._load_collection(collection_name):
             return {"error": "Collection not found"}
         
         collection = self.collections[collection_name]